@@ -0,0 +1,33 @@
+"""Composite indexes backing keyset pagination of transactions and snapshots.
+
+A page after a cursor is a range scan over (user_id, sort key, id); with only
+single-column indexes Postgres had to collect and sort every row of the user
+before it could skip past the cursor.
+"""
+
+from alembic import op
+
+revision = "013"
+down_revision = "012"
+branch_labels = None
+depends_on = None
+
+_INDEXES = (
+    ("ix_transactions_user_date_id", "transactions", ["user_id", "date", "id"]),
+    ("ix_transactions_user_amount_id", "transactions", ["user_id", "amount", "id"]),
+    (
+        "ix_balance_snapshots_user_date_id",
+        "balance_snapshots",
+        ["user_id", "date", "id"],
+    ),
+)
+
+
+def upgrade():
+    for name, table, columns in _INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade():
+    for name, table, _ in reversed(_INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,27 @@
+"""Add transactions.import_hash for deduplicating bank statement imports."""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "014"
+down_revision = "013"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "transactions", sa.Column("import_hash", sa.String(64), nullable=True)
+    )
+    op.create_index(
+        "uq_transactions_user_import_hash",
+        "transactions",
+        ["user_id", "import_hash"],
+        unique=True,
+        postgresql_where=sa.text("import_hash IS NOT NULL"),
+    )
+
+
+def downgrade():
+    op.drop_index("uq_transactions_user_import_hash", table_name="transactions")
+    op.drop_column("transactions", "import_hash")
@@ -0,0 +1,66 @@
+"""Composite and covering indexes for the filtered list and analytics queries.
+
+Every query filters on user_id first, so the single-column user_id and date
+indexes are superseded by the composites and dropped. The date ones were
+worse than redundant: the planner would walk every user's rows in date order
+and filter, rather than jump straight to one user's range. The income matrix and balance
+timeline get covering indexes (INCLUDE) so they are answered from the index
+without visiting the table.
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "015"
+down_revision = "014"
+branch_labels = None
+depends_on = None
+
+_INDEXES = (
+    (
+        "ix_transactions_user_account_date_id",
+        "transactions",
+        ["user_id", "storage_account_id", "date", "id"],
+        None,
+    ),
+    (
+        "ix_transactions_user_source_date_id",
+        "transactions",
+        ["user_id", "income_source_id", "date", "id"],
+        None,
+    ),
+    (
+        "ix_transactions_user_type_date",
+        "transactions",
+        ["user_id", "type", "date"],
+        ["amount", "currency_id", "income_source_id"],
+    ),
+    (
+        "ix_balance_snapshots_user_account_date_id",
+        "balance_snapshots",
+        ["user_id", "storage_account_id", "date", "id"],
+        ["amount"],
+    ),
+)
+_SUPERSEDED = (
+    ("ix_transactions_user_id", "transactions", "user_id"),
+    ("ix_transactions_date", "transactions", "date"),
+    ("ix_balance_snapshots_user_id", "balance_snapshots", "user_id"),
+    ("ix_balance_snapshots_date", "balance_snapshots", "date"),
+)
+
+
+def upgrade():
+    for name, table, columns, include in _INDEXES:
+        op.create_index(name, table, columns, postgresql_include=include or [])
+    for name, table, _ in _SUPERSEDED:
+        op.drop_index(name, table_name=table)
+    op.execute(sa.text("ANALYZE transactions"))
+    op.execute(sa.text("ANALYZE balance_snapshots"))
+
+
+def downgrade():
+    for name, table, column in _SUPERSEDED:
+        op.create_index(name, table, [column])
+    for name, table, _, _ in reversed(_INDEXES):
+        op.drop_index(name, table_name=table)
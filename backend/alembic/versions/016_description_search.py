@@ -0,0 +1,28 @@
+"""Trigram index for searching transaction descriptions.
+
+pg_trgm's GIN operator class serves ILIKE '%term%', so a search only reads
+the rows that share the term's trigrams instead of every description.
+"""
+
+from alembic import op
+
+revision = "016"
+down_revision = "015"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        "ix_transactions_description_trgm",
+        "transactions",
+        ["description"],
+        postgresql_using="gin",
+        postgresql_ops={"description": "gin_trgm_ops"},
+    )
+
+
+def downgrade():
+    op.drop_index("ix_transactions_description_trgm", table_name="transactions")
+    # The extension is left in place: other objects may have come to use it.
@@ -0,0 +1,62 @@
+"""One balance snapshot per account per day.
+
+Analytics already treated the newest of several same-day snapshots as the
+balance, so the older duplicates are removed before the constraint is added.
+They are copied to balance_snapshots_017_duplicates first, which is kept
+until a downgrade puts them back. The constraint lets a day's balances be
+upserted with ON CONFLICT.
+"""
+
+from alembic import op
+
+revision = "017"
+down_revision = "016"
+branch_labels = None
+depends_on = None
+
+_BACKUP_TABLE = "balance_snapshots_017_duplicates"
+
+
+def upgrade():
+    op.execute(
+        f"""
+        CREATE TABLE {_BACKUP_TABLE} AS
+        SELECT older.*
+        FROM balance_snapshots older
+        WHERE EXISTS (
+            SELECT 1 FROM balance_snapshots newer
+            WHERE newer.storage_account_id = older.storage_account_id
+              AND newer.date = older.date
+              AND newer.id > older.id
+        )
+        """
+    )
+    op.execute(
+        f"""
+        DELETE FROM balance_snapshots
+        WHERE id IN (SELECT id FROM {_BACKUP_TABLE})
+        """
+    )
+    op.create_unique_constraint(
+        "uq_balance_snapshots_account_date",
+        "balance_snapshots",
+        ["storage_account_id", "date"],
+    )
+
+
+def downgrade():
+    op.drop_constraint(
+        "uq_balance_snapshots_account_date", "balance_snapshots", type_="unique"
+    )
+    # Rows whose account or user has since been deleted stay deleted.
+    op.execute(
+        f"""
+        INSERT INTO balance_snapshots
+        SELECT backup.* FROM {_BACKUP_TABLE} backup
+        WHERE EXISTS (
+            SELECT 1 FROM storage_accounts a
+            WHERE a.id = backup.storage_account_id AND a.user_id = backup.user_id
+        )
+        """
+    )
+    op.drop_table(_BACKUP_TABLE)
@@ -0,0 +1,24 @@
+"""Add users.token_version, stamped into access tokens.
+
+Changing the password bumps it, which retires every access token issued
+before the change and every cached copy of the user row.
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "018"
+down_revision = "017"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "users",
+        sa.Column("token_version", sa.Integer(), nullable=False, server_default="0"),
+    )
+
+
+def downgrade():
+    op.drop_column("users", "token_version")
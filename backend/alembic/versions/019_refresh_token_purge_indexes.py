@@ -0,0 +1,24 @@
+"""Index refresh tokens for the periodic purge of revoked and expired rows."""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "019"
+down_revision = "018"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix_refresh_tokens_expires_at", "refresh_tokens", ["expires_at"])
+    op.create_index(
+        "ix_refresh_tokens_revoked",
+        "refresh_tokens",
+        ["id"],
+        postgresql_where=sa.text("revoked"),
+    )
+
+
+def downgrade():
+    op.drop_index("ix_refresh_tokens_revoked", table_name="refresh_tokens")
+    op.drop_index("ix_refresh_tokens_expires_at", table_name="refresh_tokens")
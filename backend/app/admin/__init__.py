@@ -1,48 +1,34 @@
+"""The sqladmin site at /admin.
+
+sqladmin and the model views are among the slowest imports in the API, and
+most processes never serve an admin page, so only the mount point is
+registered at startup; the site is imported and built on its first request.
+"""
+
 from fastapi import FastAPI
-from sqladmin import Admin
-
-from app.admin.auth import AdminAuth
-from app.admin.views import (
-    BalanceSnapshotAdmin,
-    CatalogSyncHistoryAdmin,
-    CurrencyAdmin,
-    CurrencyCatalogAdmin,
-    ExchangeRateAdmin,
-    ExpenseCategoryAdmin,
-    IncomeSourceAdmin,
-    RefreshTokenAdmin,
-    StorageAccountAdmin,
-    StorageLocationAdmin,
-    TransactionAdmin,
-    UserAdmin,
-    UserExchangeRateAdmin,
-)
-from app.core.config import settings
-from app.core.database import engine
-
-
-def setup_admin(app: FastAPI) -> None:
-    authentication_backend = AdminAuth(secret_key=settings.ADMIN_SECRET_KEY)
-    admin = Admin(
-        app,
-        engine,
-        authentication_backend=authentication_backend,
-        title="Wallet Admin",
-        base_url="/admin",
-    )
-    for view in [
-        UserAdmin,
-        TransactionAdmin,
-        ExpenseCategoryAdmin,
-        IncomeSourceAdmin,
-        CurrencyAdmin,
-        StorageLocationAdmin,
-        StorageAccountAdmin,
-        BalanceSnapshotAdmin,
-        RefreshTokenAdmin,
-        CurrencyCatalogAdmin,
-        CatalogSyncHistoryAdmin,
-        ExchangeRateAdmin,
-        UserExchangeRateAdmin,
-    ]:
-        admin.add_view(view)
+from starlette.routing import BaseRoute
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+ADMIN_PATH = "/admin"
+
+
+class _LazyAdminSite:
+    def __init__(self) -> None:
+        self._site: ASGIApp | None = None
+
+    @property
+    def routes(self) -> list[BaseRoute]:
+        # Read by the Mount for url_for("admin:..."), which only the site's
+        # own pages call, so it is always built by then.
+        return getattr(self._site, "routes", [])
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if self._site is None:
+            from app.admin.site import build_admin_site
+
+            self._site = build_admin_site()
+        await self._site(scope, receive, send)
+
+
+def mount_admin(app: FastAPI) -> None:
+    app.mount(ADMIN_PATH, _LazyAdminSite(), name="admin")
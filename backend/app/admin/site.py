@@ -0,0 +1,52 @@
+from sqladmin import Admin
+from starlette.applications import Starlette
+
+from app.admin import ADMIN_PATH
+from app.admin.auth import AdminAuth
+from app.admin.views import (
+    BalanceSnapshotAdmin,
+    CatalogSyncHistoryAdmin,
+    CurrencyAdmin,
+    CurrencyCatalogAdmin,
+    ExchangeRateAdmin,
+    ExpenseCategoryAdmin,
+    IncomeSourceAdmin,
+    RefreshTokenAdmin,
+    StorageAccountAdmin,
+    StorageLocationAdmin,
+    TransactionAdmin,
+    UserAdmin,
+    UserExchangeRateAdmin,
+)
+from app.core.config import settings
+from app.core.database import engine
+
+
+def build_admin_site() -> Starlette:
+    authentication_backend = AdminAuth(secret_key=settings.ADMIN_SECRET_KEY)
+    # Admin mounts its site onto the app it is given; the throwaway app only
+    # receives that mount, and the site itself is returned for mount_admin.
+    admin = Admin(
+        Starlette(),
+        engine,
+        authentication_backend=authentication_backend,
+        title="Wallet Admin",
+        base_url=ADMIN_PATH,
+    )
+    for view in [
+        UserAdmin,
+        TransactionAdmin,
+        ExpenseCategoryAdmin,
+        IncomeSourceAdmin,
+        CurrencyAdmin,
+        StorageLocationAdmin,
+        StorageAccountAdmin,
+        BalanceSnapshotAdmin,
+        RefreshTokenAdmin,
+        CurrencyCatalogAdmin,
+        CatalogSyncHistoryAdmin,
+        ExchangeRateAdmin,
+        UserExchangeRateAdmin,
+    ]:
+        admin.add_view(view)
+    return admin.admin
@@ -1,4 +1,7 @@
 from sqladmin import ModelView
+from starlette.requests import Request
+
+from app.core.user_cache import invalidate_user
 
 from app.models.balance_snapshot import BalanceSnapshot
 from app.models.currency import Currency
@@ -38,6 +41,17 @@ class UserAdmin(ModelView, model=User):
         User.onboarding_completed_at,
     ]
 
+    # Both run after the session has committed. Edits never touch
+    # token_version, so the entry to drop is the one under the current one.
+    async def after_model_change(
+        self, data: dict, model: User, is_created: bool, request: Request
+    ) -> None:
+        if not is_created:
+            await invalidate_user(model.id, model.token_version)
+
+    async def after_model_delete(self, model: User, request: Request) -> None:
+        await invalidate_user(model.id, model.token_version)
+
 
 class TransactionAdmin(ModelView, model=Transaction):
     name = "Transaction"
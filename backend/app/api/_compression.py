@@ -0,0 +1,99 @@
+import gzip
+from collections.abc import Callable, Coroutine
+from typing import Any
+
+from fastapi import Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.routing import APIRoute
+
+from app.core.metrics import (
+    COMPRESSION_INPUT_BYTES,
+    COMPRESSION_OUTPUT_BYTES,
+    COMPRESSION_RATIO,
+)
+
+try:
+    import brotli
+except ImportError:  # optional: gzip alone covers every client
+    brotli = None
+
+# Below this, headers and the compressor's own framing eat most of the gain.
+MINIMUM_SIZE = 1024
+# Compressing a body this large takes milliseconds; do it on a worker thread
+# so other requests keep being served. Smaller bodies are cheaper to
+# compress inline than to hand to a thread.
+OFFLOAD_SIZE = 64 * 1024
+
+# Levels chosen for responses compressed on every request: most of the
+# ratio of the maximum settings at a fraction of the CPU.
+_ENCODERS: dict[str, Callable[[bytes], bytes]] = {
+    "gzip": lambda body: gzip.compress(body, compresslevel=6),
+}
+if brotli is not None:
+    _ENCODERS = {"br": lambda body: brotli.compress(body, quality=4), **_ENCODERS}
+
+
+def negotiate_encoding(accept_encoding: str) -> str | None:
+    """The preferred encoding the client accepts, or None for identity."""
+    accepted: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+    wildcard = accepted.get("*", 0.0)
+    for encoding in _ENCODERS:
+        if accepted.get(encoding, wildcard) > 0:
+            return encoding
+    return None
+
+
+async def compress_response(request: Request, response: Response) -> Response:
+    # Streamed responses (exports) have no body to compress.
+    body = getattr(response, "body", None)
+    if (
+        not isinstance(body, bytes)
+        or len(body) < MINIMUM_SIZE
+        or "content-encoding" in response.headers
+    ):
+        return response
+    response.headers.append("Vary", "Accept-Encoding")
+    encoding = negotiate_encoding(request.headers.get("accept-encoding", ""))
+    if encoding is None:
+        return response
+
+    encode = _ENCODERS[encoding]
+    if len(body) >= OFFLOAD_SIZE:
+        compressed = await run_in_threadpool(encode, body)
+    else:
+        compressed = encode(body)
+
+    COMPRESSION_INPUT_BYTES.labels(encoding).inc(len(body))
+    COMPRESSION_OUTPUT_BYTES.labels(encoding).inc(len(compressed))
+    COMPRESSION_RATIO.labels(encoding).observe(len(compressed) / len(body))
+    response.body = compressed
+    response.headers["Content-Encoding"] = encoding
+    response.headers["Content-Length"] = str(len(compressed))
+    return response
+
+
+class CompressedRoute(APIRoute):
+    """Route class that compresses large responses for clients that accept it.
+
+    Used by the routers whose reads return big JSON documents: analytics and
+    the list endpoints. Responses under MINIMUM_SIZE, and streamed ones, are
+    sent as they are.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+
+        async def compressed_handler(request: Request) -> Response:
+            return await compress_response(request, await handler(request))
+
+        return compressed_handler
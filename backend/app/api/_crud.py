@@ -5,9 +5,10 @@ from pydantic import BaseModel
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api._compression import CompressedRoute
 from app.core.database import get_db
 from app.core.db_helpers import get_or_404
-from app.core.dependencies import get_current_user
+from app.core.dependencies import get_current_user, get_read_db
 from app.models import User
 
 
@@ -28,12 +29,12 @@ def build_crud_router(
     Path parameters are extracted from the request by id_param name so that
     the generated OpenAPI schema shows the correct parameter name.
     """
-    router = APIRouter(prefix=prefix, tags=tags)
+    router = APIRouter(prefix=prefix, tags=tags, route_class=CompressedRoute)
 
     @router.get("/", response_model=list[response_schema])
     async def list_resources(
         user: User = Depends(get_current_user),
-        db: AsyncSession = Depends(get_db),
+        db: AsyncSession = Depends(get_read_db, scope="function"),
     ):
         result = await db.execute(select(model).where(model.user_id == user.id))
         return result.scalars().all()
@@ -0,0 +1,94 @@
+import base64
+import binascii
+import json
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from typing import Any, Callable
+
+from fastapi import Response
+from sqlalchemy import ColumnElement, Select, tuple_
+
+from app.core.exceptions import AppException
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class InvalidCursor(AppException):
+    def __init__(self, detail: str | None = None):
+        super().__init__(
+            code="pagination/invalid_cursor",
+            message="The page cursor is invalid or does not match this query",
+            status_code=422,
+            detail=detail,
+        )
+
+
+# How each sort key survives the trip through JSON. Dates and amounts are sent
+# as strings so a Decimal never passes through a float on its way back in.
+_KEY_CODECS: dict[str, tuple[Callable[[Any], Any], Callable[[Any], Any]]] = {
+    "date": (lambda v: v.isoformat(), date.fromisoformat),
+    "amount": (str, Decimal),
+    "text": (str, str),
+    # Search ranks are float4; a Python float holds one exactly.
+    "rank": (float, float),
+}
+
+
+def encode_cursor(sort: str, order: str, kind: str, key: Any, row_id: int) -> str:
+    encode_key, _ = _KEY_CODECS[kind]
+    payload = json.dumps([sort, order, encode_key(key), row_id])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str, order: str, kind: str) -> tuple[Any, int]:
+    """Return the (sort key, id) a cursor points past.
+
+    A cursor is only valid for the ordering it was issued under: replaying it
+    against a different sort would silently skip or repeat rows, so that is
+    rejected rather than answered.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cur_sort, cur_order, raw_key, row_id = json.loads(
+            base64.urlsafe_b64decode(padded)
+        )
+        _, decode_key = _KEY_CODECS[kind]
+        key = decode_key(raw_key)
+    except (
+        binascii.Error,
+        InvalidOperation,
+        TypeError,
+        UnicodeDecodeError,
+        ValueError,
+    ) as exc:
+        raise InvalidCursor() from exc
+    if (cur_sort, cur_order) != (sort, order) or not isinstance(row_id, int):
+        raise InvalidCursor()
+    return key, row_id
+
+
+def apply_keyset(
+    stmt: Select,
+    sort_key: ColumnElement,
+    id_col: ColumnElement,
+    descending: bool,
+    after: tuple[Any, int] | None,
+) -> Select:
+    """Order by (sort_key, id) and, given a cursor, start strictly past it.
+
+    The id tiebreaker is what makes the order total: without it rows sharing a
+    date or amount can swap places between two requests and land on both pages
+    or on neither.
+    """
+    if after is not None:
+        row = tuple_(sort_key, id_col)
+        bound = tuple_(*after)
+        stmt = stmt.where(row < bound if descending else row > bound)
+    if descending:
+        return stmt.order_by(sort_key.desc(), id_col.desc())
+    return stmt.order_by(sort_key.asc(), id_col.asc())
+
+
+def set_next_cursor(response: Response, cursor: str | None) -> None:
+    if cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
@@ -1,14 +1,15 @@
 from datetime import date
 
 from fastapi import APIRouter, Depends, Query
-from pydantic import BaseModel
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
-from app.core.dependencies import get_current_user
+from app.api._compression import CompressedRoute
+from app.core.dependencies import get_current_user, get_read_db
 from app.core.exceptions import AppException
+from app.core.responses import DecimalJSONResponse
 from app.models import Currency, User
+from app.schemas.analytics import BalanceBreakdown
 from app.services.analytics import (
     GroupBy,
     explain_period,
@@ -21,7 +22,7 @@ from app.services.analytics import (
     get_date_range,
 )
 
-router = APIRouter(prefix="/analytics", tags=["analytics"])
+router = APIRouter(prefix="/analytics", tags=["analytics"], route_class=CompressedRoute)
 
 
 async def _resolve_convert_to(
@@ -66,20 +67,7 @@ async def _resolve_convert_to(
     return next(iter(valid_codes), None)
 
 
-class BalanceBreakdownItem(BaseModel):
-    account_id: int
-    account_label: str
-    currency: str
-    latest_snapshot_date: date
-    latest_snapshot_amount: float
-
-
-class BalanceBreakdown(BaseModel):
-    accounts: list[BalanceBreakdownItem]
-    totals: dict[str, float]
-
-
-@router.get("/summary")
+@router.get("/summary", response_class=DecimalJSONResponse)
 async def summary(
     date_from: date = Query(...),
     date_to: date = Query(...),
@@ -87,29 +75,33 @@ async def summary(
     currency_id: int | None = Query(default=None),
     convert_to: str | None = Query(default=None),
     user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db, scope="function"),
 ):
     convert_to = await _resolve_convert_to(db, user, convert_to, currency_id)
-    return await get_summary(
-        db, user.id, date_from, date_to, group_by, currency_id, convert_to
+    return DecimalJSONResponse(
+        await get_summary(
+            db, user.id, date_from, date_to, group_by, currency_id, convert_to
+        )
     )
 
 
-@router.get("/summary/explain")
+@router.get("/summary/explain", response_class=DecimalJSONResponse)
 async def summary_explain(
     period: date = Query(..., description="Start date of the period to explain"),
     group_by: GroupBy = Query(default=GroupBy.month),
     currency_id: int | None = Query(default=None),
     convert_to: str | None = Query(default=None),
     user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db, scope="function"),
 ):
     """Break a single summary row down into the snapshots and transactions behind it."""
     convert_to = await _resolve_convert_to(db, user, convert_to, currency_id)
-    return await explain_period(db, user.id, period, group_by, currency_id, convert_to)
+    return DecimalJSONResponse(
+        await explain_period(db, user.id, period, group_by, currency_id, convert_to)
+    )
 
 
-@router.get("/income-by-source")
+@router.get("/income-by-source", response_class=DecimalJSONResponse)
 async def income_by_source(
     date_from: date = Query(...),
     date_to: date = Query(...),
@@ -117,57 +109,63 @@ async def income_by_source(
     currency_id: int | None = Query(default=None),
     convert_to: str | None = Query(default=None),
     user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db, scope="function"),
 ):
     convert_to = await _resolve_convert_to(db, user, convert_to, currency_id)
-    return await get_income_by_source(
-        db, user.id, date_from, date_to, group_by, currency_id, convert_to
+    return DecimalJSONResponse(
+        await get_income_by_source(
+            db, user.id, date_from, date_to, group_by, currency_id, convert_to
+        )
     )
 
 
-@router.get("/balance-by-storage")
+@router.get("/balance-by-storage", response_class=DecimalJSONResponse)
 async def balance_by_storage(
     date_from: date = Query(...),
     date_to: date = Query(...),
     group_by: GroupBy = Query(default=GroupBy.month),
     user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db, scope="function"),
 ):
-    return await get_balance_by_storage(db, user.id, date_from, date_to, group_by)
+    return DecimalJSONResponse(
+        await get_balance_by_storage(db, user.id, date_from, date_to, group_by)
+    )
 
 
-@router.get("/snapshot-timeline")
+@router.get("/snapshot-timeline", response_class=DecimalJSONResponse)
 async def snapshot_timeline(
     date_from: date = Query(...),
     date_to: date = Query(...),
     user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db, scope="function"),
 ):
     """Balances at every date the user recorded snapshots on, newest first."""
-    return await get_snapshot_timeline(db, user.id, date_from, date_to)
+    return DecimalJSONResponse(
+        await get_snapshot_timeline(db, user.id, date_from, date_to)
+    )
 
 
-@router.get("/expense-template")
+@router.get("/expense-template", response_class=DecimalJSONResponse)
 async def expense_template(
     user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db, scope="function"),
 ):
-    return await get_expense_template(db, user.id)
+    return DecimalJSONResponse(await get_expense_template(db, user.id))
 
 
 @router.get("/balance-breakdown", response_model=BalanceBreakdown)
 async def balance_breakdown(
     user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db, scope="function"),
 ):
     """Return the latest balance snapshot per storage account, plus per-currency totals."""
     return await get_balance_breakdown(db, user.id)
 
 
-@router.get("/date-range")
+@router.get("/date-range", response_class=DecimalJSONResponse)
 async def date_range(
     user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db, scope="function"),
 ):
     """Return the earliest and latest dates across the user's transactions and balance snapshots."""
-    return await get_date_range(db, user.id)
+    return DecimalJSONResponse(await get_date_range(db, user.id))
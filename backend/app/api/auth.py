@@ -1,7 +1,7 @@
 from datetime import datetime, timedelta, timezone
 
 from fastapi import APIRouter, Cookie, Depends, Response, status
-from sqlalchemy import delete, select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
@@ -17,10 +17,12 @@ from app.core.password_policy import validate_password
 from app.core.security import (
     create_access_token,
     create_refresh_token,
-    hash_password,
+    hash_password_async,
     hash_refresh_token,
-    verify_password,
+    password_needs_rehash,
+    verify_password_async,
 )
+from app.core.user_cache import invalidate_user
 from app.models.refresh_token import RefreshToken
 from app.models.user import User
 from app.schemas.auth import (
@@ -35,20 +37,19 @@ from app.schemas.auth import (
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
-async def _cleanup_tokens(user_id: int, db: AsyncSession) -> None:
-    now = datetime.now(timezone.utc)
-    await db.execute(
-        delete(RefreshToken).where(
-            RefreshToken.user_id == user_id,
-            (RefreshToken.revoked == True) | (RefreshToken.expires_at < now),  # noqa: E712
-        )
-    )
+async def _password_hash(user: User, db: AsyncSession) -> str | None:
+    # The user cache leaves the hash out, so the current user may not carry
+    # it; it is read from the database whenever a password is checked.
+    return await db.scalar(select(User.password_hash).where(User.id == user.id))
 
 
-async def _issue_tokens(user_id: int, db: AsyncSession) -> tuple[str, str]:
-    """Returns (access_token, raw_refresh_token). Stores only hash of refresh token in DB."""
-    await _cleanup_tokens(user_id, db)
-    access_token = create_access_token(user_id)
+async def _issue_tokens(user: User, db: AsyncSession) -> tuple[str, str]:
+    """Returns (access_token, raw_refresh_token). Stores only hash of refresh token in DB.
+
+    Revoked and expired tokens are left for app.tasks.token_purge to delete.
+    """
+    user_id = user.id
+    access_token = create_access_token(user_id, user.token_version)
     raw_refresh, hashed_refresh = create_refresh_token()
     expires_at = datetime.now(timezone.utc) + timedelta(
         days=settings.REFRESH_TOKEN_EXPIRE_DAYS
@@ -103,10 +104,12 @@ async def register(
     if existing.scalar_one_or_none():
         raise AuthEmailTaken()
 
-    user = User(email=body.email, password_hash=hash_password(body.password))
+    user = User(
+        email=body.email, password_hash=await hash_password_async(body.password)
+    )
     db.add(user)
     await db.flush()
-    access_token, refresh_token = await _issue_tokens(user.id, db)
+    access_token, refresh_token = await _issue_tokens(user, db)
     _set_auth_cookies(response, access_token, refresh_token)
     return user
 
@@ -117,9 +120,14 @@ async def login(
 ):
     result = await db.execute(select(User).where(User.email == body.email))
     user = result.scalar_one_or_none()
-    if not user or not verify_password(body.password, user.password_hash):
+    if not user or not await verify_password_async(body.password, user.password_hash):
         raise AuthInvalidCredentials()
-    access_token, refresh_token = await _issue_tokens(user.id, db)
+    if password_needs_rehash(user.password_hash):
+        # The plain password is only ever at hand here, so this is where a
+        # change of BCRYPT_ROUNDS reaches existing accounts. The hash is never
+        # cached, so there is nothing to invalidate.
+        user.password_hash = await hash_password_async(body.password)
+    access_token, refresh_token = await _issue_tokens(user, db)
     _set_auth_cookies(response, access_token, refresh_token)
     return user
 
@@ -142,7 +150,8 @@ async def refresh(
         raise AuthInvalidRefreshToken()
 
     token.revoked = True
-    access_token, new_refresh = await _issue_tokens(token.user_id, db)
+    user = await db.get(User, token.user_id)
+    access_token, new_refresh = await _issue_tokens(user, db)
     _set_auth_cookies(response, access_token, new_refresh)
 
 
@@ -175,7 +184,10 @@ async def complete_onboarding(
 ):
     if user.onboarding_completed_at is None:
         user.onboarding_completed_at = datetime.now(timezone.utc)
-        await db.flush()
+        # Committed before the cache entry goes, or a concurrent request
+        # could re-cache the old row in between.
+        await db.commit()
+        await invalidate_user(user.id, user.token_version)
     return user
 
 
@@ -185,13 +197,16 @@ async def change_email(
     user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    if not verify_password(body.current_password, user.password_hash):
+    if not await verify_password_async(
+        body.current_password, await _password_hash(user, db)
+    ):
         raise AuthInvalidCredentials()
     existing = await db.execute(select(User).where(User.email == body.new_email))
     if existing.scalar_one_or_none():
         raise AuthEmailTaken()
     user.email = body.new_email
-    await db.flush()
+    await db.commit()
+    await invalidate_user(user.id, user.token_version)
     return user
 
 
@@ -202,18 +217,36 @@ async def update_preferences(
     db: AsyncSession = Depends(get_db),
 ):
     user.base_currency_code = body.base_currency_code
-    await db.flush()
+    await db.commit()
+    await invalidate_user(user.id, user.token_version)
     return user
 
 
 @router.patch("/me/password", status_code=status.HTTP_204_NO_CONTENT)
 async def change_password(
     body: ChangePasswordRequest,
+    response: Response,
     user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
 ):
-    if not verify_password(body.current_password, user.password_hash):
+    if not await verify_password_async(
+        body.current_password, await _password_hash(user, db)
+    ):
         raise AuthInvalidCredentials()
     violations = validate_password(body.new_password)
     if violations:
         raise AuthWeakPassword(violations)
-    user.password_hash = hash_password(body.new_password)
+    old_version = user.token_version
+    user.password_hash = await hash_password_async(body.new_password)
+    # Signs out every other session: their access tokens carry the old
+    # version and their refresh tokens are revoked. This one gets new ones.
+    user.token_version = old_version + 1
+    await db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.user_id == user.id, RefreshToken.revoked == False)  # noqa: E712
+        .values(revoked=True)
+    )
+    access_token, refresh_token = await _issue_tokens(user, db)
+    await db.commit()
+    await invalidate_user(user.id, old_version)
+    _set_auth_cookies(response, access_token, refresh_token)
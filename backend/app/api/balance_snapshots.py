@@ -1,46 +1,115 @@
 from datetime import date
 
-from fastapi import APIRouter, Depends, Query, status
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, Query, Response, status
+from sqlalchemy import Select, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api._compression import CompressedRoute
+from app.api._export import ExportFormat, stream_export
+from app.api._pagination import (
+    apply_keyset,
+    decode_cursor,
+    encode_cursor,
+    set_next_cursor,
+)
 from app.core.database import get_db
 from app.core.db_helpers import get_or_404
-from app.core.dependencies import get_current_user
+from app.core.dependencies import get_current_user, get_read_db
+from app.core.exceptions import ResourceNotFound
 from app.models import User, BalanceSnapshot, StorageAccount
+from app.schemas.analytics import BalanceBreakdown
 from app.schemas.balance_snapshot import (
+    BalanceSnapshotBatch,
     BalanceSnapshotCreate,
     BalanceSnapshotUpdate,
     BalanceSnapshotResponse,
 )
+from app.services.analytics import get_balance_breakdown
+
+router = APIRouter(
+    prefix="/balance-snapshots", tags=["balance-snapshots"], route_class=CompressedRoute
+)
 
-router = APIRouter(prefix="/balance-snapshots", tags=["balance-snapshots"])
+
+def _apply_filters(
+    stmt: Select,
+    *,
+    storage_account_id: int | None,
+    date_from: date | None,
+    date_to: date | None,
+) -> Select:
+    if storage_account_id:
+        stmt = stmt.where(BalanceSnapshot.storage_account_id == storage_account_id)
+    if date_from:
+        stmt = stmt.where(BalanceSnapshot.date >= date_from)
+    if date_to:
+        stmt = stmt.where(BalanceSnapshot.date <= date_to)
+    return stmt
 
 
 @router.get("/", response_model=list[BalanceSnapshotResponse])
 async def list_snapshots(
+    response: Response,
     storage_account_id: int | None = None,
     date_from: date | None = None,
     date_to: date | None = None,
     limit: int = Query(default=100, le=1000),
     offset: int = 0,
+    cursor: str | None = Query(default=None),
     user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db, scope="function"),
 ):
-    q = (
-        select(BalanceSnapshot)
-        .where(BalanceSnapshot.user_id == user.id)
-        .order_by(BalanceSnapshot.date.desc())
+    """Newest snapshots first; see list_transactions for how ``cursor`` pages."""
+    after = (
+        decode_cursor(cursor, "date", "desc", "date") if cursor is not None else None
     )
-    if storage_account_id:
-        q = q.where(BalanceSnapshot.storage_account_id == storage_account_id)
-    if date_from:
-        q = q.where(BalanceSnapshot.date >= date_from)
-    if date_to:
-        q = q.where(BalanceSnapshot.date <= date_to)
-    q = q.offset(offset).limit(limit)
+    q = select(BalanceSnapshot).where(BalanceSnapshot.user_id == user.id)
+    q = apply_keyset(q, BalanceSnapshot.date, BalanceSnapshot.id, True, after)
+    q = _apply_filters(
+        q,
+        storage_account_id=storage_account_id,
+        date_from=date_from,
+        date_to=date_to,
+    )
+    if after is None:
+        q = q.offset(offset)
+    q = q.limit(limit)
     result = await db.execute(q)
-    return result.scalars().all()
+    snapshots = result.scalars().all()
+
+    if snapshots and len(snapshots) == limit:
+        last = snapshots[-1]
+        set_next_cursor(
+            response, encode_cursor("date", "desc", "date", last.date, last.id)
+        )
+    return snapshots
+
+
+@router.get("/export")
+async def export_snapshots(
+    export_format: ExportFormat = Query(default=ExportFormat.ndjson, alias="format"),
+    storage_account_id: int | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Every matching snapshot, newest first, streamed as NDJSON or CSV."""
+    q = select(
+        BalanceSnapshot.id,
+        BalanceSnapshot.storage_account_id,
+        BalanceSnapshot.date,
+        BalanceSnapshot.amount,
+    ).where(BalanceSnapshot.user_id == user.id)
+    q = _apply_filters(
+        q,
+        storage_account_id=storage_account_id,
+        date_from=date_from,
+        date_to=date_to,
+    )
+    q = q.order_by(BalanceSnapshot.date.desc(), BalanceSnapshot.id.desc())
+    return stream_export(db, q, export_format, "balance_snapshots")
 
 
 @router.post(
@@ -51,14 +120,61 @@ async def create_snapshot(
     user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
+    """Record one account's balance; one already recorded that day is replaced."""
     await get_or_404(
         db, StorageAccount, body.storage_account_id, user.id, "storage_account"
     )
-    obj = BalanceSnapshot(**body.model_dump(), user_id=user.id)
-    db.add(obj)
-    await db.flush()
-    await db.refresh(obj)
-    return obj
+    stmt = pg_insert(BalanceSnapshot).values(**body.model_dump(), user_id=user.id)
+    return await db.scalar(
+        stmt.on_conflict_do_update(
+            index_elements=[BalanceSnapshot.storage_account_id, BalanceSnapshot.date],
+            set_={"amount": stmt.excluded.amount},
+        ).returning(BalanceSnapshot)
+    )
+
+
+@router.post("/batch", response_model=BalanceBreakdown)
+async def record_balances(
+    body: BalanceSnapshotBatch,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Record the balance of several accounts on one day.
+
+    A balance already recorded for an account on that day is replaced. The
+    response is the balance breakdown as of that day, so the caller sees the
+    new totals without a second request.
+    """
+    account_ids = [b.storage_account_id for b in body.balances]
+    owned = set(
+        await db.scalars(
+            select(StorageAccount.id).where(
+                StorageAccount.user_id == user.id,
+                StorageAccount.id.in_(account_ids),
+            )
+        )
+    )
+    if len(owned) != len(account_ids):
+        raise ResourceNotFound("storage_account")
+
+    stmt = pg_insert(BalanceSnapshot).values(
+        [
+            {
+                "user_id": user.id,
+                "storage_account_id": b.storage_account_id,
+                "date": body.date,
+                "amount": b.amount,
+            }
+            for b in body.balances
+        ]
+    )
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[BalanceSnapshot.storage_account_id, BalanceSnapshot.date],
+            set_={"amount": stmt.excluded.amount},
+        )
+    )
+    return await get_balance_breakdown(db, user.id, body.date)
 
 
 @router.put("/{snapshot_id}", response_model=BalanceSnapshotResponse)
@@ -4,10 +4,11 @@ from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api._compression import CompressedRoute
 from app.core.config import settings
 from app.core.database import get_db
 from app.core.db_helpers import get_or_404
-from app.core.dependencies import get_current_user
+from app.core.dependencies import get_current_user, get_read_db
 from app.core.exceptions import AppException, ResourceNotFound
 from app.models import Currency, User
 from app.models.currency_catalog import CurrencyCatalog
@@ -19,14 +20,16 @@ from app.schemas.currency import (
     CurrencyUpdate,
 )
 
-router = APIRouter(prefix="/currencies", tags=["currencies"])
+router = APIRouter(
+    prefix="/currencies", tags=["currencies"], route_class=CompressedRoute
+)
 
 
 @router.get("/catalog", response_model=list[CatalogCurrencyResponse])
 async def list_catalog_currencies(
     search: str | None = Query(default=None, max_length=50),
     limit: int = Query(default=50, ge=1, le=500),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db, scope="function"),
 ):
     """List all active currencies in the catalog with their rate availability."""
     q = select(CurrencyCatalog).where(CurrencyCatalog.is_active.is_(True))
@@ -75,7 +78,8 @@ async def list_catalog_currencies(
 
 @router.get("/", response_model=list[CurrencyResponse])
 async def list_currencies(
-    user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db, scope="function"),
 ):
     result = await db.execute(select(Currency).where(Currency.user_id == user.id))
     return result.scalars().all()
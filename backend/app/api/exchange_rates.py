@@ -4,9 +4,10 @@ from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api._compression import CompressedRoute
 from app.core.database import get_db
 from app.core.db_helpers import get_or_404
-from app.core.dependencies import get_current_user
+from app.core.dependencies import get_current_user, get_read_db
 from app.core.exceptions import ResourceNotFound
 from app.models import Currency, User
 from app.models.exchange_rate import ExchangeRate, UserExchangeRate
@@ -17,14 +18,14 @@ from app.schemas.exchange_rate import (
 )
 from app.services.exchange_rates import get_rate, get_rates_batch
 
-router = APIRouter(tags=["exchange-rates"])
+router = APIRouter(tags=["exchange-rates"], route_class=CompressedRoute)
 
 
 @router.get("/currencies/rates/all", response_model=dict[int, RateInfoResponse])
 async def get_all_currency_rates(
     to_code: str = Query(default="USD"),
     user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db, scope="function"),
 ):
     """Get current exchange rates for all user currencies (to USD) in one call."""
     result = await db.execute(select(Currency).where(Currency.user_id == user.id))
@@ -83,7 +84,7 @@ async def get_currency_rate_history(
     currency_id: int,
     days: int = Query(default=30, ge=1, le=365),
     user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db, scope="function"),
 ):
     """Get exchange rate history for a user currency (system rates only, to USD)."""
     currency = await get_or_404(db, Currency, currency_id, user.id, "currency")
@@ -142,7 +143,7 @@ async def create_manual_rate(
 async def list_manual_rates(
     currency_id: int,
     user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db, scope="function"),
 ):
     """List user manual exchange rates for a currency."""
     currency = await get_or_404(db, Currency, currency_id, user.id, "currency")
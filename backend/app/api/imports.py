@@ -0,0 +1,105 @@
+import json
+import uuid
+from pathlib import Path
+from typing import BinaryIO
+from uuid import UUID
+
+import redis.asyncio as aioredis
+from fastapi import APIRouter, Depends, Form, HTTPException, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import get_db
+from app.core.db_helpers import get_or_404
+from app.core.dependencies import get_current_user, get_redis
+from app.models import IncomeSource, StorageAccount, User
+from app.services.statement_import import StatementFormat
+from app.tasks.statement_import import (
+    IMPORT_STATUS_TTL,
+    import_statement,
+    import_status_key,
+)
+
+router = APIRouter(prefix="/imports", tags=["imports"])
+
+
+_UPLOAD_CHUNK = 1024 * 1024
+
+
+def _save_upload(source: BinaryIO, destination: Path, max_bytes: int) -> None:
+    """Copy ``source`` in chunks; past ``max_bytes``, remove the copy and 413."""
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    written = 0
+    try:
+        with destination.open("wb") as out:
+            while chunk := source.read(_UPLOAD_CHUNK):
+                written += len(chunk)
+                if written > max_bytes:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"Statement files are limited to {max_bytes} bytes",
+                    )
+                out.write(chunk)
+    except BaseException:
+        destination.unlink(missing_ok=True)
+        raise
+
+
+@router.post("/", status_code=status.HTTP_202_ACCEPTED)
+async def upload_statement(
+    file: UploadFile,
+    storage_account_id: int = Form(...),
+    statement_format: StatementFormat = Form(..., alias="format"),
+    income_source_id: int | None = Form(default=None),
+    date_format: str = Form(default="%Y-%m-%d"),
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    r: aioredis.Redis = Depends(get_redis),
+):
+    """Queue a CSV, OFX or camt.053 statement for import into one account.
+
+    The file is copied to disk in chunks and parsed by a worker, so neither
+    side ever holds it in memory; files over IMPORT_MAX_UPLOAD_BYTES get a
+    413. Poll the status endpoint for progress.
+    """
+    await get_or_404(db, StorageAccount, storage_account_id, user.id, "storage_account")
+    if income_source_id is not None:
+        await get_or_404(db, IncomeSource, income_source_id, user.id, "income_source")
+
+    job_id = str(uuid.uuid4())
+    path = Path(settings.IMPORTS_DIR) / f"{job_id}.{statement_format.value}"
+    await run_in_threadpool(
+        _save_upload, file.file, path, settings.IMPORT_MAX_UPLOAD_BYTES
+    )
+
+    await r.set(
+        import_status_key(job_id),
+        json.dumps({"status": "pending", "user_id": user.id}),
+        ex=IMPORT_STATUS_TTL,
+    )
+    import_statement.delay(
+        job_id,
+        user.id,
+        storage_account_id,
+        income_source_id,
+        statement_format.value,
+        str(path),
+        date_format,
+    )
+    return {"job_id": job_id}
+
+
+@router.get("/{job_id}")
+async def get_import_status(
+    job_id: UUID,
+    user: User = Depends(get_current_user),
+    r: aioredis.Redis = Depends(get_redis),
+):
+    raw = await r.get(import_status_key(str(job_id)))
+    if not raw:
+        raise HTTPException(status_code=404, detail="Job not found")
+    data = json.loads(raw)
+    if data.pop("user_id") != user.id:
+        raise HTTPException(status_code=403, detail="Forbidden")
+    return data
@@ -1,3 +1,4 @@
+import asyncio
 import secrets
 from urllib.parse import quote
 
@@ -10,6 +11,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.auth import _issue_tokens, _set_auth_cookies
 from app.core.config import settings
 from app.core.database import get_db
+from app.core.dependencies import get_http_client
 from app.models.user import User
 
 router = APIRouter(prefix="/auth", tags=["oauth"])
@@ -57,93 +59,91 @@ async def _resolve_oauth_user(
     return user
 
 
-async def exchange_github_code(code: str) -> dict | None:
-    async with httpx.AsyncClient() as client:
-        token_resp = await client.post(
-            "https://github.com/login/oauth/access_token",
-            json={
-                "client_id": settings.GITHUB_CLIENT_ID,
-                "client_secret": settings.GITHUB_CLIENT_SECRET,
-                "code": code,
-                "redirect_uri": settings.GITHUB_REDIRECT_URI,
-            },
-            headers={"Accept": "application/json"},
-        )
-        if token_resp.status_code != 200:
-            return None
-
-        token_data = token_resp.json()
-        access_token = token_data.get("access_token")
-        if not access_token:
-            return None
-
-        auth_headers = {
-            "Authorization": f"Bearer {access_token}",
-            "Accept": "application/json",
-        }
-
-        user_resp = await client.get(
-            "https://api.github.com/user", headers=auth_headers
-        )
-        if user_resp.status_code != 200:
-            return None
-
-        user_data = user_resp.json()
-        github_id = user_data.get("id")
-        email: str | None = user_data.get("email")
-
-        if not email:
-            emails_resp = await client.get(
-                "https://api.github.com/user/emails", headers=auth_headers
-            )
-            if emails_resp.status_code == 200:
-                for entry in emails_resp.json():
-                    if entry.get("primary") and entry.get("verified"):
-                        email = entry.get("email")
-                        break
-
-        if not github_id or not email:
-            return None
-
-        return {"id": github_id, "email": email, "login": user_data.get("login", "")}
-
-
-async def exchange_google_code(code: str) -> dict | None:
-    async with httpx.AsyncClient() as client:
-        token_resp = await client.post(
-            "https://oauth2.googleapis.com/token",
-            data={
-                "code": code,
-                "client_id": settings.GOOGLE_CLIENT_ID,
-                "client_secret": settings.GOOGLE_CLIENT_SECRET,
-                "redirect_uri": settings.GOOGLE_REDIRECT_URI,
-                "grant_type": "authorization_code",
-            },
-        )
-        if token_resp.status_code != 200:
-            return None
-
-        token_data = token_resp.json()
-        access_token = token_data.get("access_token")
-        if not access_token:
-            return None
-
-        userinfo_resp = await client.get(
-            "https://www.googleapis.com/oauth2/v3/userinfo",
-            headers={"Authorization": f"Bearer {access_token}"},
-        )
-        if userinfo_resp.status_code != 200:
-            return None
-
-        info = userinfo_resp.json()
-        sub = info.get("sub")
-        email = info.get("email")
-
-        # An unverified Google address proves nothing about who owns the mailbox.
-        if not sub or not email or info.get("email_verified") is not True:
-            return None
-
-        return {"sub": sub, "email": email}
+async def exchange_github_code(client: httpx.AsyncClient, code: str) -> dict | None:
+    token_resp = await client.post(
+        "https://github.com/login/oauth/access_token",
+        json={
+            "client_id": settings.GITHUB_CLIENT_ID,
+            "client_secret": settings.GITHUB_CLIENT_SECRET,
+            "code": code,
+            "redirect_uri": settings.GITHUB_REDIRECT_URI,
+        },
+        headers={"Accept": "application/json"},
+    )
+    if token_resp.status_code != 200:
+        return None
+
+    token_data = token_resp.json()
+    access_token = token_data.get("access_token")
+    if not access_token:
+        return None
+
+    auth_headers = {
+        "Authorization": f"Bearer {access_token}",
+        "Accept": "application/json",
+    }
+
+    # The profile only carries an email when the user made one public, so
+    # the address list is fetched alongside it rather than after it.
+    user_resp, emails_resp = await asyncio.gather(
+        client.get("https://api.github.com/user", headers=auth_headers),
+        client.get("https://api.github.com/user/emails", headers=auth_headers),
+    )
+    if user_resp.status_code != 200:
+        return None
+
+    user_data = user_resp.json()
+    github_id = user_data.get("id")
+    email: str | None = user_data.get("email")
+
+    if not email and emails_resp.status_code == 200:
+        for entry in emails_resp.json():
+            if entry.get("primary") and entry.get("verified"):
+                email = entry.get("email")
+                break
+
+    if not github_id or not email:
+        return None
+
+    return {"id": github_id, "email": email, "login": user_data.get("login", "")}
+
+
+async def exchange_google_code(client: httpx.AsyncClient, code: str) -> dict | None:
+    # The userinfo call needs the token from the first, so these stay sequential.
+    token_resp = await client.post(
+        "https://oauth2.googleapis.com/token",
+        data={
+            "code": code,
+            "client_id": settings.GOOGLE_CLIENT_ID,
+            "client_secret": settings.GOOGLE_CLIENT_SECRET,
+            "redirect_uri": settings.GOOGLE_REDIRECT_URI,
+            "grant_type": "authorization_code",
+        },
+    )
+    if token_resp.status_code != 200:
+        return None
+
+    token_data = token_resp.json()
+    access_token = token_data.get("access_token")
+    if not access_token:
+        return None
+
+    userinfo_resp = await client.get(
+        "https://www.googleapis.com/oauth2/v3/userinfo",
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+    if userinfo_resp.status_code != 200:
+        return None
+
+    info = userinfo_resp.json()
+    sub = info.get("sub")
+    email = info.get("email")
+
+    # An unverified Google address proves nothing about who owns the mailbox.
+    if not sub or not email or info.get("email_verified") is not True:
+        return None
+
+    return {"sub": sub, "email": email}
 
 
 @router.get("/github")
@@ -174,11 +174,12 @@ async def github_callback(
     state: str = "",
     state_cookie: str | None = Cookie(default=None, alias="oauth_state"),
     db: AsyncSession = Depends(get_db),
+    http: httpx.AsyncClient = Depends(get_http_client),
 ):
     if not state_cookie or state != state_cookie:
         return _oauth_error_redirect("state")
 
-    profile = await exchange_github_code(code)
+    profile = await exchange_github_code(http, code)
     if not profile:
         return _oauth_error_redirect("profile")
 
@@ -189,7 +190,7 @@ async def github_callback(
     if user is None:
         return _oauth_error_redirect("email_taken")
 
-    access_token, refresh_token = await _issue_tokens(user.id, db)
+    access_token, refresh_token = await _issue_tokens(user, db)
     redirect = RedirectResponse(
         url=f"{settings.FRONTEND_URL}/oauth/callback", status_code=302
     )
@@ -227,11 +228,12 @@ async def google_callback(
     state: str = "",
     state_cookie: str | None = Cookie(default=None, alias="oauth_state"),
     db: AsyncSession = Depends(get_db),
+    http: httpx.AsyncClient = Depends(get_http_client),
 ):
     if not state_cookie or state != state_cookie:
         return _oauth_error_redirect("state")
 
-    profile = await exchange_google_code(code)
+    profile = await exchange_google_code(http, code)
     if not profile:
         return _oauth_error_redirect("profile")
 
@@ -242,7 +244,7 @@ async def google_callback(
     if user is None:
         return _oauth_error_redirect("email_taken")
 
-    access_token, refresh_token = await _issue_tokens(user.id, db)
+    access_token, refresh_token = await _issue_tokens(user, db)
     redirect = RedirectResponse(
         url=f"{settings.FRONTEND_URL}/oauth/callback", status_code=302
     )
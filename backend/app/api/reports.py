@@ -1,4 +1,5 @@
 import json
+import time
 import uuid
 from pathlib import Path
 from uuid import UUID
@@ -6,28 +7,126 @@ from uuid import UUID
 import redis.asyncio as aioredis
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import FileResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from wallet_sdk.messaging.schemas import ReportFormat
 
 from app.core.config import settings
-from app.core.dependencies import get_current_user, get_redis
+from app.core.dependencies import get_current_user, get_read_db, get_redis
 from app.messaging.publishers import publish_report_requested
 from app.models.user import User
+from app.services.reports import user_data_version
 
 router = APIRouter(prefix="/reports", tags=["reports"])
 
+REPORT_TTL_SECONDS = 3600
+
+# Deletes the version key only while it still names the job given, so a
+# request replacing a stale job cannot remove a newer request's claim.
+_RELEASE_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("DEL", KEYS[1])
+end
+return 0
+"""
+
+_MEDIA_TYPES = {
+    ReportFormat.xlsx: "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    ReportFormat.csv: "application/zip",
+    ReportFormat.parquet: "application/zip",
+}
+
+
+def _report_file(job_id: str, fmt: ReportFormat) -> Path:
+    return Path(settings.REPORTS_DIR).resolve() / f"{job_id}.{fmt.extension}"
+
+
+def _job_format(data: dict) -> ReportFormat:
+    # Jobs recorded before formats existed are XLSX.
+    return ReportFormat(data.get("format", ReportFormat.xlsx))
+
+
+def _is_reusable(job_id: str, data: dict, version: str) -> bool:
+    status = data["status"]
+    if status == "ready":
+        # The report service may have read a replica that had not caught up
+        # with the request; such a report is not the version asked for.
+        return (
+            data.get("data_version") == version
+            and _report_file(job_id, _job_format(data)).exists()
+        )
+    if status == "pending":
+        # Jobs recorded without created_at predate it, and the window.
+        age = time.time() - data.get("created_at", 0)
+        return age < settings.REPORT_PENDING_REUSE_SECONDS
+    return False
+
+
+async def _reusable_job(
+    r: aioredis.Redis, version_key: str, version: str
+) -> tuple[str | None, dict | None]:
+    """The job id under ``version_key``, and the job if it can still be had."""
+    job_id = await r.get(version_key)
+    if job_id is None:
+        return None, None
+    job_id = job_id.decode()
+    raw = await r.get(f"report:{job_id}")
+    if not raw:
+        return job_id, None
+    data = json.loads(raw)
+    if not _is_reusable(job_id, data, version):
+        return job_id, None
+    return job_id, {"job_id": job_id, "status": data["status"]}
+
 
 @router.post("/export")
 async def request_export(
+    format: ReportFormat = ReportFormat.xlsx,
     user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db, scope="function"),
     r: aioredis.Redis = Depends(get_redis),
 ):
+    """Start an export, or return the one already made from the same data.
+
+    Asking again for the same format before anything has changed gets the
+    earlier job, pending or ready, instead of another full regeneration. A
+    ready job is reused only if the report service built it from this same
+    version of the data. A job that failed, or has been pending for longer
+    than REPORT_PENDING_REUSE_SECONDS, is replaced by a new one. CSV and
+    Parquet exports are zips with one file per sheet.
+    """
+    version = await user_data_version(db, user.id)
+    version_key = f"report:version:{user.id}:{format.value}:{version}"
+    stale_id, reused = await _reusable_job(r, version_key, version)
+    if reused is not None:
+        return reused
+    if stale_id is not None:
+        await r.eval(_RELEASE_SCRIPT, 1, version_key, stale_id)
+
     job_id = str(uuid.uuid4())
+    job_key = f"report:{job_id}"
     await r.set(
-        f"report:{job_id}",
-        json.dumps({"status": "pending", "user_id": user.id}),
-        ex=3600,
+        job_key,
+        json.dumps(
+            {
+                "status": "pending",
+                "user_id": user.id,
+                "format": format.value,
+                "version": version,
+                "created_at": time.time(),
+            }
+        ),
+        ex=REPORT_TTL_SECONDS,
     )
-    await publish_report_requested(job_id, user.id)
-    return {"job_id": job_id}
+    # Of two requests racing for the same data, only the first claims the
+    # version and publishes; the other hands out the winner's job.
+    if not await r.set(version_key, job_id, ex=REPORT_TTL_SECONDS, nx=True):
+        await r.delete(job_key)
+        _, reused = await _reusable_job(r, version_key, version)
+        if reused is None:
+            raise HTTPException(status_code=409, detail="Export is being started")
+        return reused
+    await publish_report_requested(job_id, user.id, format)
+    return {"job_id": job_id, "status": "pending"}
 
 
 @router.get("/export/{job_id}/status")
@@ -59,14 +158,15 @@ async def download_export(
         raise HTTPException(status_code=403, detail="Forbidden")
     if data["status"] != "ready":
         raise HTTPException(status_code=409, detail="Report not ready yet")
+    fmt = _job_format(data)
     reports_dir = Path(settings.REPORTS_DIR).resolve()
-    file_path = (reports_dir / f"{job_id!s}.xlsx").resolve()
+    file_path = (reports_dir / f"{job_id!s}.{fmt.extension}").resolve()
     if not file_path.is_relative_to(reports_dir):
         raise HTTPException(status_code=403, detail="Forbidden")
     if not file_path.exists():
         raise HTTPException(status_code=404, detail="Report file not found")
     return FileResponse(
         path=str(file_path),
-        filename=f"wallet-export-{job_id!s}.xlsx",
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        filename=f"wallet-export-{job_id!s}.{fmt.extension}",
+        media_type=_MEDIA_TYPES[fmt],
     )
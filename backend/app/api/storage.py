@@ -1,11 +1,12 @@
 from fastapi import APIRouter, Depends, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import joinedload, selectinload
 
+from app.api._compression import CompressedRoute
 from app.core.database import get_db
-from app.core.db_helpers import get_or_404
-from app.core.dependencies import get_current_user
+from app.core.db_helpers import get_or_404, validate_references
+from app.core.dependencies import get_current_user, get_read_db
 from app.models import Currency, User, StorageLocation, StorageAccount
 from app.schemas.storage import (
     StorageLocationCreate,
@@ -16,7 +17,7 @@ from app.schemas.storage import (
     StorageAccountResponse,
 )
 
-router = APIRouter(tags=["storage"])
+router = APIRouter(tags=["storage"], route_class=CompressedRoute)
 
 
 # --- Storage Locations ---
@@ -24,7 +25,8 @@ router = APIRouter(tags=["storage"])
 
 @router.get("/storage-locations/", response_model=list[StorageLocationResponse])
 async def list_locations(
-    user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db, scope="function"),
 ):
     result = await db.execute(
         select(StorageLocation).where(StorageLocation.user_id == user.id)
@@ -83,9 +85,23 @@ async def delete_location(
 # --- Storage Accounts ---
 
 
+async def _reload_account(db: AsyncSession, account_id: int) -> StorageAccount:
+    """The account as stored, with its location and currency, in one query."""
+    return await db.scalar(
+        select(StorageAccount)
+        .options(
+            joinedload(StorageAccount.storage_location),
+            joinedload(StorageAccount.currency),
+        )
+        .where(StorageAccount.id == account_id)
+        .execution_options(populate_existing=True)
+    )
+
+
 @router.get("/storage-accounts/", response_model=list[StorageAccountResponse])
 async def list_accounts(
-    user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db, scope="function"),
 ):
     result = await db.execute(
         select(StorageAccount)
@@ -108,15 +124,18 @@ async def create_account(
     user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    await get_or_404(
-        db, StorageLocation, body.storage_location_id, user.id, "storage_location"
+    await validate_references(
+        db,
+        user.id,
+        {
+            "storage_location": (StorageLocation, body.storage_location_id),
+            "currency": (Currency, body.currency_id),
+        },
     )
-    await get_or_404(db, Currency, body.currency_id, user.id, "currency")
     obj = StorageAccount(**body.model_dump(), user_id=user.id)
     db.add(obj)
     await db.flush()
-    await db.refresh(obj, attribute_names=["storage_location", "currency"])
-    return obj
+    return await _reload_account(db, obj.id)
 
 
 @router.put("/storage-accounts/{account_id}", response_model=StorageAccountResponse)
@@ -126,31 +145,17 @@ async def update_account(
     user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    obj = await get_or_404(
+    obj = await get_or_404(db, StorageAccount, account_id, user.id, "storage_account")
+    data = body.model_dump(exclude_unset=True)
+    await validate_references(
         db,
-        StorageAccount,
-        account_id,
         user.id,
-        "storage_account",
-        options=[
-            selectinload(StorageAccount.storage_location),
-            selectinload(StorageAccount.currency),
-        ],
+        {"storage_location": (StorageLocation, data.get("storage_location_id"))},
     )
-    data = body.model_dump(exclude_unset=True)
-    if "storage_location_id" in data:
-        await get_or_404(
-            db,
-            StorageLocation,
-            data["storage_location_id"],
-            user.id,
-            "storage_location",
-        )
     for k, v in data.items():
         setattr(obj, k, v)
     await db.flush()
-    await db.refresh(obj, attribute_names=["storage_location", "currency"])
-    return obj
+    return await _reload_account(db, obj.id)
 
 
 @router.delete("/storage-accounts/{account_id}", status_code=status.HTTP_204_NO_CONTENT)
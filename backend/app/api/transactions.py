@@ -1,12 +1,37 @@
+from dataclasses import dataclass
 from datetime import date
+from typing import Any
 
-from fastapi import APIRouter, Depends, Query, status
-from sqlalchemy import Select, asc, desc, func, select
+from fastapi import APIRouter, Depends, Query, Response, status
+from sqlalchemy import (
+    Integer,
+    Select,
+    asc,
+    cast,
+    delete,
+    desc,
+    exists,
+    func,
+    insert,
+    literal,
+    null,
+    select,
+    union_all,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api._compression import CompressedRoute
+from app.api._export import ExportFormat, stream_export
+from app.api._pagination import (
+    apply_keyset,
+    decode_cursor,
+    encode_cursor,
+    set_next_cursor,
+)
 from app.core.database import get_db
-from app.core.db_helpers import get_or_404
-from app.core.dependencies import get_current_user
+from app.core.db_helpers import get_or_404, validate_references
+from app.core.dependencies import get_current_user, get_read_db
 from app.core.exceptions import AppException, ResourceNotFound
 from app.models import (
     Currency,
@@ -19,6 +44,9 @@ from app.models import (
 from app.models.storage import StorageLocation
 from app.models.transaction import TransactionType
 from app.schemas.transaction import (
+    TransactionBulkError,
+    TransactionBulkRequest,
+    TransactionBulkResponse,
     TransactionCreate,
     TransactionCurrencyTotal,
     TransactionResponse,
@@ -26,54 +54,48 @@ from app.schemas.transaction import (
     TransactionUpdate,
 )
 
-router = APIRouter(prefix="/transactions", tags=["transactions"])
+router = APIRouter(
+    prefix="/transactions", tags=["transactions"], route_class=CompressedRoute
+)
 
 
-async def _validate_currency_matches_account(
-    db: AsyncSession,
-    user_id: int,
-    storage_account_id: int,
-    currency_id: int,
-) -> None:
-    result = await db.execute(
-        select(StorageAccount).where(
-            StorageAccount.id == storage_account_id, StorageAccount.user_id == user_id
-        )
+def _expense_not_allowed() -> AppException:
+    return AppException(
+        code="transaction/expense_not_allowed",
+        message="Expense transactions are not supported. Record balance snapshots instead.",
+        status_code=422,
     )
-    account = result.scalar_one_or_none()
-    if not account:
-        raise ResourceNotFound("storage_account")
-    if account.currency_id != currency_id:
-        raise AppException(
-            code="transaction/currency_mismatch",
-            message="Transaction currency must match the storage account currency.",
-            status_code=422,
-        )
 
 
-async def _validate_fk_ownership(
-    db: AsyncSession,
-    user_id: int,
-    income_source_id: int | None,
-    expense_category_id: int | None,
-) -> None:
-    if income_source_id is not None:
-        result = await db.execute(
-            select(IncomeSource).where(
-                IncomeSource.id == income_source_id, IncomeSource.user_id == user_id
-            )
-        )
-        if not result.scalar_one_or_none():
-            raise ResourceNotFound("income_source")
-    if expense_category_id is not None:
-        result = await db.execute(
-            select(ExpenseCategory).where(
-                ExpenseCategory.id == expense_category_id,
-                ExpenseCategory.user_id == user_id,
+def _currency_mismatch() -> AppException:
+    return AppException(
+        code="transaction/currency_mismatch",
+        message="Transaction currency must match the storage account currency.",
+        status_code=422,
+    )
+
+
+async def _validate_write(db: AsyncSession, user_id: int, data: dict[str, Any]) -> None:
+    """Check every reference of a create or update, and the currency rule, at once."""
+    account_id = data["storage_account_id"]
+    await validate_references(
+        db,
+        user_id,
+        {
+            "income_source": (IncomeSource, data.get("income_source_id")),
+            "expense_category": (ExpenseCategory, data.get("expense_category_id")),
+            "storage_account": (StorageAccount, account_id),
+        },
+        {
+            "currency_match": (
+                exists().where(
+                    StorageAccount.id == account_id,
+                    StorageAccount.currency_id == data["currency_id"],
+                ),
+                _currency_mismatch(),
             )
-        )
-        if not result.scalar_one_or_none():
-            raise ResourceNotFound("expense_category")
+        },
+    )
 
 
 _VALID_SORT_FIELDS = {"date", "amount", "income_source", "storage_account"}
@@ -89,6 +111,7 @@ def _apply_filters(
     income_source_id: int | None,
     expense_category_id: int | None,
     storage_account_id: int | None,
+    search: str | None = None,
 ) -> Select:
     if tx_type:
         stmt = stmt.where(Transaction.type == tx_type)
@@ -102,11 +125,32 @@ def _apply_filters(
         stmt = stmt.where(Transaction.expense_category_id == expense_category_id)
     if storage_account_id:
         stmt = stmt.where(Transaction.storage_account_id == storage_account_id)
+    if search:
+        stmt = stmt.where(Transaction.description.icontains(search, autoescape=True))
     return stmt
 
 
+def _search_rank(search: str):
+    # Trigram similarity to the whole description: of the rows containing the
+    # term, the ones that say little else come first.
+    return func.similarity(search, Transaction.description)
+
+
+_SORT_KEY_KINDS = {
+    "date": "date",
+    "amount": "amount",
+    "income_source": "text",
+    "storage_account": "text",
+    "relevance": "rank",
+}
+
+# Shorter terms have no trigram to look up, so the index cannot help them.
+_SEARCH_MIN_LENGTH = 3
+
+
 @router.get("/", response_model=list[TransactionResponse])
 async def list_transactions(
+    response: Response,
     tx_type: TransactionType | None = Query(default=None, alias="type"),
     date_from: date | None = None,
     date_to: date | None = None,
@@ -117,33 +161,66 @@ async def list_transactions(
     sort_order: str | None = Query(default=None),
     limit: int = Query(default=100, le=1000),
     offset: int = 0,
+    cursor: str | None = Query(default=None),
+    search: str | None = Query(
+        default=None, alias="q", min_length=_SEARCH_MIN_LENGTH, max_length=100
+    ),
     user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db, scope="function"),
 ):
+    """List transactions, one page at a time.
+
+    A full page carries an ``X-Next-Cursor`` header. Passing it back as
+    ``cursor`` continues right after the last row, which stays fast at any
+    depth and is stable under concurrent inserts; ``offset`` still works for
+    older clients and is ignored when a cursor is given.
+
+    ``q`` keeps only transactions whose description contains the term, best
+    matches first unless ``sort_by`` says otherwise.
+    """
     # Normalize and validate sort params; fall back to defaults on invalid values.
-    effective_sort_by = sort_by if sort_by in _VALID_SORT_FIELDS else None
-    order_fn = asc if sort_order == "asc" else desc
+    if sort_by in _VALID_SORT_FIELDS:
+        effective_sort_by = sort_by
+        descending = sort_order != "asc"
+    elif search:
+        effective_sort_by = "relevance"
+        descending = True
+    else:
+        # Default ordering when no valid sort_by is provided.
+        effective_sort_by = "date"
+        descending = True
+    effective_order = "desc" if descending else "asc"
+    key_kind = _SORT_KEY_KINDS[effective_sort_by]
 
     q = select(Transaction).where(Transaction.user_id == user.id)
 
     # Add joins required by the requested sort field.
     if effective_sort_by == "income_source":
         q = q.outerjoin(IncomeSource, Transaction.income_source_id == IncomeSource.id)
-        q = q.order_by(order_fn(IncomeSource.name))
+        # Unsourced rows sort as an empty name: a NULL key cannot be compared
+        # against a cursor, so it would end the walk at the first such row.
+        sort_key = func.coalesce(IncomeSource.name, "")
     elif effective_sort_by == "storage_account":
         q = q.join(
             StorageAccount, Transaction.storage_account_id == StorageAccount.id
         ).join(
             StorageLocation, StorageAccount.storage_location_id == StorageLocation.id
         )
-        q = q.order_by(order_fn(StorageLocation.name))
+        sort_key = StorageLocation.name
     elif effective_sort_by == "amount":
-        q = q.order_by(order_fn(Transaction.amount))
-    elif effective_sort_by == "date":
-        q = q.order_by(order_fn(Transaction.date))
+        sort_key = Transaction.amount
+    elif effective_sort_by == "relevance":
+        sort_key = _search_rank(search)
     else:
-        # Default ordering when no valid sort_by is provided.
-        q = q.order_by(Transaction.date.desc())
+        sort_key = Transaction.date
+
+    after = (
+        decode_cursor(cursor, effective_sort_by, effective_order, key_kind)
+        if cursor is not None
+        else None
+    )
+    q = apply_keyset(q, sort_key, Transaction.id, descending, after)
+    q = q.add_columns(sort_key.label("sort_key"))
 
     q = _apply_filters(
         q,
@@ -153,10 +230,26 @@ async def list_transactions(
         income_source_id=income_source_id,
         expense_category_id=expense_category_id,
         storage_account_id=storage_account_id,
+        search=search,
     )
-    q = q.offset(offset).limit(limit)
-    result = await db.execute(q)
-    return result.scalars().all()
+    if after is None:
+        q = q.offset(offset)
+    q = q.limit(limit)
+    rows = (await db.execute(q)).all()
+
+    if rows and len(rows) == limit:
+        last = rows[-1]
+        set_next_cursor(
+            response,
+            encode_cursor(
+                effective_sort_by,
+                effective_order,
+                key_kind,
+                last.sort_key,
+                last.Transaction.id,
+            ),
+        )
+    return [row.Transaction for row in rows]
 
 
 @router.get("/summary", response_model=TransactionSummaryResponse)
@@ -167,8 +260,11 @@ async def transactions_summary(
     income_source_id: int | None = None,
     expense_category_id: int | None = None,
     storage_account_id: int | None = None,
+    search: str | None = Query(
+        default=None, alias="q", min_length=_SEARCH_MIN_LENGTH, max_length=100
+    ),
     user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db, scope="function"),
 ):
     """Aggregate totals for every transaction matching the filters, ignoring pagination."""
     amount_sum = func.coalesce(func.sum(Transaction.amount), 0).label("total_amount")
@@ -192,6 +288,7 @@ async def transactions_summary(
         income_source_id=income_source_id,
         expense_category_id=expense_category_id,
         storage_account_id=storage_account_id,
+        search=search,
     )
     q = q.group_by(Currency.id, Currency.code).order_by(
         desc(amount_sum), asc(Currency.code)
@@ -211,6 +308,219 @@ async def transactions_summary(
     )
 
 
+_EXPORT_COLUMNS = (
+    Transaction.id,
+    Transaction.type,
+    Transaction.date,
+    Transaction.amount,
+    Transaction.description,
+    Transaction.currency_id,
+    Transaction.storage_account_id,
+    Transaction.income_source_id,
+    Transaction.expense_category_id,
+)
+
+
+@router.get("/export")
+async def export_transactions(
+    export_format: ExportFormat = Query(default=ExportFormat.ndjson, alias="format"),
+    tx_type: TransactionType | None = Query(default=None, alias="type"),
+    date_from: date | None = None,
+    date_to: date | None = None,
+    income_source_id: int | None = None,
+    expense_category_id: int | None = None,
+    storage_account_id: int | None = None,
+    search: str | None = Query(
+        default=None, alias="q", min_length=_SEARCH_MIN_LENGTH, max_length=100
+    ),
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Every matching transaction, newest first, streamed as NDJSON or CSV."""
+    q = select(*_EXPORT_COLUMNS).where(Transaction.user_id == user.id)
+    q = _apply_filters(
+        q,
+        tx_type=tx_type,
+        date_from=date_from,
+        date_to=date_to,
+        income_source_id=income_source_id,
+        expense_category_id=expense_category_id,
+        storage_account_id=storage_account_id,
+        search=search,
+    )
+    q = q.order_by(Transaction.date.desc(), Transaction.id.desc())
+    return stream_export(db, q, export_format, "transactions")
+
+
+@dataclass
+class _OwnedReferences:
+    """Which of the ids a batch points at belong to the user."""
+
+    income_source_ids: set[int]
+    expense_category_ids: set[int]
+    account_currency: dict[int, int]
+
+
+async def _load_owned_references(
+    db: AsyncSession, user_id: int, items: list[dict[str, Any]]
+) -> _OwnedReferences:
+    """Resolve every income source, category and account in ``items`` in one query."""
+
+    def ids(field: str) -> set[int]:
+        return {item[field] for item in items if item.get(field) is not None}
+
+    no_currency = cast(null(), Integer)
+    q = union_all(
+        select(literal("income_source"), IncomeSource.id, no_currency).where(
+            IncomeSource.user_id == user_id,
+            IncomeSource.id.in_(ids("income_source_id")),
+        ),
+        select(literal("expense_category"), ExpenseCategory.id, no_currency).where(
+            ExpenseCategory.user_id == user_id,
+            ExpenseCategory.id.in_(ids("expense_category_id")),
+        ),
+        select(
+            literal("storage_account"), StorageAccount.id, StorageAccount.currency_id
+        ).where(
+            StorageAccount.user_id == user_id,
+            StorageAccount.id.in_(ids("storage_account_id")),
+        ),
+    )
+    refs = _OwnedReferences(set(), set(), {})
+    for kind, ref_id, currency_id in (await db.execute(q)).all():
+        if kind == "income_source":
+            refs.income_source_ids.add(ref_id)
+        elif kind == "expense_category":
+            refs.expense_category_ids.add(ref_id)
+        else:
+            refs.account_currency[ref_id] = currency_id
+    return refs
+
+
+def _check_write(refs: _OwnedReferences, data: dict[str, Any]) -> None:
+    """Apply the single-row write rules to one item of a batch.
+
+    Raises the same exceptions the one-at-a-time endpoints do, so an item
+    rejected here carries the code the client already knows how to handle.
+    """
+    if data.get("type") == TransactionType.expense:
+        raise _expense_not_allowed()
+    source_id = data.get("income_source_id")
+    if source_id is not None and source_id not in refs.income_source_ids:
+        raise ResourceNotFound("income_source")
+    category_id = data.get("expense_category_id")
+    if category_id is not None and category_id not in refs.expense_category_ids:
+        raise ResourceNotFound("expense_category")
+    account_currency = refs.account_currency.get(data["storage_account_id"])
+    if account_currency is None:
+        raise ResourceNotFound("storage_account")
+    if account_currency != data["currency_id"]:
+        raise _currency_mismatch()
+
+
+@router.post("/bulk", response_model=TransactionBulkResponse)
+async def bulk_transactions(
+    body: TransactionBulkRequest,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Create, update and delete many transactions in a handful of round trips.
+
+    Each item is validated like its single-row counterpart, but every reference
+    in the batch is resolved up front in one query and all creates go out as
+    one multi-row INSERT. Invalid items are reported in ``errors`` by their
+    position in the request and skipped; the rest are applied.
+    """
+    errors: list[TransactionBulkError] = []
+
+    def reject(op: str, index: int, exc: AppException) -> None:
+        errors.append(
+            TransactionBulkError(op=op, index=index, code=exc.code, message=exc.message)
+        )
+
+    existing: dict[int, Transaction] = {}
+    if body.update:
+        result = await db.execute(
+            select(Transaction).where(
+                Transaction.user_id == user.id,
+                Transaction.id.in_({item.id for item in body.update}),
+            )
+        )
+        existing = {tx.id: tx for tx in result.scalars()}
+
+    creates = [item.model_dump() for item in body.create]
+    # An update is checked against the row it would produce, so fields it
+    # leaves alone still take part in the account/currency match.
+    updates: list[tuple[Transaction | None, dict[str, Any], dict[str, Any]]] = []
+    for item in body.update:
+        obj = existing.get(item.id)
+        data = item.model_dump(exclude_unset=True, exclude={"id"})
+        merged = dict(data)
+        if obj is not None:
+            merged.setdefault("storage_account_id", obj.storage_account_id)
+            merged.setdefault("currency_id", obj.currency_id)
+        updates.append((obj, data, merged))
+
+    refs = await _load_owned_references(
+        db, user.id, creates + [merged for obj, _, merged in updates if obj]
+    )
+
+    rows = []
+    for index, data in enumerate(creates):
+        try:
+            _check_write(refs, data)
+        except AppException as exc:
+            reject("create", index, exc)
+            continue
+        rows.append({**data, "user_id": user.id})
+    created: list[Transaction] = []
+    if rows:
+        created = list(
+            await db.scalars(
+                insert(Transaction).returning(
+                    Transaction, sort_by_parameter_order=True
+                ),
+                rows,
+            )
+        )
+
+    updated: list[Transaction] = []
+    for index, (obj, data, merged) in enumerate(updates):
+        try:
+            if obj is None:
+                raise ResourceNotFound("transaction")
+            _check_write(refs, merged)
+        except AppException as exc:
+            reject("update", index, exc)
+            continue
+        for k, v in data.items():
+            setattr(obj, k, v)
+        updated.append(obj)
+    if updated:
+        await db.flush()
+
+    deleted: list[int] = []
+    if body.delete:
+        result = await db.execute(
+            delete(Transaction)
+            .where(
+                Transaction.user_id == user.id,
+                Transaction.id.in_(set(body.delete)),
+            )
+            .returning(Transaction.id)
+        )
+        removed = set(result.scalars())
+        for index, transaction_id in enumerate(body.delete):
+            if transaction_id in removed:
+                deleted.append(transaction_id)
+            else:
+                reject("delete", index, ResourceNotFound("transaction"))
+
+    return TransactionBulkResponse(
+        created=created, updated=updated, deleted=deleted, errors=errors
+    )
+
+
 @router.post(
     "/", response_model=TransactionResponse, status_code=status.HTTP_201_CREATED
 )
@@ -220,22 +530,13 @@ async def create_transaction(
     db: AsyncSession = Depends(get_db),
 ):
     if body.type == TransactionType.expense:
-        raise AppException(
-            code="transaction/expense_not_allowed",
-            message="Expense transactions are not supported. Record balance snapshots instead.",
-            status_code=422,
-        )
-    await _validate_fk_ownership(
-        db, user.id, body.income_source_id, body.expense_category_id
+        raise _expense_not_allowed()
+    data = body.model_dump()
+    await _validate_write(db, user.id, data)
+    # RETURNING hands back the row as stored, without a refresh round trip.
+    return await db.scalar(
+        insert(Transaction).values(**data, user_id=user.id).returning(Transaction)
     )
-    await _validate_currency_matches_account(
-        db, user.id, body.storage_account_id, body.currency_id
-    )
-    obj = Transaction(**body.model_dump(), user_id=user.id)
-    db.add(obj)
-    await db.flush()
-    await db.refresh(obj)
-    return obj
 
 
 @router.put("/{transaction_id}", response_model=TransactionResponse)
@@ -246,24 +547,28 @@ async def update_transaction(
     db: AsyncSession = Depends(get_db),
 ):
     if body.type == TransactionType.expense:
-        raise AppException(
-            code="transaction/expense_not_allowed",
-            message="Expense transactions are not supported. Record balance snapshots instead.",
-            status_code=422,
-        )
+        raise _expense_not_allowed()
     obj = await get_or_404(db, Transaction, transaction_id, user.id, "transaction")
     data = body.model_dump(exclude_unset=True)
-    await _validate_fk_ownership(
-        db, user.id, data.get("income_source_id"), data.get("expense_category_id")
+    await _validate_write(
+        db,
+        user.id,
+        {
+            "storage_account_id": obj.storage_account_id,
+            "currency_id": obj.currency_id,
+            **data,
+        },
+    )
+    if not data:
+        return obj
+    return await db.scalar(
+        update(Transaction)
+        .where(Transaction.id == obj.id)
+        .values(**data)
+        .returning(Transaction)
+        # Overwrite the loaded object with the row as stored.
+        .execution_options(populate_existing=True)
     )
-    account_id = data.get("storage_account_id", obj.storage_account_id)
-    currency_id = data.get("currency_id", obj.currency_id)
-    await _validate_currency_matches_account(db, user.id, account_id, currency_id)
-    for k, v in data.items():
-        setattr(obj, k, v)
-    await db.flush()
-    await db.refresh(obj)
-    return obj
 
 
 @router.delete("/{transaction_id}", status_code=status.HTTP_204_NO_CONTENT)
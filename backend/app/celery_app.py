@@ -7,7 +7,12 @@ celery_app = Celery(
     "wallet",
     broker=settings.REDIS_URL,
     backend=settings.REDIS_URL,
-    include=["app.tasks.catalog_sync", "app.tasks.rate_sync"],
+    include=[
+        "app.tasks.catalog_sync",
+        "app.tasks.rate_sync",
+        "app.tasks.statement_import",
+        "app.tasks.token_purge",
+    ],
 )
 
 if not settings.DEV_MODE:
@@ -32,11 +37,20 @@ if not settings.DEV_MODE:
             "task": "app.tasks.rate_sync.prune_exchange_rates",
             "schedule": crontab(hour=4, minute=0, day_of_week=0),
         },
+        "purge-refresh-tokens": {
+            "task": "app.tasks.token_purge.purge_refresh_tokens",
+            "schedule": crontab(minute=15),
+        },
     }
 
 celery_app.conf.task_routes = {
     "app.tasks.catalog_sync.*": {"queue": "catalog"},
     "app.tasks.rate_sync.*": {"queue": "rates"},
+    "app.tasks.statement_import.*": {"queue": "imports"},
+    "app.tasks.token_purge.*": {"queue": "maintenance"},
 }
 
 celery_app.conf.timezone = "UTC"
+
+# Connects the task timing and exporter signal handlers.
+import app.tasks._metrics  # noqa: E402, F401
@@ -1,6 +1,14 @@
+import time
+from dataclasses import dataclass
 from typing import Any, AsyncGenerator
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import DeclarativeBase
 
 from app.core.config import settings
@@ -8,11 +16,59 @@ from app.core.config import settings
 engine = create_async_engine(settings.DATABASE_URL, echo=False)
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
+read_engine = (
+    create_async_engine(settings.DATABASE_READ_URL, echo=False)
+    if settings.DATABASE_READ_URL
+    else engine
+)
+read_session = async_sessionmaker(
+    read_engine, class_=AsyncSession, expire_on_commit=False
+)
+
+
+@dataclass
+class PoolHoldStats:
+    """How long requests keep pooled connections checked out."""
+
+    checkouts: int = 0
+    hold_seconds_total: float = 0.0
+    hold_seconds_max: float = 0.0
+
+
+pool_hold_stats: dict[str, PoolHoldStats] = {}
+
+
+def track_pool_hold(target: AsyncEngine, name: str) -> PoolHoldStats:
+    stats = pool_hold_stats[name] = PoolHoldStats()
+
+    @event.listens_for(target.sync_engine, "checkout")
+    def _checkout(_dbapi_conn, record, _proxy):
+        record.info["checked_out_at"] = time.perf_counter()
+
+    @event.listens_for(target.sync_engine, "checkin")
+    def _checkin(_dbapi_conn, record):
+        started = record.info.pop("checked_out_at", None)
+        if started is None:
+            return
+        held = time.perf_counter() - started
+        stats.checkouts += 1
+        stats.hold_seconds_total += held
+        stats.hold_seconds_max = max(stats.hold_seconds_max, held)
+
+    return stats
+
+
+track_pool_hold(engine, "primary")
+if read_engine is not engine:
+    track_pool_hold(read_engine, "replica")
+
 
 class Base(DeclarativeBase): ...
 
 
 async def get_db() -> AsyncGenerator[AsyncSession | Any, Any]:
+    """A session committed after the request, then running the coroutine
+    functions listed in ``session.info["after_commit"]``."""
     async with async_session() as session:
         try:
             yield session
@@ -20,3 +76,5 @@ async def get_db() -> AsyncGenerator[AsyncSession | Any, Any]:
         except Exception:
             await session.rollback()
             raise
+        for callback in session.info.pop("after_commit", ()):
+            await callback()
@@ -1,9 +1,10 @@
+from collections.abc import Mapping
 from typing import Any, TypeVar
 
-from sqlalchemy import select
+from sqlalchemy import ColumnElement, exists, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.exceptions import ResourceNotFound
+from app.core.exceptions import AppException, ResourceNotFound
 
 T = TypeVar("T")
 
@@ -24,3 +25,41 @@ async def get_or_404(
     if not obj:
         raise ResourceNotFound(resource_type)
     return obj
+
+
+async def validate_references(
+    db: AsyncSession,
+    user_id: int,
+    references: Mapping[str, tuple[type, int | None]],
+    checks: Mapping[str, tuple[ColumnElement[bool], AppException]] | None = None,
+) -> None:
+    """Check that a write only points at the user's own rows, in one query.
+
+    ``references`` maps a resource type to the model and id being pointed at;
+    a None id is not checked. ``checks`` adds further conditions, each with
+    the error to raise when it does not hold. Everything is evaluated as one
+    row of boolean flags, and failures are raised in the order given.
+    """
+    references = {
+        resource_type: (model, resource_id)
+        for resource_type, (model, resource_id) in references.items()
+        if resource_id is not None
+    }
+    checks = checks or {}
+    flags = [
+        exists()
+        .where(model.id == resource_id, model.user_id == user_id)
+        .label(resource_type)
+        for resource_type, (model, resource_id) in references.items()
+    ]
+    flags += [condition.label(name) for name, (condition, _) in checks.items()]
+    if not flags:
+        return
+    row = (await db.execute(select(*flags))).one()._mapping
+
+    for resource_type in references:
+        if not row[resource_type]:
+            raise ResourceNotFound(resource_type)
+    for name, (_, error) in checks.items():
+        if not row[name]:
+            raise error
@@ -1,12 +1,20 @@
+from collections.abc import AsyncGenerator
+from functools import partial
+
+import httpx
 import redis.asyncio as aioredis
-from fastapi import Cookie, Depends
+from fastapi import Cookie, Depends, Request
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
 
 from app.core.database import get_db
 from app.core.exceptions import AuthInvalidToken, AuthUserNotFound
+from app.core.http import get_http_client as _get_http_client
 from app.core.redis import get_redis as _get_redis_pool
-from app.core.security import decode_access_token
+from app.core.replica import note_write, read_session_factory
+from app.core.security import decode_access_claims
+from app.core.user_cache import cache_user, get_cached_user
 from app.models.user import User
 
 
@@ -14,17 +22,62 @@ def get_redis() -> aioredis.Redis:
     return _get_redis_pool()
 
 
+def get_http_client() -> httpx.AsyncClient:
+    return _get_http_client()
+
+
+async def get_read_db(
+    access_token: str | None = Cookie(default=None),
+) -> AsyncGenerator[AsyncSession, None]:
+    """A session for reads only, on the replica when one is configured.
+
+    The caller is identified from the token alone, without a query, to tell
+    whether their own recent writes may not have reached the replica yet.
+
+    The transaction is opened READ ONLY (asyncpg sends it with the BEGIN, so
+    it costs no extra round trip) and is never committed: closing the session
+    just rolls it back. Declare it with ``scope="function"`` to hand the
+    connection back before the response is sent; streamed responses that
+    read while sending need the default request scope.
+    """
+    claims = decode_access_claims(access_token) if access_token else None
+    factory = await read_session_factory(claims[0] if claims else None)
+    async with factory() as session:
+        await session.connection(execution_options={"postgresql_readonly": True})
+        yield session
+
+
 async def get_current_user(
+    request: Request,
     access_token: str | None = Cookie(default=None),
     db: AsyncSession = Depends(get_db),
 ) -> User:
     if access_token is None:
         raise AuthInvalidToken()
-    user_id = decode_access_token(access_token)
-    if user_id is None:
+    claims = decode_access_claims(access_token)
+    if claims is None:
         raise AuthInvalidToken()
+    user_id, token_version = claims
+    if request.method not in ("GET", "HEAD", "OPTIONS"):
+        # Noted now and again once the request commits: a write that takes
+        # longer than READ_YOUR_WRITES_SECONDS would otherwise become visible
+        # after its window has closed.
+        await note_write(user_id)
+        db.info.setdefault("after_commit", []).append(partial(note_write, user_id))
+
+    fields = await get_cached_user(user_id, token_version)
+    if fields is not None:
+        # Attach the cached row to this session as if it had been loaded, so
+        # handlers can still modify and flush it. load=False emits no SQL.
+        user = User(**fields)
+        make_transient_to_detached(user)
+        return await db.merge(user, load=False)
+
     result = await db.execute(select(User).where(User.id == user_id))
     user = result.scalar_one_or_none()
     if user is None:
         raise AuthUserNotFound()
+    if user.token_version != token_version:
+        raise AuthInvalidToken()
+    await cache_user(user)
     return user
@@ -0,0 +1,26 @@
+import httpx
+
+# OAuth callbacks make two or three calls to the same provider in a row;
+# keeping connections alive between logins saves a TCP and TLS handshake on
+# each of them.
+_TIMEOUT = httpx.Timeout(10.0)
+_LIMITS = httpx.Limits(
+    max_connections=100, max_keepalive_connections=20, keepalive_expiry=60
+)
+
+http_client: httpx.AsyncClient | None = None
+
+
+async def init_http_client() -> None:
+    global http_client
+    http_client = httpx.AsyncClient(timeout=_TIMEOUT, limits=_LIMITS)
+
+
+async def close_http_client() -> None:
+    if http_client is not None:
+        await http_client.aclose()
+
+
+def get_http_client() -> httpx.AsyncClient:
+    assert http_client is not None, "HTTP client is not initialized"
+    return http_client
@@ -0,0 +1,159 @@
+"""Prometheus metrics for the API process, served at /metrics.
+
+Only the API registers the runtime collector: the pool and hashing numbers
+it reads describe this process's engines, which Celery workers do not use.
+"""
+
+import time
+
+from prometheus_client import REGISTRY, Counter, Histogram
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.registry import Collector
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+HTTP_REQUEST_DURATION = Histogram(
+    "wallet_http_request_duration_seconds",
+    "Time to handle an API request, by route template.",
+    ["method", "route", "status"],
+)
+REDIS_COMMAND_DURATION = Histogram(
+    "wallet_redis_command_duration_seconds",
+    "Latency of the Redis calls made while serving requests.",
+    ["command"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0),
+)
+COMPRESSION_RATIO = Histogram(
+    "wallet_http_compression_ratio",
+    "Compressed size as a fraction of the original, per compressed response.",
+    ["encoding"],
+    buckets=(0.05, 0.1, 0.15, 0.2, 0.3, 0.4, 0.5, 0.75, 1.0),
+)
+COMPRESSION_INPUT_BYTES = Counter(
+    "wallet_http_compression_input_bytes",
+    "Response bytes before compression.",
+    ["encoding"],
+)
+COMPRESSION_OUTPUT_BYTES = Counter(
+    "wallet_http_compression_output_bytes",
+    "Response bytes after compression.",
+    ["encoding"],
+)
+
+
+def _route_template(scope: Scope) -> str:
+    template = getattr(scope.get("route"), "path", None)
+    if template is None:
+        return "unmatched"
+    # A route included from a router reports its path relative to the include
+    # prefix. Prefixes are literal, so they are exactly the leading segments
+    # of the request path that the template does not account for.
+    path = scope["path"]
+    extra = path.count("/") - template.count("/")
+    if extra > 0:
+        template = "/".join(path.split("/")[: extra + 1]) + template
+    return template
+
+
+class MetricsMiddleware:
+    """Times every HTTP request into HTTP_REQUEST_DURATION.
+
+    Labels use the matched route's template (``/api/transactions/{id}``),
+    not the raw path, so the number of series stays bounded. Requests that
+    match no route are counted under ``unmatched``.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUEST_DURATION.labels(
+                scope["method"], _route_template(scope), str(status)
+            ).observe(time.perf_counter() - started)
+
+
+class _RuntimeCollector(Collector):
+    """Reads pool and password-hashing state at scrape time."""
+
+    def collect(self):
+        from app.core import database
+        from app.core.security import password_hash_stats
+
+        engines = {"primary": database.engine}
+        if database.read_engine is not database.engine:
+            engines["replica"] = database.read_engine
+        checked_out = GaugeMetricFamily(
+            "wallet_db_pool_checked_out",
+            "Connections currently checked out of the pool.",
+            labels=["engine"],
+        )
+        overflow = GaugeMetricFamily(
+            "wallet_db_pool_overflow",
+            "Connections open beyond the pool size; negative while below it.",
+            labels=["engine"],
+        )
+        size = GaugeMetricFamily(
+            "wallet_db_pool_size", "Configured pool size.", labels=["engine"]
+        )
+        for name, engine in engines.items():
+            pool = engine.pool
+            checked_out.add_metric([name], pool.checkedout())
+            overflow.add_metric([name], pool.overflow())
+            size.add_metric([name], pool.size())
+        yield from (checked_out, overflow, size)
+
+        checkouts = CounterMetricFamily(
+            "wallet_db_pool_checkouts",
+            "Connections handed out by the pool.",
+            labels=["engine"],
+        )
+        held = CounterMetricFamily(
+            "wallet_db_pool_hold_seconds",
+            "Total time connections spent checked out.",
+            labels=["engine"],
+        )
+        for name, stats in database.pool_hold_stats.items():
+            checkouts.add_metric([name], stats.checkouts)
+            held.add_metric([name], stats.hold_seconds_total)
+        yield from (checkouts, held)
+
+        stats = password_hash_stats
+        yield GaugeMetricFamily(
+            "wallet_password_hash_waiting",
+            "Password hashes queued for a worker thread.",
+            value=stats.waiting,
+        )
+        yield GaugeMetricFamily(
+            "wallet_password_hash_running",
+            "Password hashes being computed.",
+            value=stats.running,
+        )
+        yield CounterMetricFamily(
+            "wallet_password_hash_wait_seconds",
+            "Total time password hashes spent queued.",
+            value=stats.wait_seconds_total,
+        )
+
+
+_runtime_collector: _RuntimeCollector | None = None
+
+
+def register_runtime_collector() -> None:
+    global _runtime_collector
+    if _runtime_collector is None:
+        _runtime_collector = _RuntimeCollector()
+        REGISTRY.register(_runtime_collector)
@@ -0,0 +1,74 @@
+"""Routing reads to the replica without losing a user's own writes.
+
+A replica replays the primary's changes a moment later, so a user who has
+just saved something and reloads the list must not be sent there: for
+READ_YOUR_WRITES_SECONDS after each of their writes, their reads go to the
+primary. Writes are noted per process and, when Redis is up, in Redis for
+the other workers to see.
+"""
+
+import logging
+import time
+
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core import database, redis
+from app.core.config import settings
+from app.core.metrics import REDIS_COMMAND_DURATION
+
+logger = logging.getLogger(__name__)
+
+# Pruned of expired entries whenever it grows past this.
+_LOCAL_LIMIT = 10_000
+_recent_writes: dict[int, float] = {}
+
+
+def replica_enabled() -> bool:
+    return database.read_engine is not database.engine
+
+
+def _key(user_id: int) -> str:
+    return f"db:wrote:{user_id}"
+
+
+async def note_write(user_id: int) -> None:
+    if not replica_enabled():
+        return
+    window = settings.READ_YOUR_WRITES_SECONDS
+    if len(_recent_writes) >= _LOCAL_LIMIT:
+        now = time.monotonic()
+        for stale in [u for u, until in _recent_writes.items() if until < now]:
+            del _recent_writes[stale]
+    _recent_writes[user_id] = time.monotonic() + window
+    if redis.redis_pool is None:
+        return
+    try:
+        with REDIS_COMMAND_DURATION.labels("set").time():
+            await redis.redis_pool.set(_key(user_id), b"1", ex=window)
+    except RedisError:
+        logger.warning("Could not record a write for read routing", exc_info=True)
+
+
+async def wrote_recently(user_id: int) -> bool:
+    until = _recent_writes.get(user_id)
+    if until is not None and until >= time.monotonic():
+        return True
+    if redis.redis_pool is None:
+        return False
+    try:
+        with REDIS_COMMAND_DURATION.labels("exists").time():
+            return bool(await redis.redis_pool.exists(_key(user_id)))
+    except RedisError:
+        # Without the shared record, the primary is the only safe answer.
+        logger.warning("Could not check recent writes for read routing", exc_info=True)
+        return True
+
+
+async def read_session_factory(user_id: int | None) -> async_sessionmaker[AsyncSession]:
+    """The sessionmaker a read on behalf of ``user_id`` should use."""
+    if not replica_enabled():
+        return database.async_session
+    if user_id is not None and await wrote_recently(user_id):
+        return database.async_session
+    return database.read_session
@@ -0,0 +1,36 @@
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.encoders import decimal_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return decimal_encoder(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class DecimalJSONResponse(JSONResponse):
+    """JSON rendered by orjson, with Decimals written as jsonable_encoder does.
+
+    An endpoint without a response_model has its return value walked by
+    jsonable_encoder, in Python, before it is rendered. Analytics payloads
+    are thousands of Decimals in nested dicts, and that walk dominated their
+    response time. Returning this response directly skips it: orjson handles
+    dicts, lists, dates, enums and dataclasses natively and only calls back
+    for Decimals, which keep their current output (``1`` for a whole number,
+    ``1.5`` otherwise).
+
+    Endpoints with a response_model should keep the default response class;
+    FastAPI serializes those through pydantic-core without this walk.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
@@ -1,5 +1,10 @@
+import asyncio
 import hashlib
 import secrets
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 
 import bcrypt
@@ -9,32 +14,104 @@ from app.core.config import settings
 
 
 def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+    salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
+    return bcrypt.hashpw(password.encode("utf-8"), salt).decode("utf-8")
 
 
 def verify_password(plain: str, hashed: str) -> bool:
     return bcrypt.checkpw(plain.encode("utf-8"), hashed.encode("utf-8"))
 
 
-def create_access_token(subject: int) -> str:
+def password_needs_rehash(hashed: str) -> bool:
+    """True when ``hashed`` was made with a cost other than BCRYPT_ROUNDS."""
+    # $2b$12$<salt+digest>
+    return int(hashed.split("$")[2]) != settings.BCRYPT_ROUNDS
+
+
+@dataclass
+class PasswordHashStats:
+    """Counters for the password hashing pool, read by monitoring."""
+
+    waiting: int = 0
+    running: int = 0
+    completed: int = 0
+    max_waiting: int = 0
+    wait_seconds_total: float = 0.0
+
+
+password_hash_stats = PasswordHashStats()
+_stats_lock = threading.Lock()
+
+# bcrypt releases the GIL, so a few threads hash in parallel while the event
+# loop keeps serving other requests. The pool is created on first use so
+# importing this module starts no threads.
+_hash_executor: ThreadPoolExecutor | None = None
+
+
+def _timed(fn, queued_at: float, *args):
+    stats = password_hash_stats
+    with _stats_lock:
+        stats.waiting -= 1
+        stats.running += 1
+        stats.wait_seconds_total += time.perf_counter() - queued_at
+    try:
+        return fn(*args)
+    finally:
+        with _stats_lock:
+            stats.running -= 1
+            stats.completed += 1
+
+
+async def _run_hashing(fn, *args):
+    global _hash_executor
+    if _hash_executor is None:
+        _hash_executor = ThreadPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS,
+            thread_name_prefix="password-hash",
+        )
+    stats = password_hash_stats
+    with _stats_lock:
+        stats.waiting += 1
+        stats.max_waiting = max(stats.max_waiting, stats.waiting)
+    return await asyncio.get_running_loop().run_in_executor(
+        _hash_executor, _timed, fn, time.perf_counter(), *args
+    )
+
+
+async def hash_password_async(password: str) -> str:
+    return await _run_hashing(hash_password, password)
+
+
+async def verify_password_async(plain: str, hashed: str) -> bool:
+    return await _run_hashing(verify_password, plain, hashed)
+
+
+def create_access_token(subject: int, token_version: int = 0) -> str:
     expire = datetime.now(timezone.utc) + timedelta(
         minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
     )
-    payload = {"sub": str(subject), "exp": expire}
+    payload = {"sub": str(subject), "ver": token_version, "exp": expire}
     return jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
 
-def decode_access_token(token: str) -> int | None:
+def decode_access_claims(token: str) -> tuple[int, int] | None:
+    """Returns (user_id, token_version), or None for an invalid or expired token."""
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
         )
         sub = payload.get("sub")
-        return int(sub) if sub else None
-    except (JWTError, ValueError):
+        # Tokens issued before versioning carry no "ver"; they are version 0.
+        return (int(sub), int(payload.get("ver", 0))) if sub else None
+    except (JWTError, ValueError, TypeError):
         return None
 
 
+def decode_access_token(token: str) -> int | None:
+    claims = decode_access_claims(token)
+    return claims[0] if claims else None
+
+
 def create_refresh_token() -> tuple[str, str]:
     """Returns (raw_token, hashed_token). Store only the hash in DB."""
     raw = secrets.token_urlsafe(32)
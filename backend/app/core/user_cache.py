@@ -0,0 +1,175 @@
+"""Two-level cache of the user rows that access tokens resolve to.
+
+Every authenticated request needs its user, and almost none of them change
+it. L1 is a small per-process TTL/LRU map that answers without any I/O; L2
+is Redis, shared by every worker, so a process that has never seen the user
+still avoids the database. Entries are keyed by user id *and* token version:
+a token issued before a password change names a version whose entry has been
+invalidated, so it can never be answered from cache.
+
+Invalidating leaves a short-lived tombstone in place of the entry, in this
+process and in Redis. A request that read the row just before the change
+committed would otherwise cache the old row again once the entry was gone;
+while the tombstone is there, lookups miss and nothing is cached under the
+key. Redis only accepts an entry where no key exists (SET NX), so the
+check and the write are one command.
+
+Redis is an optimisation here, never a dependency: when it is not configured
+or not reachable, lookups fall through to the database.
+"""
+
+import json
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any
+
+from redis.exceptions import RedisError
+from sqlalchemy import DateTime
+
+from app.core import redis
+from app.core.config import settings
+from app.core.metrics import REDIS_COMMAND_DURATION
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+_DATETIME_FIELDS = frozenset(
+    c.key for c in User.__table__.columns if isinstance(c.type, DateTime)
+)
+# Secrets stay in the database. A user built from the cache lacks them, so
+# handlers that need one select it.
+_SECRET_FIELDS = frozenset({"password_hash"})
+_FIELDS = tuple(c.key for c in User.__table__.columns if c.key not in _SECRET_FIELDS)
+
+# What invalidate_user leaves behind, and for how long. It has to outlast
+# the time from a request reading the user row to it caching the row.
+_TOMBSTONE = b"-"
+_TOMBSTONE_SECONDS = 30
+
+
+class _LocalCache:
+    """A TTL-bounded LRU map. Not thread-safe; it lives on the event loop."""
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: str) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        self._entries[key] = (time.monotonic() + (ttl or self.ttl), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_local = _LocalCache(settings.USER_CACHE_L1_SIZE, settings.USER_CACHE_L1_TTL_SECONDS)
+
+
+def _key(user_id: int, token_version: int) -> str:
+    return f"auth:user:{user_id}:{token_version}"
+
+
+def _dump(user: User) -> dict[str, Any]:
+    return {name: getattr(user, name) for name in _FIELDS}
+
+
+def _encode(fields: dict[str, Any]) -> bytes:
+    return json.dumps(
+        {
+            k: v.isoformat() if k in _DATETIME_FIELDS and v is not None else v
+            for k, v in fields.items()
+        }
+    ).encode()
+
+
+def _decode(raw: bytes) -> dict[str, Any]:
+    # Only the known fields: entries written before a column was dropped
+    # from the cache may still carry it.
+    stored = json.loads(raw)
+    fields = {name: stored[name] for name in _FIELDS if name in stored}
+    for name in _DATETIME_FIELDS:
+        if fields.get(name) is not None:
+            fields[name] = datetime.fromisoformat(fields[name])
+    return fields
+
+
+def _fill_local(key: str, fields: dict[str, Any]) -> bool:
+    """Cache ``fields`` in L1 unless the key is tombstoned; True if it was."""
+    if _local.get(key) is _TOMBSTONE:
+        return False
+    _local.set(key, fields)
+    return True
+
+
+async def get_cached_user(user_id: int, token_version: int) -> dict[str, Any] | None:
+    """The cached column values of the user, or None on a miss."""
+    key = _key(user_id, token_version)
+    fields = _local.get(key)
+    if fields is _TOMBSTONE:
+        return None
+    if fields is not None:
+        return fields
+    if redis.redis_pool is None:
+        return None
+    try:
+        with REDIS_COMMAND_DURATION.labels("get").time():
+            raw = await redis.redis_pool.get(key)
+    except RedisError:
+        logger.warning("User cache read failed", exc_info=True)
+        return None
+    if raw is None or raw == _TOMBSTONE:
+        return None
+    fields = _decode(raw)
+    _fill_local(key, fields)
+    return fields
+
+
+async def cache_user(user: User) -> None:
+    key = _key(user.id, user.token_version)
+    fields = _dump(user)
+    if not _fill_local(key, fields) or redis.redis_pool is None:
+        return
+    try:
+        with REDIS_COMMAND_DURATION.labels("set").time():
+            await redis.redis_pool.set(
+                key, _encode(fields), ex=settings.USER_CACHE_TTL_SECONDS, nx=True
+            )
+    except RedisError:
+        logger.warning("User cache write failed", exc_info=True)
+
+
+async def invalidate_user(user_id: int, token_version: int) -> None:
+    """Tombstone the entry for ``token_version``; call after the change has committed.
+
+    Pass the version the cached entry was stored under, which is the old one
+    when the change bumps it. Other processes keep their L1 copy until it
+    expires, at most USER_CACHE_L1_TTL_SECONDS later.
+    """
+    key = _key(user_id, token_version)
+    _local.set(key, _TOMBSTONE, ttl=_TOMBSTONE_SECONDS)
+    if redis.redis_pool is None:
+        return
+    try:
+        with REDIS_COMMAND_DURATION.labels("set").time():
+            await redis.redis_pool.set(key, _TOMBSTONE, ex=_TOMBSTONE_SECONDS)
+    except RedisError:
+        logger.warning("User cache invalidation failed", exc_info=True)
@@ -4,12 +4,14 @@ from contextlib import asynccontextmanager
 from fastapi import Depends, FastAPI, Request
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from sqlalchemy import text
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.admin import setup_admin
+from app.admin import mount_admin
+from app.api._pagination import NEXT_CURSOR_HEADER
 from app.api import (
     analytics,
     auth,
@@ -17,6 +19,7 @@ from app.api import (
     currencies,
     exchange_rates,
     expense_categories,
+    imports,
     income_sources,
     oauth,
     reports,
@@ -26,6 +29,8 @@ from app.api import (
 from app.core.config import settings
 from app.core.database import get_db
 from app.core.exceptions import AppException, ErrorResponse
+from app.core.metrics import MetricsMiddleware, register_runtime_collector
+from app.core.http import close_http_client, init_http_client
 from app.core.redis import close_redis, init_redis
 from app.messaging import consumers  # noqa: F401 — registers @broker.subscriber handlers
 from app.messaging.broker import broker
@@ -36,13 +41,17 @@ logger = logging.getLogger(__name__)
 @asynccontextmanager
 async def lifespan(_: FastAPI):
     await init_redis()
+    await init_http_client()
     await broker.start()
     yield
     await broker.close()
+    await close_http_client()
     await close_redis()
 
 
 app = FastAPI(title=settings.PROJECT_NAME, lifespan=lifespan)
+app.add_middleware(MetricsMiddleware)
+register_runtime_collector()
 
 if settings.CORS_ORIGINS:
     app.add_middleware(
@@ -51,6 +60,7 @@ if settings.CORS_ORIGINS:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER],
     )
 
 
@@ -104,16 +114,25 @@ for router in [
     expense_categories.router,
     transactions.router,
     balance_snapshots.router,
+    imports.router,
     analytics.router,
     reports.router,
 ]:
     app.include_router(router, prefix=settings.API_PREFIX)
 
 
+# Outside API_PREFIX, so the reverse proxy, which only forwards /api/, does
+# not expose it; Prometheus scrapes the backend container directly.
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
 @app.get("/api/health")
 async def health(db: AsyncSession = Depends(get_db)):
     await db.execute(text("SELECT 1"))
     return {"status": "ok"}
 
 
-setup_admin(app)
+if settings.ADMIN_ENABLED:
+    mount_admin(app)
@@ -3,8 +3,8 @@ import logging
 
 from faststream.redis import StreamSub
 
-from wallet_sdk.messaging.schemas import ReportCompletedMsg
-from wallet_sdk.messaging.topics import REPORT_COMPLETED
+from wallet_sdk.messaging.schemas import ReportCompletedMsg, ReportRequestedMsg
+from wallet_sdk.messaging.topics import REPORT_COMPLETED, REPORT_REQUESTED_DEAD
 
 from app.core.redis import get_redis
 from app.messaging.broker import broker
@@ -12,17 +12,30 @@ from app.messaging.broker import broker
 logger = logging.getLogger(__name__)
 
 
-@broker.subscriber(
-    stream=StreamSub(REPORT_COMPLETED, group="backend", consumer="backend-1")
-)
-async def handle_report_completed(msg: ReportCompletedMsg) -> None:
+async def _set_status(job_id: str, status: str, **fields) -> None:
     r = get_redis()
-    key = f"report:{msg.job_id}"
+    key = f"report:{job_id}"
     raw = await r.get(key)
     if raw:
         data = json.loads(raw)
-        data["status"] = "ready"
+        data.update(fields, status=status)
         await r.set(key, json.dumps(data), ex=3600)
-        logger.info("Report %s marked as ready", msg.job_id)
+        logger.info("Report %s marked as %s", job_id, status)
     else:
-        logger.warning("Report %s not found in Redis on completion", msg.job_id)
+        logger.warning("Report %s not found in Redis on %s", job_id, status)
+
+
+@broker.subscriber(
+    stream=StreamSub(REPORT_COMPLETED, group="backend", consumer="backend-1")
+)
+async def handle_report_completed(msg: ReportCompletedMsg) -> None:
+    await _set_status(msg.job_id, "ready", data_version=msg.data_version)
+
+
+# The report service gives up on a request after REPORT_MAX_DELIVERIES and
+# moves it here; the job will never be ready, so pollers are told it failed.
+@broker.subscriber(
+    stream=StreamSub(REPORT_REQUESTED_DEAD, group="backend", consumer="backend-1")
+)
+async def handle_report_dead_lettered(msg: ReportRequestedMsg) -> None:
+    await _set_status(msg.job_id, "failed")
@@ -1,11 +1,13 @@
-from wallet_sdk.messaging.schemas import ReportRequestedMsg
+from wallet_sdk.messaging.schemas import ReportFormat, ReportRequestedMsg
 from wallet_sdk.messaging.topics import REPORT_REQUESTED
 
 from app.messaging.broker import broker
 
 
-async def publish_report_requested(job_id: str, user_id: int) -> None:
+async def publish_report_requested(
+    job_id: str, user_id: int, fmt: ReportFormat = ReportFormat.xlsx
+) -> None:
     await broker.publish(
-        ReportRequestedMsg(job_id=job_id, user_id=user_id),
+        ReportRequestedMsg(job_id=job_id, user_id=user_id, format=fmt),
         stream=REPORT_REQUESTED,
     )
@@ -1,7 +1,7 @@
 from datetime import date
 from decimal import Decimal
 
-from sqlalchemy import ForeignKey, Numeric, Date
+from sqlalchemy import Date, ForeignKey, Index, Numeric, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
@@ -9,15 +9,29 @@ from app.core.database import Base
 
 class BalanceSnapshot(Base):
     __tablename__ = "balance_snapshots"
+    __table_args__ = (
+        # One balance per account per day; recording it again replaces it.
+        UniqueConstraint(
+            "storage_account_id", "date", name="uq_balance_snapshots_account_date"
+        ),
+        Index("ix_balance_snapshots_user_date_id", "user_id", "date", "id"),
+        # get_balance_timeline walks each account's history in date order.
+        Index(
+            "ix_balance_snapshots_user_account_date_id",
+            "user_id",
+            "storage_account_id",
+            "date",
+            "id",
+            postgresql_include=["amount"],
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    user_id: Mapped[int] = mapped_column(
-        ForeignKey("users.id", ondelete="CASCADE"), index=True
-    )
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
     storage_account_id: Mapped[int] = mapped_column(
         ForeignKey("storage_accounts.id", ondelete="CASCADE")
     )
-    date: Mapped[date] = mapped_column(Date, index=True)
+    date: Mapped[date] = mapped_column(Date)
     # 8 dp so crypto balances survive the round trip — BTC-denominated accounts
     # are offered from the currency catalog and would round to zero at 2 dp.
     amount: Mapped[Decimal] = mapped_column(Numeric(28, 8))
@@ -2,7 +2,7 @@ import enum
 from datetime import date
 from decimal import Decimal
 
-from sqlalchemy import ForeignKey, Numeric, Date, Enum, String
+from sqlalchemy import ForeignKey, Index, Numeric, Date, Enum, String, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
@@ -15,16 +15,64 @@ class TransactionType(str, enum.Enum):
 
 class Transaction(Base):
     __tablename__ = "transactions"
+    # Every read is scoped to one user, so every index leads with user_id;
+    # plain user_id or date indexes would be redundant, and a date one tempts
+    # the planner into walking all users' rows in date order. Postgres scans a btree
+    # backwards as cheaply as forwards, so these serve DESC pages as well.
+    __table_args__ = (
+        # Keyset pages and date-range filters.
+        Index("ix_transactions_user_date_id", "user_id", "date", "id"),
+        Index("ix_transactions_user_amount_id", "user_id", "amount", "id"),
+        # The list filters by account or income source, still ordered by date.
+        Index(
+            "ix_transactions_user_account_date_id",
+            "user_id",
+            "storage_account_id",
+            "date",
+            "id",
+        ),
+        Index(
+            "ix_transactions_user_source_date_id",
+            "user_id",
+            "income_source_id",
+            "date",
+            "id",
+        ),
+        # Covers get_income_matrix outright, so it never touches the heap.
+        Index(
+            "ix_transactions_user_type_date",
+            "user_id",
+            "type",
+            "date",
+            postgresql_include=["amount", "currency_id", "income_source_id"],
+        ),
+        # Description search (needs the pg_trgm extension).
+        Index(
+            "ix_transactions_description_trgm",
+            "description",
+            postgresql_using="gin",
+            postgresql_ops={"description": "gin_trgm_ops"},
+        ),
+        Index(
+            "uq_transactions_user_import_hash",
+            "user_id",
+            "import_hash",
+            unique=True,
+            postgresql_where=text("import_hash IS NOT NULL"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    user_id: Mapped[int] = mapped_column(
-        ForeignKey("users.id", ondelete="CASCADE"), index=True
-    )
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
     type: Mapped[TransactionType] = mapped_column(Enum(TransactionType))
-    date: Mapped[date] = mapped_column(Date, index=True)
+    date: Mapped[date] = mapped_column(Date)
     # 8 dp so crypto amounts survive the round trip — see BalanceSnapshot.amount.
     amount: Mapped[Decimal] = mapped_column(Numeric(28, 8))
     description: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    # Content hash of the statement line a row was imported from; NULL for
+    # rows entered by hand. Re-importing an overlapping statement skips rows
+    # whose hash is already present.
+    import_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
 
     currency_id: Mapped[int] = mapped_column(
         ForeignKey("currencies.id", ondelete="CASCADE")
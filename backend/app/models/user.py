@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import BigInteger, String, DateTime, func
+from sqlalchemy import BigInteger, DateTime, Integer, String, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
@@ -25,6 +25,9 @@ class User(Base):
         DateTime(timezone=True), nullable=True
     )
     base_currency_code: Mapped[str | None] = mapped_column(String(10), nullable=True)
+    # Stamped into every access token; bumping it retires the tokens issued
+    # before, along with any cached copy of the user row they resolved to.
+    token_version: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
 
     currencies = relationship(
         "Currency", back_populates="user", cascade="all, delete-orphan"
@@ -0,0 +1,16 @@
+import datetime
+
+from pydantic import BaseModel
+
+
+class BalanceBreakdownItem(BaseModel):
+    account_id: int
+    account_label: str
+    currency: str
+    latest_snapshot_date: datetime.date
+    latest_snapshot_amount: float
+
+
+class BalanceBreakdown(BaseModel):
+    accounts: list[BalanceBreakdownItem]
+    totals: dict[str, float]
@@ -1,7 +1,7 @@
 import datetime
 from decimal import Decimal
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, field_validator
 
 
 # A snapshot states what an account holds, not how much moved. Zero is a real
@@ -26,3 +26,31 @@ class BalanceSnapshotResponse(BaseModel):
     amount: Decimal
 
     model_config = {"from_attributes": True}
+
+
+class BalanceSnapshotBatchItem(BaseModel):
+    storage_account_id: int
+    amount: Decimal
+
+
+# Comfortably more accounts than anyone re-counts by hand in one sitting.
+BATCH_MAX_ITEMS = 500
+
+
+class BalanceSnapshotBatch(BaseModel):
+    """Every balance counted on one day."""
+
+    date: datetime.date
+    balances: list[BalanceSnapshotBatchItem] = Field(
+        min_length=1, max_length=BATCH_MAX_ITEMS
+    )
+
+    @field_validator("balances")
+    @classmethod
+    def one_balance_per_account(
+        cls, balances: list[BalanceSnapshotBatchItem]
+    ) -> list[BalanceSnapshotBatchItem]:
+        account_ids = [b.storage_account_id for b in balances]
+        if len(set(account_ids)) != len(account_ids):
+            raise ValueError("each storage account may appear only once")
+        return balances
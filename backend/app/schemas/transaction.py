@@ -1,8 +1,8 @@
 import datetime
 from decimal import Decimal
-from typing import Self
+from typing import Literal, Self
 
-from pydantic import BaseModel, model_validator
+from pydantic import BaseModel, Field, model_validator
 
 from app.models.transaction import TransactionType
 from app.schemas._validators import AmountPositiveMixin
@@ -46,6 +46,21 @@ class TransactionUpdate(AmountPositiveMixin, BaseModel):
         return self
 
 
+class TransactionBulkUpdate(TransactionUpdate):
+    id: int
+
+
+# Large enough for several years of imported income in one call, small enough
+# that a single request cannot hold a connection for minutes.
+BULK_MAX_ITEMS = 5000
+
+
+class TransactionBulkRequest(BaseModel):
+    create: list[TransactionCreate] = Field(default=[], max_length=BULK_MAX_ITEMS)
+    update: list[TransactionBulkUpdate] = Field(default=[], max_length=BULK_MAX_ITEMS)
+    delete: list[int] = Field(default=[], max_length=BULK_MAX_ITEMS)
+
+
 class TransactionResponse(BaseModel):
     id: int
     type: TransactionType
@@ -69,3 +84,17 @@ class TransactionCurrencyTotal(BaseModel):
 class TransactionSummaryResponse(BaseModel):
     count: int
     totals: list[TransactionCurrencyTotal]
+
+
+class TransactionBulkError(BaseModel):
+    op: Literal["create", "update", "delete"]
+    index: int
+    code: str
+    message: str
+
+
+class TransactionBulkResponse(BaseModel):
+    created: list[TransactionResponse]
+    updated: list[TransactionResponse]
+    deleted: list[int]
+    errors: list[TransactionBulkError]
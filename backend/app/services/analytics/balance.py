@@ -227,16 +227,18 @@ async def get_balance_by_storage(
     return out
 
 
-async def get_balance_breakdown(db: AsyncSession, user_id: int) -> dict:
-    """The latest known balance of every storage account, as of today.
+async def get_balance_breakdown(
+    db: AsyncSession, user_id: int, as_of: date | None = None
+) -> dict:
+    """The latest known balance of every storage account, as of ``as_of`` (today).
 
     The per-currency totals ship with the accounts rather than being re-added by
     each caller, so "what I hold right now" is one number computed in one place.
     """
-    today = date.today()
-    timeline = await get_balance_timeline(db, user_id, [today])
+    as_of = as_of or date.today()
+    timeline = await get_balance_timeline(db, user_id, [as_of])
     directory = await account_directory(db, user_id)
-    balances = timeline.balances_at(today)
+    balances = timeline.balances_at(as_of)
 
     accounts = sorted(
         (
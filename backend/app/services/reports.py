@@ -0,0 +1,54 @@
+import hashlib
+
+from sqlalchemy import func, literal, literal_column, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import (
+    BalanceSnapshot,
+    Currency,
+    ExpenseCategory,
+    IncomeSource,
+    StorageAccount,
+    StorageLocation,
+    Transaction,
+)
+
+# Every table the export reads.
+_EXPORTED_MODELS = (
+    Transaction,
+    BalanceSnapshot,
+    StorageAccount,
+    StorageLocation,
+    IncomeSource,
+    ExpenseCategory,
+    Currency,
+)
+
+
+async def user_data_version(db: AsyncSession, user_id: int) -> str:
+    """A value that changes whenever the user's export would.
+
+    For each exported table it takes the user's row count and the sum of
+    their rows' xmin, the id of the transaction that last wrote each one.
+    Inserts and deletes move the count; an update writes a new row version
+    under a newer transaction id and so moves the sum. No column has to be
+    kept up to date for it, and one pass over the user's rows is far cheaper
+    than regenerating a report.
+    """
+    stmt = union_all(
+        *(
+            select(
+                literal(model.__tablename__),
+                func.count(),
+                func.coalesce(
+                    func.sum(
+                        literal_column(f"{model.__tablename__}.xmin::text::bigint")
+                    ),
+                    0,
+                ),
+            ).where(model.user_id == user_id)
+            for model in _EXPORTED_MODELS
+        )
+    )
+    rows = sorted(tuple(row) for row in await db.execute(stmt))
+    return hashlib.sha256(repr(rows).encode()).hexdigest()
@@ -0,0 +1,17 @@
+from app.services.statement_import.loader import (
+    ImportStats,
+    ImportTarget,
+    load_statement,
+)
+from app.services.statement_import.parsers import (
+    StatementFormat,
+    parse_statement,
+)
+
+__all__ = [
+    "ImportStats",
+    "ImportTarget",
+    "StatementFormat",
+    "load_statement",
+    "parse_statement",
+]
@@ -0,0 +1,244 @@
+import hashlib
+from collections.abc import AsyncIterator, Iterable
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import (
+    Date,
+    Numeric,
+    String,
+    column,
+    literal,
+    select,
+    table,
+    text,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import BalanceSnapshot, Transaction, TransactionType
+from app.services.statement_import.parsers import (
+    RowError,
+    StatementBalance,
+    StatementEntry,
+    StatementRecord,
+)
+
+CHUNK_SIZE = 5000
+# Enough to show the user what went wrong without letting a file of garbage
+# grow the job status without bound.
+MAX_REPORTED_ERRORS = 20
+
+_TX_STAGE = table(
+    "import_transactions_stage",
+    column("date", Date),
+    column("amount", Numeric(28, 8)),
+    column("description", String(500)),
+    column("import_hash", String(64)),
+)
+_SNAPSHOT_STAGE = table(
+    "import_snapshots_stage",
+    column("date", Date),
+    column("amount", Numeric(28, 8)),
+)
+_CREATE_STAGES = (
+    """
+    CREATE TEMP TABLE IF NOT EXISTS import_transactions_stage (
+        date date NOT NULL,
+        amount numeric(28, 8) NOT NULL,
+        description varchar(500),
+        import_hash varchar(64) NOT NULL
+    )
+    """,
+    """
+    CREATE TEMP TABLE IF NOT EXISTS import_snapshots_stage (
+        date date NOT NULL,
+        amount numeric(28, 8) NOT NULL
+    )
+    """,
+)
+
+
+@dataclass
+class ImportTarget:
+    user_id: int
+    storage_account_id: int
+    currency_id: int
+    currency_code: str
+    income_source_id: int | None = None
+
+
+@dataclass
+class ImportStats:
+    processed: int = 0
+    imported: int = 0
+    duplicates: int = 0
+    # Debits are not recorded: Wallet derives spending from balance snapshots.
+    skipped_debits: int = 0
+    snapshots: int = 0
+    error_count: int = 0
+    errors: list[str] = field(default_factory=list)
+
+    def add_error(self, message: str) -> None:
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(message)
+
+
+class _Hasher:
+    """Content hash that makes re-importing an overlapping statement a no-op.
+
+    Two genuinely identical entries on the same day (two equal card payments)
+    must both survive, so each hash also carries how many times that exact
+    entry has already been seen in this file. A later statement that covers
+    the same day repeats the same entries in the same multiplicity and so
+    reproduces the same hashes.
+    """
+
+    def __init__(self, storage_account_id: int) -> None:
+        self._account = storage_account_id
+        self._seen: dict[str, int] = {}
+
+    def __call__(self, entry: StatementEntry) -> str:
+        amount = format(entry.amount.normalize(), "f")
+        key = (
+            f"{self._account}|{entry.date.isoformat()}|{amount}"
+            f"|{entry.reference or entry.description or ''}"
+        )
+        occurrence = self._seen.get(key, 0)
+        self._seen[key] = occurrence + 1
+        return hashlib.sha256(f"{key}|{occurrence}".encode()).hexdigest()
+
+
+async def _copy_chunk(
+    db: AsyncSession,
+    target: ImportTarget,
+    entries: list[tuple[date, Decimal, str | None, str]],
+    balances: dict[date, Decimal],
+    stats: ImportStats,
+) -> None:
+    """COPY one chunk into the staging tables and merge it into the real ones."""
+    conn = await db.connection()
+    for ddl in _CREATE_STAGES:
+        await conn.execute(text(ddl))
+    driver = (await conn.get_raw_connection()).driver_connection
+
+    if entries:
+        await driver.copy_records_to_table(
+            "import_transactions_stage",
+            records=entries,
+            columns=["date", "amount", "description", "import_hash"],
+        )
+        stmt = (
+            pg_insert(Transaction)
+            .from_select(
+                [
+                    "user_id",
+                    "type",
+                    "date",
+                    "amount",
+                    "description",
+                    "currency_id",
+                    "storage_account_id",
+                    "income_source_id",
+                    "import_hash",
+                ],
+                select(
+                    literal(target.user_id),
+                    literal(TransactionType.income, Transaction.type.type),
+                    _TX_STAGE.c.date,
+                    _TX_STAGE.c.amount,
+                    _TX_STAGE.c.description,
+                    literal(target.currency_id),
+                    literal(target.storage_account_id),
+                    literal(target.income_source_id, Transaction.income_source_id.type),
+                    _TX_STAGE.c.import_hash,
+                ),
+            )
+            .on_conflict_do_nothing(
+                index_elements=["user_id", "import_hash"],
+                index_where=Transaction.import_hash.is_not(None),
+            )
+        )
+        result = await conn.execute(stmt)
+        stats.imported += result.rowcount
+        stats.duplicates += len(entries) - result.rowcount
+        await conn.execute(text("TRUNCATE import_transactions_stage"))
+
+    if balances:
+        await driver.copy_records_to_table(
+            "import_snapshots_stage",
+            records=list(balances.items()),
+            columns=["date", "amount"],
+        )
+        # A snapshot the user already recorded for that day wins over the bank's.
+        stmt = (
+            pg_insert(BalanceSnapshot)
+            .from_select(
+                ["user_id", "storage_account_id", "date", "amount"],
+                select(
+                    literal(target.user_id),
+                    literal(target.storage_account_id),
+                    _SNAPSHOT_STAGE.c.date,
+                    _SNAPSHOT_STAGE.c.amount,
+                ),
+            )
+            .on_conflict_do_nothing(
+                index_elements=[
+                    BalanceSnapshot.storage_account_id,
+                    BalanceSnapshot.date,
+                ]
+            )
+        )
+        result = await conn.execute(stmt)
+        stats.snapshots += result.rowcount
+        await conn.execute(text("TRUNCATE import_snapshots_stage"))
+
+
+async def load_statement(
+    db: AsyncSession,
+    target: ImportTarget,
+    records: Iterable[StatementRecord],
+    chunk_size: int = CHUNK_SIZE,
+) -> AsyncIterator[ImportStats]:
+    """Stream parsed records into the database, ``chunk_size`` at a time.
+
+    Yields the running totals after every chunk; the caller decides whether
+    to commit and report progress in between. Credits become income
+    transactions on ``target``'s account, reported balances become snapshots,
+    and entries in a foreign currency are rejected rather than mislabelled.
+    """
+    stats = ImportStats()
+    hasher = _Hasher(target.storage_account_id)
+    entries: list[tuple[date, Decimal, str | None, str]] = []
+    # One balance per day; a later report for the same day supersedes. They
+    # are kept for the whole file, at most one per day, and written last: a
+    # snapshot already written cannot be told apart from the user's own.
+    balances: dict[date, Decimal] = {}
+
+    for record in records:
+        stats.processed += 1
+        if isinstance(record, RowError):
+            stats.add_error(f"{record.position}: {record.message}")
+        elif record.currency and record.currency != target.currency_code:
+            stats.add_error(
+                f"{record.date.isoformat()}: currency {record.currency} does not "
+                f"match the account currency {target.currency_code}"
+            )
+        elif isinstance(record, StatementBalance):
+            balances[record.date] = record.amount
+        elif record.amount <= 0:
+            stats.skipped_debits += 1
+        else:
+            description = record.description[:500] if record.description else None
+            entries.append((record.date, record.amount, description, hasher(record)))
+
+        if len(entries) >= chunk_size:
+            await _copy_chunk(db, target, entries, {}, stats)
+            entries = []
+            yield stats
+
+    if entries or balances:
+        await _copy_chunk(db, target, entries, balances, stats)
+    yield stats
@@ -0,0 +1,393 @@
+"""Streaming parsers for bank statement exports.
+
+Each parser reads a binary file object incrementally and yields records as it
+goes, so memory is bounded by the largest single entry rather than the file.
+"""
+
+import codecs
+import csv
+import enum
+import io
+import re
+import xml.etree.ElementTree as ET
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from typing import BinaryIO
+
+
+class StatementFormat(str, enum.Enum):
+    csv = "csv"
+    ofx = "ofx"
+    camt053 = "camt053"
+
+
+@dataclass(frozen=True)
+class StatementEntry:
+    """One booked movement. Credits are positive, debits negative."""
+
+    date: date
+    amount: Decimal
+    description: str | None = None
+    # The bank's own id for the entry, when the format carries one. It is a far
+    # better dedupe key than the description, which banks sometimes rewrite.
+    reference: str | None = None
+    currency: str | None = None
+
+
+@dataclass(frozen=True)
+class StatementBalance:
+    """The account balance the bank reports at the end of ``date``."""
+
+    date: date
+    amount: Decimal
+    currency: str | None = None
+
+
+@dataclass(frozen=True)
+class RowError:
+    position: str
+    message: str
+
+
+StatementRecord = StatementEntry | StatementBalance | RowError
+
+
+def _parse_amount(raw: str) -> Decimal:
+    """An OFX or camt.053 amount.
+
+    Neither format groups thousands, and OFX allows a comma as the decimal mark.
+    """
+    try:
+        return Decimal(raw.strip().replace(",", "."))
+    except InvalidOperation:
+        raise ValueError(f"invalid amount {raw!r}") from None
+
+
+# --- CSV ---
+
+_CSV_SAMPLE = 8192
+
+_CSV_COLUMNS = {
+    "date": ("date", "booking date", "transaction date", "posted"),
+    "amount": ("amount",),
+    "description": ("description", "memo", "details", "payee", "name"),
+    "balance": ("balance", "running balance"),
+    "reference": ("reference", "transaction id", "id"),
+}
+
+
+# An amount read with each decimal mark, the other one grouping thousands.
+_CSV_AMOUNT = {
+    mark: re.compile(
+        rf"([+-]?)(\d{{1,3}}(?:{re.escape(group)}\d{{3}})+|\d+)"
+        rf"(?:{re.escape(mark)}(\d+))?"
+    )
+    for mark, group in ((".", ","), (",", "."))
+}
+
+
+def _csv_readings(raw: str) -> dict[str, Decimal]:
+    """The value of ``raw`` under each decimal mark that can read it."""
+    text = raw.strip().replace(" ", "").replace("\xa0", "")
+    readings = {}
+    for mark, pattern in _CSV_AMOUNT.items():
+        match = pattern.fullmatch(text)
+        if match:
+            sign, whole, fraction = match.groups()
+            group = "," if mark == "." else "."
+            number = sign + whole.replace(group, "")
+            readings[mark] = Decimal(f"{number}.{fraction}" if fraction else number)
+    return readings
+
+
+class _CsvAmounts:
+    """Reads the amounts of one CSV file, learning its decimal mark from them.
+
+    Exports write 1,234.56 or 1.234,56 depending on the bank's locale. An
+    amount only one mark can read, like 1234,56 or -4.50, settles the mark
+    for the file; until then one that reads differently under each, like
+    1,234, is rejected rather than guessed.
+    """
+
+    def __init__(self) -> None:
+        self.mark: str | None = None
+
+    def parse(self, raw: str) -> Decimal:
+        readings = _csv_readings(raw)
+        if not readings:
+            raise ValueError(f"invalid amount {raw!r}")
+        if len(readings) == 1:
+            ((mark, value),) = readings.items()
+            if self.mark is None:
+                self.mark = mark
+            elif mark != self.mark:
+                raise ValueError(
+                    f"amount {raw!r} does not use the file's decimal mark {self.mark!r}"
+                )
+            return value
+        if readings["."] == readings[","]:
+            return readings["."]
+        if self.mark is None:
+            raise ValueError(f"amount {raw!r} could be read with either decimal mark")
+        return readings[self.mark]
+
+
+def _csv_header_map(header: list[str]) -> dict[str, int]:
+    normalized = [h.strip().lower() for h in header]
+    mapping: dict[str, int] = {}
+    for field, aliases in _CSV_COLUMNS.items():
+        for alias in aliases:
+            if alias in normalized:
+                mapping[field] = normalized.index(alias)
+                break
+    missing = {"date", "amount"} - mapping.keys()
+    if missing:
+        raise ValueError(f"CSV header is missing {', '.join(sorted(missing))}")
+    return mapping
+
+
+def parse_csv(
+    stream: BinaryIO, date_format: str = "%Y-%m-%d"
+) -> Iterator[StatementRecord]:
+    """Parse a header-first CSV export with at least ``date`` and ``amount`` columns.
+
+    A ``balance`` column yields one StatementBalance per day, taken from the
+    chronologically last row of that day. Exports list rows oldest-first or
+    newest-first, so the first and last balance of each day are both kept and
+    the file's direction decides between them once it has been read.
+
+    The decimal mark is learned from the amounts in the first 8 KiB, so
+    rows near the top that could be read either way are not rejected.
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    try:
+        sample = text.read(_CSV_SAMPLE)
+        text.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+        except csv.Error:
+            dialect = csv.excel
+        reader = csv.reader(text, dialect)
+        header = next(reader, None)
+        if header is None:
+            return
+        columns = _csv_header_map(header)
+
+        def cell(row: list[str], field: str) -> str:
+            index = columns.get(field)
+            return row[index].strip() if index is not None and index < len(row) else ""
+
+        amounts = _CsvAmounts()
+        sample_rows = list(csv.reader(io.StringIO(sample), dialect))[1:]
+        if len(sample) == _CSV_SAMPLE:
+            # The last line may have been cut mid-amount.
+            sample_rows = sample_rows[:-1]
+        for row in sample_rows:
+            for raw in (cell(row, "amount"), cell(row, "balance")):
+                try:
+                    amounts.parse(raw)
+                except ValueError:
+                    pass
+
+        # strptime is several times slower than fromisoformat and dominates
+        # parsing on large files, so the common ISO layout skips it.
+        if date_format == "%Y-%m-%d":
+            parse_day = date.fromisoformat
+        else:
+
+            def parse_day(raw: str) -> date:
+                return datetime.strptime(raw, date_format).date()
+
+        day_balances: dict[date, tuple[Decimal, Decimal]] = {}
+        first_day: date | None = None
+        last_day: date | None = None
+        for line_no, row in enumerate(reader, start=2):
+            if not any(row):
+                continue
+            try:
+                day = parse_day(cell(row, "date"))
+                amount = amounts.parse(cell(row, "amount"))
+                raw_balance = cell(row, "balance")
+                balance = amounts.parse(raw_balance) if raw_balance else None
+            except ValueError as exc:
+                yield RowError(f"line {line_no}", str(exc))
+                continue
+
+            first_day = first_day or day
+            last_day = day
+            if balance is not None:
+                first, _ = day_balances.get(day, (balance, balance))
+                day_balances[day] = (first, balance)
+            yield StatementEntry(
+                date=day,
+                amount=amount,
+                description=cell(row, "description") or None,
+                reference=cell(row, "reference") or None,
+            )
+
+        newest_first = first_day is not None and last_day < first_day
+        for day, (first, last) in sorted(day_balances.items()):
+            yield StatementBalance(date=day, amount=first if newest_first else last)
+    finally:
+        # Leave the caller's stream open; it owns the file.
+        text.detach()
+
+
+# --- OFX ---
+
+_OFX_TOKEN = re.compile(r"<(/?)([A-Za-z0-9.]+)>([^<]*)")
+_OFX_CHUNK = 64 * 1024
+
+
+def _ofx_tokens(stream: BinaryIO) -> Iterator[tuple[bool, str, str]]:
+    """Yield (is_closing, TAG, text) for every tag in an OFX 1.x or 2.x file.
+
+    OFX 1.x is SGML and leaves leaf elements unclosed, so a leaf's value is
+    simply the text up to the next tag; that reading works for the XML flavour
+    too. Only the tail after the last ``<`` is carried between chunks.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    buffer = ""
+    while True:
+        chunk = stream.read(_OFX_CHUNK)
+        buffer += decoder.decode(chunk, final=not chunk)
+        cut = buffer.rfind("<") if chunk else len(buffer)
+        if cut > 0:
+            for match in _OFX_TOKEN.finditer(buffer, 0, cut):
+                yield match.group(1) == "/", match.group(2).upper(), match.group(3)
+            buffer = buffer[cut:]
+        if not chunk:
+            return
+
+
+def _ofx_date(raw: str) -> date:
+    # 20250115, 20250115120000 or 20250115120000.000[-5:EST]
+    return datetime.strptime(raw.strip()[:8], "%Y%m%d").date()
+
+
+def parse_ofx(stream: BinaryIO) -> Iterator[StatementRecord]:
+    currency: str | None = None
+    current: dict[str, str] | None = None
+    aggregate: str | None = None
+    count = 0
+    for closing, tag, raw in _ofx_tokens(stream):
+        value = raw.strip()
+        if tag in ("STMTTRN", "LEDGERBAL"):
+            if not closing:
+                current, aggregate = {}, tag
+                continue
+            if current is None:
+                continue
+            count += 1
+            try:
+                if aggregate == "STMTTRN":
+                    yield StatementEntry(
+                        date=_ofx_date(current["DTPOSTED"]),
+                        amount=_parse_amount(current["TRNAMT"]),
+                        description=current.get("NAME") or current.get("MEMO"),
+                        reference=current.get("FITID"),
+                        currency=currency,
+                    )
+                else:
+                    yield StatementBalance(
+                        date=_ofx_date(current["DTASOF"]),
+                        amount=_parse_amount(current["BALAMT"]),
+                        currency=currency,
+                    )
+            except (KeyError, ValueError) as exc:
+                yield RowError(f"{aggregate.lower()} #{count}", f"invalid: {exc}")
+            current = aggregate = None
+        elif tag == "CURDEF" and not closing:
+            currency = value.upper()
+        elif current is not None and not closing and value:
+            current[tag] = value
+
+
+# --- CAMT.053 ---
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _find(elem: ET.Element, *path: str) -> ET.Element | None:
+    """Walk ``path`` by local element name, ignoring the ISO 20022 namespace."""
+    for name in path:
+        elem = next((child for child in elem if _local(child.tag) == name), None)
+        if elem is None:
+            return None
+    return elem
+
+
+def _text(elem: ET.Element, *path: str) -> str | None:
+    found = _find(elem, *path)
+    return found.text.strip() if found is not None and found.text else None
+
+
+def _camt_amount(elem: ET.Element) -> tuple[Decimal, str | None]:
+    amt = _find(elem, "Amt")
+    if amt is None or not amt.text:
+        raise ValueError("missing Amt")
+    amount = _parse_amount(amt.text)
+    if _text(elem, "CdtDbtInd") == "DBIT":
+        amount = -amount
+    return amount, amt.get("Ccy")
+
+
+def _camt_date(elem: ET.Element, *names: str) -> date:
+    """The first of ``names`` present, as a date; entries fall back BookgDt -> ValDt."""
+    for name in names:
+        raw = _text(elem, name, "Dt") or _text(elem, name, "DtTm")
+        if raw:
+            return date.fromisoformat(raw[:10])
+    raise ValueError(f"missing {names[0]}")
+
+
+def parse_camt053(stream: BinaryIO) -> Iterator[StatementRecord]:
+    """Parse an ISO 20022 camt.053 statement, one ``Ntry`` at a time.
+
+    Every finished entry and balance is detached from its parent once read,
+    so the tree never holds more than the element being parsed.
+    """
+    parents: list[ET.Element] = []
+    count = 0
+    for event, elem in ET.iterparse(stream, events=("start", "end")):
+        if event == "start":
+            parents.append(elem)
+            continue
+        parents.pop()
+        name = _local(elem.tag)
+        if name not in ("Ntry", "Bal"):
+            continue
+        count += 1
+        try:
+            amount, currency = _camt_amount(elem)
+            if name == "Ntry":
+                yield StatementEntry(
+                    date=_camt_date(elem, "BookgDt", "ValDt"),
+                    amount=amount,
+                    description=_text(elem, "NtryDtls", "TxDtls", "RmtInf", "Ustrd")
+                    or _text(elem, "AddtlNtryInf"),
+                    reference=_text(elem, "AcctSvcrRef") or _text(elem, "NtryRef"),
+                    currency=currency,
+                )
+            elif _text(elem, "Tp", "CdOrPrtry", "Cd") == "CLBD":
+                yield StatementBalance(
+                    date=_camt_date(elem, "Dt"), amount=amount, currency=currency
+                )
+        except ValueError as exc:
+            yield RowError(f"{name} #{count}", str(exc))
+        if parents:
+            parents[-1].remove(elem)
+
+
+def parse_statement(
+    stream: BinaryIO, fmt: StatementFormat, date_format: str = "%Y-%m-%d"
+) -> Iterator[StatementRecord]:
+    if fmt == StatementFormat.csv:
+        return parse_csv(stream, date_format)
+    if fmt == StatementFormat.ofx:
+        return parse_ofx(stream)
+    return parse_camt053(stream)
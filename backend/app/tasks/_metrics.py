@@ -0,0 +1,87 @@
+"""Prometheus metrics for the Celery workers.
+
+worker_init starts an HTTP exporter on CELERY_METRICS_PORT. With the solo
+pool, tasks run in that same process and the default registry has everything.
+A prefork pool runs tasks in child processes, so their samples only reach the
+exporter through prometheus_client's multiprocess mode, enabled by setting
+PROMETHEUS_MULTIPROC_DIR.
+"""
+
+import logging
+import os
+import shutil
+import time
+
+from celery.signals import (
+    task_postrun,
+    task_prerun,
+    worker_init,
+    worker_process_shutdown,
+)
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    multiprocess,
+    start_http_server,
+)
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+TASK_DURATION = Histogram(
+    "wallet_celery_task_duration_seconds",
+    "Wall time of a Celery task run, by task name and final state.",
+    ["task", "state"],
+    buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800),
+)
+RATE_SYNC_ROWS = Counter(
+    "wallet_rate_sync_rows_total",
+    "Exchange rates upserted by the rate sync tasks.",
+    ["source"],
+)
+RATE_SYNC_UPSERT_SECONDS = Histogram(
+    "wallet_rate_sync_upsert_seconds",
+    "Time to upsert one rate sync batch.",
+    ["source"],
+)
+
+_started: dict[str, float] = {}
+
+
+@task_prerun.connect
+def _task_started(task_id: str, **_) -> None:
+    _started[task_id] = time.perf_counter()
+
+
+@task_postrun.connect
+def _task_finished(task_id: str, task, state: str | None = None, **_) -> None:
+    started = _started.pop(task_id, None)
+    if started is not None:
+        TASK_DURATION.labels(task.name, state or "UNKNOWN").observe(
+            time.perf_counter() - started
+        )
+
+
+@worker_init.connect
+def _start_exporter(**_) -> None:
+    if not settings.CELERY_METRICS_PORT:
+        return
+    registry = REGISTRY
+    multiproc_dir = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if multiproc_dir:
+        # Files left by a previous run would be summed into this one's.
+        shutil.rmtree(multiproc_dir, ignore_errors=True)
+        os.makedirs(multiproc_dir)
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    start_http_server(settings.CELERY_METRICS_PORT, registry=registry)
+    logger.info("Serving metrics on port %d", settings.CELERY_METRICS_PORT)
+
+
+@worker_process_shutdown.connect
+def _process_shutdown(pid: int, **_) -> None:
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(pid)
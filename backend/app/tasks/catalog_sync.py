@@ -5,7 +5,6 @@ import math
 from datetime import datetime, timezone
 
 import httpx
-from babel.numbers import get_currency_symbol
 from celery import shared_task
 from sqlalchemy import text
 from sqlalchemy.dialects.postgresql import insert as pg_insert
@@ -125,6 +124,10 @@ async def _async_sync_fiat_catalog() -> None:
             "ExchangeRate-API: unexpected response shape, missing supported_codes"
         )
 
+    # Deferred: only this daily task needs babel's locale data, and every
+    # worker process imports this module at startup.
+    from babel.numbers import get_currency_symbol
+
     rows = []
     for entry in currencies:
         if not isinstance(entry, (list, tuple)) or len(entry) < 2:
@@ -15,6 +15,7 @@ from app.core.config import settings
 from app.models.exchange_rate import ExchangeRate
 from app.tasks._engine import get_engine
 from app.tasks._http import NonRetryableHTTPError, RateLimitError, check_response
+from app.tasks._metrics import RATE_SYNC_ROWS, RATE_SYNC_UPSERT_SECONDS
 
 logger = logging.getLogger(__name__)
 
@@ -130,8 +131,10 @@ async def _async_refresh_fiat_rates() -> None:
                     "fetched_at": stmt.excluded.fetched_at,
                 },
             )
-            await db.execute(stmt)
-            await db.commit()
+            with RATE_SYNC_UPSERT_SECONDS.labels(source).time():
+                await db.execute(stmt)
+                await db.commit()
+            RATE_SYNC_ROWS.labels(source).inc(len(rows))
             logger.info("Fiat rates sync: upserted %d rates for %s", len(rows), today)
         except Exception:
             await db.rollback()
@@ -261,8 +264,10 @@ async def _async_refresh_crypto_rates() -> None:
                     "fetched_at": stmt.excluded.fetched_at,
                 },
             )
-            await db.execute(stmt)
-            await db.commit()
+            with RATE_SYNC_UPSERT_SECONDS.labels(source).time():
+                await db.execute(stmt)
+                await db.commit()
+            RATE_SYNC_ROWS.labels(source).inc(len(rows))
             logger.info("Crypto rates sync: upserted %d rates for %s", len(rows), today)
         except Exception:
             await db.rollback()
@@ -0,0 +1,138 @@
+import asyncio
+import json
+import logging
+from dataclasses import asdict
+from pathlib import Path
+
+import redis.asyncio as aioredis
+from celery import shared_task
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models import Currency, StorageAccount
+from app.services.statement_import import (
+    ImportStats,
+    ImportTarget,
+    StatementFormat,
+    load_statement,
+    parse_statement,
+)
+from app.tasks._engine import get_engine
+
+logger = logging.getLogger(__name__)
+
+IMPORT_STATUS_TTL = 24 * 3600
+
+
+def import_status_key(job_id: str) -> str:
+    return f"import:{job_id}"
+
+
+async def _set_status(
+    r: aioredis.Redis,
+    job_id: str,
+    user_id: int,
+    status: str,
+    stats: ImportStats | None = None,
+    error: str | None = None,
+) -> None:
+    payload: dict = {"status": status, "user_id": user_id}
+    if stats is not None:
+        payload.update(asdict(stats))
+    if error is not None:
+        payload["error"] = error
+    await r.set(import_status_key(job_id), json.dumps(payload), ex=IMPORT_STATUS_TTL)
+
+
+@shared_task(
+    queue="imports",
+    name="app.tasks.statement_import.import_statement",
+)
+def import_statement(
+    job_id: str,
+    user_id: int,
+    storage_account_id: int,
+    income_source_id: int | None,
+    fmt: str,
+    path: str,
+    date_format: str = "%Y-%m-%d",
+):
+    """Import an uploaded statement file, then delete it."""
+    try:
+        asyncio.run(
+            _async_import_statement(
+                job_id,
+                user_id,
+                storage_account_id,
+                income_source_id,
+                StatementFormat(fmt),
+                Path(path),
+                date_format,
+            )
+        )
+    finally:
+        Path(path).unlink(missing_ok=True)
+
+
+async def _async_import_statement(
+    job_id: str,
+    user_id: int,
+    storage_account_id: int,
+    income_source_id: int | None,
+    fmt: StatementFormat,
+    path: Path,
+    date_format: str,
+) -> None:
+    """Commit after every chunk so a huge file never holds one long transaction.
+
+    A failure part-way leaves the chunks already committed in place; running
+    the same file again is safe because their content hashes are now present.
+    """
+    r = aioredis.from_url(settings.REDIS_URL)
+    stats: ImportStats | None = None
+    try:
+        async with AsyncSession(get_engine()) as db:
+            row = (
+                await db.execute(
+                    select(StorageAccount.currency_id, Currency.code)
+                    .join(Currency, StorageAccount.currency_id == Currency.id)
+                    .where(
+                        StorageAccount.id == storage_account_id,
+                        StorageAccount.user_id == user_id,
+                    )
+                )
+            ).one_or_none()
+            if row is None:
+                await _set_status(
+                    r, job_id, user_id, "failed", error="Storage account not found"
+                )
+                return
+            target = ImportTarget(
+                user_id=user_id,
+                storage_account_id=storage_account_id,
+                currency_id=row.currency_id,
+                currency_code=row.code,
+                income_source_id=income_source_id,
+            )
+
+            await _set_status(r, job_id, user_id, "running")
+            with path.open("rb") as stream:
+                records = parse_statement(stream, fmt, date_format)
+                async for stats in load_statement(db, target, records):
+                    await db.commit()
+                    await _set_status(r, job_id, user_id, "running", stats)
+
+        await _set_status(r, job_id, user_id, "ready", stats)
+        logger.info(
+            "Statement import %s: %d imported, %d duplicates, %d snapshots",
+            job_id,
+            stats.imported,
+            stats.duplicates,
+            stats.snapshots,
+        )
+    except Exception as exc:
+        logger.exception("Statement import %s failed", job_id)
+        await _set_status(r, job_id, user_id, "failed", stats, error=str(exc)[:500])
+    finally:
+        await r.aclose()
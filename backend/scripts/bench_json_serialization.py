@@ -0,0 +1,101 @@
+"""
+Serialization time for a 20-year monthly analytics summary.
+
+Builds a /analytics/summary payload of 240 monthly rows across several
+currencies, shaped exactly as get_summary returns it, and times rendering
+it the way FastAPI did before (jsonable_encoder, then JSONResponse) against
+returning a DecimalJSONResponse directly.
+
+Run from /backend:
+    uv run python scripts/bench_json_serialization.py [--years 20] [--currencies 5]
+"""
+
+import argparse
+import random
+import statistics
+import time
+from datetime import date
+from decimal import Decimal
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.core.responses import DecimalJSONResponse
+from app.services.analytics.metrics import PeriodMetrics
+
+CODES = ["USD", "EUR", "GBP", "JPY", "CHF", "BTC", "ETH", "PLN", "CZK", "SEK"]
+
+
+def _amount(rng: random.Random) -> Decimal:
+    return Decimal(rng.randint(-(10**10), 10**10)).scaleb(-2)
+
+
+def _payload(years: int, currencies: int) -> dict:
+    rng = random.Random(0)
+    codes = CODES[:currencies]
+    rows = []
+    for month in range(years * 12):
+        start = date(2000 + month // 12, month % 12 + 1, 1)
+        metrics = PeriodMetrics(
+            period_start=start,
+            period_end=start,
+            income=_amount(rng),
+            profit=_amount(rng),
+            derived_expense=_amount(rng),
+            balances={c: _amount(rng) for c in codes},
+            balance_change={c: _amount(rng) for c in codes},
+            opening_capital={c: _amount(rng) for c in codes},
+            income_by_currency={c: _amount(rng) for c in codes},
+            is_bootstrap=month == 0,
+            is_measured=True,
+            converted_balance=_amount(rng),
+            conversion_missing=[],
+        )
+        row = metrics.as_row(include_converted=True)
+        row.update(
+            avg_income=_amount(rng), avg_profit=_amount(rng), avg_expense=_amount(rng)
+        )
+        rows.append(row)
+    return {"periods": rows, "stats": None, "rate_coverage": None}
+
+
+def _time(render, payload: dict, repeat: int) -> list[float]:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        render(payload)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def main(years: int, currencies: int, repeat: int) -> None:
+    payload = _payload(years, currencies)
+    before = JSONResponse(jsonable_encoder(payload)).body
+    after = DecimalJSONResponse(payload).body
+    print(f"{len(payload['periods'])} rows, {len(after) / 1024:.0f} KiB")
+
+    results = {
+        "jsonable_encoder": _time(
+            lambda p: JSONResponse(jsonable_encoder(p)), payload, repeat
+        ),
+        "orjson": _time(DecimalJSONResponse, payload, repeat),
+    }
+    for label, timings in results.items():
+        ms = sorted(t * 1000 for t in timings)
+        print(
+            f"{label:<17} median {statistics.median(ms):7.2f} ms  "
+            f"min {ms[0]:7.2f} ms  max {ms[-1]:7.2f} ms"
+        )
+    speedup = statistics.median(results["jsonable_encoder"]) / statistics.median(
+        results["orjson"]
+    )
+    print(f"speedup {speedup:.1f}x; bodies {len(before)} vs {len(after)} bytes")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--years", type=int, default=20)
+    parser.add_argument("--currencies", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    main(args.years, args.currencies, args.repeat)
@@ -0,0 +1,77 @@
+"""
+Event-loop latency under a burst of concurrent logins.
+
+Runs a ticker that should wake every 5 ms alongside N simultaneous password
+checks, first with bcrypt called inline (as the endpoints used to) and then
+through the hashing pool, and reports how late the ticker woke. Inline
+hashing holds the loop for the whole burst; the pool keeps it responsive.
+
+Run from /backend:
+    uv run python scripts/bench_password_hashing.py [--logins 32] [--rounds 12]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from app.core.config import settings
+from app.core.security import (
+    hash_password,
+    password_hash_stats,
+    verify_password,
+    verify_password_async,
+)
+
+TICK = 0.005
+
+
+async def _ticker(lags: list[float], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(TICK)
+        lags.append(time.perf_counter() - started - TICK)
+
+
+async def _inline_login(password: str, hashed: str) -> bool:
+    return verify_password(password, hashed)
+
+
+async def _run(label: str, login, logins: int, hashed: str) -> None:
+    lags: list[float] = []
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(_ticker(lags, stop))
+    await asyncio.sleep(TICK * 4)
+    started = time.perf_counter()
+    await asyncio.gather(*(login("benchmark", hashed) for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await ticker
+
+    lags_ms = sorted(lag * 1000 for lag in lags)
+    p99 = lags_ms[min(len(lags_ms) - 1, int(len(lags_ms) * 0.99))]
+    print(
+        f"{label:<8} {logins} logins in {elapsed:6.2f}s  "
+        f"loop lag p50 {statistics.median(lags_ms):7.1f} ms  "
+        f"p99 {p99:7.1f} ms  max {lags_ms[-1]:7.1f} ms"
+    )
+
+
+async def main(logins: int) -> None:
+    hashed = hash_password("benchmark")
+    await _run("inline", _inline_login, logins, hashed)
+    await _run("pool", verify_password_async, logins, hashed)
+    print(
+        f"pool: {settings.PASSWORD_HASH_WORKERS} workers, "
+        f"deepest queue {password_hash_stats.max_waiting}, "
+        f"mean wait {password_hash_stats.wait_seconds_total / logins * 1000:.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--logins", type=int, default=32)
+    parser.add_argument("--rounds", type=int, default=settings.BCRYPT_ROUNDS)
+    args = parser.parse_args()
+    settings.BCRYPT_ROUNDS = args.rounds
+    asyncio.run(main(args.logins))
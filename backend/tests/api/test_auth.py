@@ -119,3 +119,103 @@ async def test_me_authenticated(auth_client, test_user):
 async def test_me_unauthenticated(client):
     resp = await client.get("/api/auth/me")
     assert resp.status_code == 401
+
+
+async def test_cached_user_needs_no_query(auth_client, db_session):
+    from sqlalchemy import event
+
+    assert (await auth_client.get("/api/auth/me")).status_code == 200
+
+    conn = await db_session.connection()
+    statements = []
+
+    def on_execute(_conn, _cursor, statement, *_):
+        statements.append(statement)
+
+    event.listen(conn.sync_connection, "before_cursor_execute", on_execute)
+    try:
+        resp = await auth_client.get("/api/auth/me")
+    finally:
+        event.remove(conn.sync_connection, "before_cursor_execute", on_execute)
+    assert resp.status_code == 200
+    assert resp.json()["email"] == "test@wallet.app"
+    assert statements == []
+
+
+async def test_profile_changes_invalidate_cached_user(auth_client):
+    await auth_client.get("/api/auth/me")
+
+    resp = await auth_client.patch(
+        "/api/auth/me/preferences", json={"base_currency_code": "EUR"}
+    )
+    assert resp.status_code == 200
+    await auth_client.post("/api/auth/me/complete-onboarding")
+    resp = await auth_client.patch(
+        "/api/auth/me/email",
+        json={"new_email": "moved@wallet.app", "current_password": "Test1234"},
+    )
+    assert resp.status_code == 200
+
+    data = (await auth_client.get("/api/auth/me")).json()
+    assert data["email"] == "moved@wallet.app"
+    assert data["base_currency_code"] == "EUR"
+    assert data["onboarding_completed"] is True
+
+
+async def test_password_change_retires_old_access_tokens(auth_client):
+    old_token = auth_client.cookies["access_token"]
+    await auth_client.get("/api/auth/me")
+
+    resp = await auth_client.patch(
+        "/api/auth/me/password",
+        json={"current_password": "Test1234", "new_password": "Changed123"},
+    )
+    assert resp.status_code == 204
+    # This session was handed a fresh token and carries on.
+    new_token = resp.cookies["access_token"]
+    assert new_token != old_token
+    auth_client.cookies.clear()
+    auth_client.cookies.set("access_token", new_token)
+    assert (await auth_client.get("/api/auth/me")).status_code == 200
+
+    auth_client.cookies.set("access_token", old_token)
+    resp = await auth_client.get("/api/auth/me")
+    assert resp.status_code == 401
+    assert resp.json()["code"] == "auth/invalid_token"
+
+
+async def test_cached_user_is_checked_against_stored_password(auth_client):
+    await auth_client.get("/api/auth/me")
+
+    resp = await auth_client.patch(
+        "/api/auth/me/password",
+        json={"current_password": "Wrong1234", "new_password": "Changed123"},
+    )
+    assert resp.status_code == 401
+    resp = await auth_client.patch(
+        "/api/auth/me/email",
+        json={"new_email": "moved@wallet.app", "current_password": "Wrong1234"},
+    )
+    assert resp.status_code == 401
+
+
+async def test_login_rehashes_at_the_configured_cost(
+    client, test_user, db_session, monkeypatch
+):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS", settings.BCRYPT_ROUNDS + 1)
+    resp = await client.post(
+        "/api/auth/login",
+        json={"email": "test@wallet.app", "password": "Test1234"},
+    )
+    assert resp.status_code == 200
+    await db_session.refresh(test_user)
+    assert test_user.password_hash.startswith(f"$2b${settings.BCRYPT_ROUNDS:02d}$")
+
+    # The upgraded hash still logs the user in.
+    resp = await client.post(
+        "/api/auth/login",
+        json={"email": "test@wallet.app", "password": "Test1234"},
+    )
+    assert resp.status_code == 200
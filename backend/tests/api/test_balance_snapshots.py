@@ -1,3 +1,6 @@
+import json
+
+
 async def test_create(auth_client, ref_data):
     resp = await auth_client.post(
         "/api/balance-snapshots/",
@@ -215,3 +218,172 @@ async def test_filter_by_date_range(auth_client, ref_data):
 async def test_delete_nonexistent(auth_client):
     resp = await auth_client.delete("/api/balance-snapshots/99999")
     assert resp.status_code == 404
+
+
+async def test_cursor_pagination(auth_client, ref_data):
+    for day in ("2025-01-31", "2025-02-28", "2025-03-31", "2025-04-30"):
+        await auth_client.post(
+            "/api/balance-snapshots/",
+            json={
+                "storage_account_id": ref_data["account"].id,
+                "date": day,
+                "amount": "100.00",
+            },
+        )
+
+    full = await auth_client.get("/api/balance-snapshots/")
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 3}
+        if cursor:
+            params["cursor"] = cursor
+        resp = await auth_client.get("/api/balance-snapshots/", params=params)
+        seen.extend(s["id"] for s in resp.json())
+        cursor = resp.headers.get("x-next-cursor")
+        if not cursor:
+            break
+    assert seen == [s["id"] for s in full.json()]
+
+
+async def test_export(auth_client, ref_data):
+    for day in ("2025-01-31", "2025-02-28", "2025-03-31"):
+        await auth_client.post(
+            "/api/balance-snapshots/",
+            json={
+                "storage_account_id": ref_data["account"].id,
+                "date": day,
+                "amount": "100.00",
+            },
+        )
+
+    resp = await auth_client.get(
+        "/api/balance-snapshots/export",
+        params={"format": "csv", "date_to": "2025-02-28"},
+    )
+    assert resp.status_code == 200
+    header, *rows = resp.text.splitlines()
+    assert header == "id,storage_account_id,date,amount"
+    assert [row.split(",")[2] for row in rows] == ["2025-02-28", "2025-01-31"]
+
+    ndjson = await auth_client.get("/api/balance-snapshots/export")
+    listed = (await auth_client.get("/api/balance-snapshots/")).json()
+    assert [json.loads(line) for line in ndjson.text.splitlines()] == listed
+
+
+async def _second_account(db_session, test_user):
+    from app.models import Currency, StorageAccount, StorageLocation
+
+    cur = Currency(code="EUR", symbol="€", user_id=test_user.id)
+    loc = StorageLocation(name="Broker", user_id=test_user.id)
+    db_session.add_all([cur, loc])
+    await db_session.flush()
+    acc = StorageAccount(
+        storage_location_id=loc.id, currency_id=cur.id, user_id=test_user.id
+    )
+    db_session.add(acc)
+    await db_session.flush()
+    return acc
+
+
+async def test_same_day_snapshot_replaces_the_earlier_one(auth_client, ref_data):
+    body = {
+        "storage_account_id": ref_data["account"].id,
+        "date": "2025-05-31",
+        "amount": "100.00",
+    }
+    first = await auth_client.post("/api/balance-snapshots/", json=body)
+    assert first.status_code == 201
+    resp = await auth_client.post(
+        "/api/balance-snapshots/", json={**body, "amount": "120.00"}
+    )
+    assert resp.status_code == 201
+    assert resp.json()["id"] == first.json()["id"]
+    assert float(resp.json()["amount"]) == 120.0
+    listed = (await auth_client.get("/api/balance-snapshots/")).json()
+    assert [float(s["amount"]) for s in listed] == [120.0]
+
+
+async def test_batch_records_every_account(
+    auth_client, ref_data, db_session, test_user
+):
+    acc2 = await _second_account(db_session, test_user)
+    # An earlier balance is carried forward for accounts not in the batch.
+    await auth_client.post(
+        "/api/balance-snapshots/",
+        json={
+            "storage_account_id": ref_data["account"].id,
+            "date": "2025-05-31",
+            "amount": "50.00",
+        },
+    )
+
+    resp = await auth_client.post(
+        "/api/balance-snapshots/batch",
+        json={
+            "date": "2025-06-30",
+            "balances": [{"storage_account_id": acc2.id, "amount": "200.00"}],
+        },
+    )
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["totals"] == {"USD": 50.0, "EUR": 200.0}
+    assert {a["account_id"]: a["latest_snapshot_date"] for a in data["accounts"]} == {
+        ref_data["account"].id: "2025-05-31",
+        acc2.id: "2025-06-30",
+    }
+
+
+async def test_batch_replaces_same_day_balances(auth_client, ref_data):
+    account_id = ref_data["account"].id
+    for amount in ("100.00", "120.00"):
+        resp = await auth_client.post(
+            "/api/balance-snapshots/batch",
+            json={
+                "date": "2025-06-30",
+                "balances": [{"storage_account_id": account_id, "amount": amount}],
+            },
+        )
+        assert resp.status_code == 200
+
+    assert resp.json()["totals"] == {"USD": 120.0}
+    listed = (await auth_client.get("/api/balance-snapshots/")).json()
+    assert [float(s["amount"]) for s in listed] == [120.0]
+
+
+async def test_batch_rejects_foreign_account(
+    auth_client, ref_data, other_user, db_session
+):
+    from app.models import Currency, StorageAccount, StorageLocation
+
+    cur = Currency(code="USD", symbol="$", user_id=other_user.id)
+    loc = StorageLocation(name="Theirs", user_id=other_user.id)
+    db_session.add_all([cur, loc])
+    await db_session.flush()
+    foreign = StorageAccount(
+        storage_location_id=loc.id, currency_id=cur.id, user_id=other_user.id
+    )
+    db_session.add(foreign)
+    await db_session.flush()
+
+    resp = await auth_client.post(
+        "/api/balance-snapshots/batch",
+        json={
+            "date": "2025-06-30",
+            "balances": [
+                {"storage_account_id": ref_data["account"].id, "amount": "1.00"},
+                {"storage_account_id": foreign.id, "amount": "1.00"},
+            ],
+        },
+    )
+    assert resp.status_code == 404
+    assert resp.json()["code"] == "resource/storage_account_not_found"
+    assert (await auth_client.get("/api/balance-snapshots/")).json() == []
+
+
+async def test_batch_rejects_repeated_account(auth_client, ref_data):
+    item = {"storage_account_id": ref_data["account"].id, "amount": "1.00"}
+    resp = await auth_client.post(
+        "/api/balance-snapshots/batch",
+        json={"date": "2025-06-30", "balances": [item, item]},
+    )
+    assert resp.status_code == 422
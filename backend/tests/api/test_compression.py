@@ -0,0 +1,88 @@
+import gzip
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.api import _compression
+from app.api._compression import negotiate_encoding
+from app.models import IncomeSource
+
+
+@pytest.fixture()
+async def many_sources(db_session, test_user):
+    db_session.add_all(
+        IncomeSource(name=f"Income source number {i}", user_id=test_user.id)
+        for i in range(40)
+    )
+    await db_session.flush()
+
+
+def _ratio_count() -> float:
+    return (
+        REGISTRY.get_sample_value(
+            "wallet_http_compression_ratio_count", {"encoding": "gzip"}
+        )
+        or 0
+    )
+
+
+async def test_large_list_is_gzipped(auth_client, many_sources):
+    before = _ratio_count()
+
+    plain = await auth_client.get(
+        "/api/income-sources/", headers={"Accept-Encoding": "identity"}
+    )
+    gzipped = await auth_client.get(
+        "/api/income-sources/", headers={"Accept-Encoding": "gzip"}
+    )
+
+    assert "content-encoding" not in plain.headers
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert int(gzipped.headers["content-length"]) < len(plain.content)
+    assert gzipped.headers["vary"] == "Accept-Encoding"
+    assert plain.headers["vary"] == "Accept-Encoding"
+    assert gzipped.json() == plain.json()
+    assert _ratio_count() == before + 1
+
+
+async def test_large_body_is_compressed_off_the_loop(
+    auth_client, many_sources, monkeypatch
+):
+    offloaded = []
+
+    async def run_in_threadpool(func, *args):
+        offloaded.append(len(args[0]))
+        return func(*args)
+
+    monkeypatch.setattr(_compression, "OFFLOAD_SIZE", 1024)
+    monkeypatch.setattr(_compression, "run_in_threadpool", run_in_threadpool)
+
+    resp = await auth_client.get(
+        "/api/income-sources/", headers={"Accept-Encoding": "gzip"}
+    )
+    assert resp.headers["content-encoding"] == "gzip"
+    assert offloaded
+
+
+async def test_small_response_is_sent_as_is(auth_client):
+    resp = await auth_client.get(
+        "/api/income-sources/", headers={"Accept-Encoding": "gzip"}
+    )
+    assert "content-encoding" not in resp.headers
+    assert "vary" not in resp.headers
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        ("gzip, deflate", "gzip"),
+        ("deflate", None),
+        ("gzip;q=0", None),
+        ("identity, *;q=0.5", "gzip"),
+        ("", None),
+    ],
+)
+def test_negotiate_encoding(header, expected, monkeypatch):
+    # Pinned, so the result does not depend on brotli being installed.
+    monkeypatch.setattr(_compression, "_ENCODERS", {"gzip": gzip.compress})
+    assert negotiate_encoding(header) == expected
@@ -0,0 +1,100 @@
+import json
+import uuid
+
+import pytest
+from app.api import imports
+from app.core.dependencies import get_redis
+from app.main import app
+from app.tasks.statement_import import import_status_key
+
+CSV = b"date,amount,description\n2025-02-01,5,Tip\n"
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+
+
+@pytest.fixture()
+def fake_redis(auth_client):
+    r = _FakeRedis()
+    app.dependency_overrides[get_redis] = lambda: r
+    return r
+
+
+@pytest.fixture()
+def queued(monkeypatch, tmp_path):
+    """Uploads land in tmp_path; the tasks they would queue are recorded."""
+    jobs = []
+    monkeypatch.setattr(imports.settings, "IMPORTS_DIR", str(tmp_path))
+    monkeypatch.setattr(
+        imports.import_statement, "delay", lambda *args: jobs.append(args)
+    )
+    return jobs
+
+
+async def _upload(client, account_id, data=CSV, **form):
+    return await client.post(
+        "/api/imports/",
+        data={"storage_account_id": account_id, "format": "csv", **form},
+        files={"file": ("statement.csv", data, "text/csv")},
+    )
+
+
+async def test_upload_is_saved_and_queued(
+    auth_client, fake_redis, queued, ref_data, test_user, tmp_path
+):
+    account_id = ref_data["account"].id
+    resp = await _upload(auth_client, account_id)
+
+    assert resp.status_code == 202
+    job_id = resp.json()["job_id"]
+    path = tmp_path / f"{job_id}.csv"
+    assert path.read_bytes() == CSV
+    assert queued == [
+        (job_id, test_user.id, account_id, None, "csv", str(path), "%Y-%m-%d")
+    ]
+    status = await auth_client.get(f"/api/imports/{job_id}")
+    assert status.json() == {"status": "pending"}
+
+
+async def test_oversized_upload_is_refused(
+    auth_client, fake_redis, queued, ref_data, tmp_path, monkeypatch
+):
+    monkeypatch.setattr(imports.settings, "IMPORT_MAX_UPLOAD_BYTES", len(CSV) - 1)
+    resp = await _upload(auth_client, ref_data["account"].id)
+
+    assert resp.status_code == 413
+    assert queued == []
+    assert list(tmp_path.iterdir()) == []
+    assert fake_redis.data == {}
+
+
+async def test_upload_into_another_users_account_is_404(
+    other_auth_client, fake_redis, queued, ref_data
+):
+    resp = await _upload(other_auth_client, ref_data["account"].id)
+
+    assert resp.status_code == 404
+    assert queued == []
+
+
+async def test_status_of_unknown_job_is_404(auth_client, fake_redis):
+    resp = await auth_client.get(f"/api/imports/{uuid.uuid4()}")
+    assert resp.status_code == 404
+
+
+async def test_status_is_only_shown_to_its_owner(auth_client, fake_redis, other_user):
+    job_id = str(uuid.uuid4())
+    fake_redis.data[import_status_key(job_id)] = json.dumps(
+        {"status": "ready", "user_id": other_user.id, "imported": 1}
+    )
+
+    resp = await auth_client.get(f"/api/imports/{job_id}")
+    assert resp.status_code == 403
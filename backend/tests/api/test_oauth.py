@@ -1,12 +1,45 @@
+import asyncio
+import json
 from unittest.mock import AsyncMock, patch
 
+import httpx
+import pytest
 from httpx import AsyncClient
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.dependencies import get_http_client
+from app.main import app
 from app.models.user import User
 
 
+class _Provider:
+    """Canned provider responses, served through httpx's mock transport."""
+
+    def __init__(self):
+        self.routes: dict[tuple[str, str], httpx.Response] = {}
+        self.requests: list[httpx.Request] = []
+        # Requests to these paths are only answered once all of them arrived.
+        self.hold: dict[str, asyncio.Event] = {}
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        url = str(request.url.copy_with(query=None))
+        if request.url.path in self.hold:
+            self.hold[request.url.path].set()
+            for event in self.hold.values():
+                await asyncio.wait_for(event.wait(), timeout=1)
+        return self.routes.get((request.method, url), httpx.Response(404))
+
+
+@pytest.fixture()
+async def provider(client: AsyncClient):
+    mock = _Provider()
+    async with httpx.AsyncClient(transport=httpx.MockTransport(mock)) as http:
+        app.dependency_overrides[get_http_client] = lambda: http
+        yield mock
+
+
 async def test_github_login_redirects(client: AsyncClient):
     resp = await client.get("/api/auth/github", follow_redirects=False)
 
@@ -16,7 +49,7 @@ async def test_github_login_redirects(client: AsyncClient):
 
 
 async def test_github_callback_creates_new_user_and_sets_cookies(
-    client: AsyncClient, db_session: AsyncSession
+    client: AsyncClient, db_session: AsyncSession, provider
 ):
     github_profile = {"id": 12345, "email": "gh@example.com", "login": "ghuser"}
 
@@ -47,7 +80,7 @@ async def test_github_callback_creates_new_user_and_sets_cookies(
 
 
 async def test_github_callback_returns_tokens_for_existing_github_user(
-    client: AsyncClient, db_session: AsyncSession
+    client: AsyncClient, db_session: AsyncSession, provider
 ):
     existing = User(
         email="gh-existing@example.com",
@@ -86,7 +119,7 @@ async def test_github_callback_returns_tokens_for_existing_github_user(
 
 
 async def test_github_callback_returns_error_when_code_exchange_fails(
-    client: AsyncClient,
+    client: AsyncClient, provider
 ):
     client.cookies.set("oauth_state", "xyz")
     with patch(
@@ -108,7 +141,7 @@ async def test_github_callback_returns_error_when_code_exchange_fails(
 
 
 async def test_github_callback_refuses_to_link_existing_email(
-    client: AsyncClient, db_session: AsyncSession
+    client: AsyncClient, db_session: AsyncSession, provider
 ):
     """A GitHub identity must not attach itself to an account it does not own."""
     existing = User(email="victim@example.com", password_hash="hashed")
@@ -145,7 +178,7 @@ async def test_google_login_redirects(client: AsyncClient):
 
 
 async def test_google_callback_creates_new_user_and_sets_cookies(
-    client: AsyncClient, db_session: AsyncSession
+    client: AsyncClient, db_session: AsyncSession, provider
 ):
     google_profile = {"sub": "g-sub-123", "email": "goo@example.com"}
 
@@ -174,7 +207,7 @@ async def test_google_callback_creates_new_user_and_sets_cookies(
 
 
 async def test_google_callback_returns_tokens_for_existing_google_user(
-    client: AsyncClient, db_session: AsyncSession
+    client: AsyncClient, db_session: AsyncSession, provider
 ):
     existing = User(
         email="goo-existing@example.com",
@@ -211,7 +244,7 @@ async def test_google_callback_returns_tokens_for_existing_google_user(
 
 
 async def test_google_callback_returns_error_when_code_exchange_fails(
-    client: AsyncClient,
+    client: AsyncClient, provider
 ):
     client.cookies.set("oauth_state", "xyz")
     with patch(
@@ -231,7 +264,7 @@ async def test_google_callback_returns_error_when_code_exchange_fails(
 
 
 async def test_google_callback_refuses_to_link_existing_email(
-    client: AsyncClient, db_session: AsyncSession
+    client: AsyncClient, db_session: AsyncSession, provider
 ):
     """A Google identity must not attach itself to an account it does not own."""
     existing = User(email="victim-goo@example.com", password_hash="hashed")
@@ -257,3 +290,70 @@ async def test_google_callback_refuses_to_link_existing_email(
 
     await db_session.refresh(existing)
     assert existing.google_sub is None
+
+
+def _json(data) -> httpx.Response:
+    return httpx.Response(200, content=json.dumps(data).encode())
+
+
+async def test_github_exchange_fetches_profile_and_emails_together(
+    client: AsyncClient, db_session: AsyncSession, provider
+):
+    provider.routes = {
+        ("POST", "https://github.com/login/oauth/access_token"): _json(
+            {"access_token": "gh-token"}
+        ),
+        ("GET", "https://api.github.com/user"): _json(
+            {"id": 777, "email": None, "login": "private"}
+        ),
+        ("GET", "https://api.github.com/user/emails"): _json(
+            [
+                {"email": "old@example.com", "primary": False, "verified": True},
+                {"email": "main@example.com", "primary": True, "verified": True},
+            ]
+        ),
+    }
+    # Each lookup waits for the other to arrive: run one after the other,
+    # the first would time out.
+    provider.hold = {"/user": asyncio.Event(), "/user/emails": asyncio.Event()}
+
+    client.cookies.set("oauth_state", "xyz")
+    resp = await client.get(
+        "/api/auth/github/callback",
+        params={"code": "valid-code", "state": "xyz"},
+        follow_redirects=False,
+    )
+
+    assert resp.status_code == 302
+    assert "access_token" in resp.cookies
+    assert provider.requests[1].headers["authorization"] == "Bearer gh-token"
+    user = await db_session.scalar(select(User).where(User.github_id == 777))
+    assert user.email == "main@example.com"
+
+
+async def test_google_exchange_rejects_unverified_email(
+    client: AsyncClient, db_session: AsyncSession, provider
+):
+    provider.routes = {
+        ("POST", "https://oauth2.googleapis.com/token"): _json(
+            {"access_token": "g-token"}
+        ),
+        ("GET", "https://www.googleapis.com/oauth2/v3/userinfo"): _json(
+            {"sub": "g-1", "email": "g@example.com", "email_verified": False}
+        ),
+    }
+
+    client.cookies.set("oauth_state", "xyz")
+    resp = await client.get(
+        "/api/auth/google/callback",
+        params={"code": "valid-code", "state": "xyz"},
+        follow_redirects=False,
+    )
+
+    assert resp.status_code == 302
+    assert "error=profile" in resp.headers["location"]
+    assert [r.url.path for r in provider.requests] == [
+        "/token",
+        "/oauth2/v3/userinfo",
+    ]
+    assert await db_session.scalar(select(User).where(User.google_sub == "g-1")) is None
@@ -0,0 +1,143 @@
+"""Query budgets for the list and analytics endpoints.
+
+Every endpoint runs against a few rows of everything, so an N+1 shows up as
+a budget overrun, and raiseload turns a relationship touched without eager
+loading into an error. A budget counts every statement of the request,
+including the user lookup that the first request of a test cannot skip.
+"""
+
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import (
+    BalanceSnapshot,
+    Currency,
+    ExpenseCategory,
+    IncomeSource,
+    StorageAccount,
+    StorageLocation,
+    Transaction,
+    TransactionType,
+)
+from app.models.currency_catalog import CurrencyCatalog
+from app.models.exchange_rate import UserExchangeRate
+
+_ROWS = 3
+
+
+@pytest.fixture()
+async def seeded(db_session: AsyncSession, test_user, exchange_rates) -> dict:
+    user_id = test_user.id
+    currencies = [
+        Currency(code=code, symbol=code, user_id=user_id)
+        for code in ("USD", "EUR", "GBP")
+    ]
+    locations = [
+        StorageLocation(name=f"Bank {i}", user_id=user_id) for i in range(_ROWS)
+    ]
+    sources = [IncomeSource(name=f"Source {i}", user_id=user_id) for i in range(_ROWS)]
+    db_session.add_all(
+        [
+            *currencies,
+            *locations,
+            *sources,
+            *(ExpenseCategory(name=f"Cat {i}", user_id=user_id) for i in range(_ROWS)),
+            *(
+                CurrencyCatalog(
+                    code=c.code, symbol=c.code, name=c.code, currency_type="fiat"
+                )
+                for c in currencies
+            ),
+        ]
+    )
+    await db_session.flush()
+    accounts = [
+        StorageAccount(
+            storage_location_id=location.id,
+            currency_id=currency.id,
+            user_id=user_id,
+        )
+        for location, currency in zip(locations, currencies)
+    ]
+    db_session.add_all(accounts)
+    await db_session.flush()
+    for i, (account, source) in enumerate(zip(accounts, sources)):
+        for n in range(_ROWS):
+            day = date(2025, 1, 31) + timedelta(days=30 * n)
+            db_session.add_all(
+                [
+                    Transaction(
+                        user_id=user_id,
+                        type=TransactionType.income,
+                        date=day,
+                        amount=Decimal(100 + i),
+                        currency_id=account.currency_id,
+                        storage_account_id=account.id,
+                        income_source_id=source.id,
+                    ),
+                    BalanceSnapshot(
+                        user_id=user_id,
+                        storage_account_id=account.id,
+                        date=day,
+                        amount=Decimal(1000 * (n + 1)),
+                    ),
+                ]
+            )
+    db_session.add_all(
+        UserExchangeRate(
+            user_id=user_id,
+            from_code="EUR",
+            rate=Decimal("1.1"),
+            valid_from=date(2025, 1, n + 1),
+        )
+        for n in range(_ROWS)
+    )
+    await db_session.flush()
+    ids = {"eur": currencies[1].id}
+    # Loaded relationships would hide a missing eager load from raiseload.
+    db_session.expunge_all()
+    return ids
+
+
+_PERIOD = "date_from=2025-01-01&date_to=2025-12-31&convert_to=USD"
+
+_BUDGETS = [
+    ("/api/transactions/", 2),
+    ("/api/transactions/summary", 2),
+    ("/api/transactions/export", 2),
+    ("/api/balance-snapshots/", 2),
+    ("/api/balance-snapshots/export", 2),
+    ("/api/storage-locations/", 2),
+    ("/api/storage-accounts/", 4),
+    ("/api/currencies/", 2),
+    ("/api/currencies/catalog", 2),
+    ("/api/currencies/rates/all", 4),
+    ("/api/currencies/{eur}/rates/history", 3),
+    ("/api/currencies/{eur}/manual-rates", 3),
+    ("/api/income-sources/", 2),
+    ("/api/expense-categories/", 2),
+    (f"/api/analytics/summary?{_PERIOD}", 10),
+    ("/api/analytics/summary/explain?period=2025-03-01&convert_to=USD", 9),
+    (f"/api/analytics/income-by-source?{_PERIOD}", 6),
+    ("/api/analytics/balance-by-storage?date_from=2025-01-01&date_to=2025-12-31", 3),
+    ("/api/analytics/snapshot-timeline?date_from=2025-01-01&date_to=2025-12-31", 4),
+    ("/api/analytics/expense-template", 2),
+    ("/api/analytics/balance-breakdown", 3),
+    ("/api/analytics/date-range", 3),
+]
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        pytest.param(url, marks=pytest.mark.query_budget(budget), id=url.split("?")[0])
+        for url, budget in _BUDGETS
+    ],
+)
+async def test_query_budget(auth_client: AsyncClient, seeded: dict, url):
+    resp = await auth_client.get(url.format(**seeded))
+    assert resp.status_code == 200, resp.text
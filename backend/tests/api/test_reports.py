@@ -0,0 +1,260 @@
+import json
+import time
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from app.api import reports
+from app.core.dependencies import get_redis
+from app.main import app
+from app.messaging import consumers
+from app.messaging.broker import broker
+from app.models import Transaction, TransactionType
+from app.services.reports import user_data_version
+from faststream.redis import TestRedisBroker
+from wallet_sdk.messaging.schemas import ReportCompletedMsg, ReportRequestedMsg
+from wallet_sdk.messaging.topics import REPORT_COMPLETED, REPORT_REQUESTED_DEAD
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        value = self.data.get(key)
+        return value.encode() if isinstance(value, str) else value
+
+    async def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+    async def eval(self, script, numkeys, key, job_id):
+        # The only script is the version key's compare-and-delete.
+        if await self.get(key) == job_id.encode():
+            await self.delete(key)
+
+
+@pytest.fixture()
+def published(monkeypatch):
+    jobs = []
+
+    async def publish(job_id, user_id, fmt):
+        jobs.append(job_id)
+
+    monkeypatch.setattr(reports, "publish_report_requested", publish)
+    return jobs
+
+
+@pytest.fixture()
+def fake_redis(auth_client):
+    r = _FakeRedis()
+    app.dependency_overrides[get_redis] = lambda: r
+    return r
+
+
+async def _income(db_session, ref_data, test_user, amount="10.00"):
+    tx = Transaction(
+        type=TransactionType.income,
+        date=date(2025, 1, 15),
+        amount=Decimal(amount),
+        currency_id=ref_data["currency"].id,
+        storage_account_id=ref_data["account"].id,
+        income_source_id=ref_data["income_source"].id,
+        user_id=test_user.id,
+    )
+    db_session.add(tx)
+    await db_session.flush()
+    return tx
+
+
+async def test_repeated_export_reuses_job(auth_client, fake_redis, published, ref_data):
+    first = await auth_client.post("/api/reports/export")
+    second = await auth_client.post("/api/reports/export")
+
+    assert first.status_code == second.status_code == 200
+    assert second.json() == {"job_id": first.json()["job_id"], "status": "pending"}
+    assert published == [first.json()["job_id"]]
+
+
+async def test_changed_data_starts_new_job(
+    auth_client, fake_redis, published, ref_data, db_session, test_user
+):
+    first = (await auth_client.post("/api/reports/export")).json()["job_id"]
+    await _income(db_session, ref_data, test_user)
+    second = (await auth_client.post("/api/reports/export")).json()["job_id"]
+
+    assert second != first
+    assert published == [first, second]
+
+
+async def test_ready_report_is_reused_only_while_its_file_exists(
+    auth_client, fake_redis, published, ref_data, tmp_path, monkeypatch
+):
+    monkeypatch.setattr(reports.settings, "REPORTS_DIR", str(tmp_path))
+    job_id = (await auth_client.post("/api/reports/export")).json()["job_id"]
+    _complete(fake_redis, job_id)
+
+    (tmp_path / f"{job_id}.xlsx").write_bytes(b"xlsx")
+    resp = await auth_client.post("/api/reports/export")
+    assert resp.json() == {"job_id": job_id, "status": "ready"}
+
+    (tmp_path / f"{job_id}.xlsx").unlink()
+    resp = await auth_client.post("/api/reports/export")
+    assert resp.json()["job_id"] != job_id
+    assert len(published) == 2
+
+
+def _update_job(fake_redis, job_id, **fields):
+    key = f"report:{job_id}"
+    fake_redis.data[key] = json.dumps({**json.loads(fake_redis.data[key]), **fields})
+
+
+def _complete(fake_redis, job_id):
+    """Mark the job ready, built from the version it was requested at."""
+    job = json.loads(fake_redis.data[f"report:{job_id}"])
+    _update_job(fake_redis, job_id, status="ready", data_version=job["version"])
+
+
+async def test_report_built_from_a_lagging_replica_is_not_reused(
+    auth_client, fake_redis, published, ref_data, tmp_path, monkeypatch
+):
+    monkeypatch.setattr(reports.settings, "REPORTS_DIR", str(tmp_path))
+    monkeypatch.setattr(consumers, "get_redis", lambda: fake_redis)
+    first = (await auth_client.post("/api/reports/export")).json()["job_id"]
+    (tmp_path / f"{first}.xlsx").write_bytes(b"xlsx")
+
+    # The replica had not replayed the user's last write when it was built.
+    async with TestRedisBroker(broker) as br:
+        await br.publish(
+            ReportCompletedMsg(job_id=first, data_version="behind"),
+            stream=REPORT_COMPLETED,
+        )
+
+    status = await auth_client.get(f"/api/reports/export/{first}/status")
+    assert status.json() == {"status": "ready"}
+    second = (await auth_client.post("/api/reports/export")).json()["job_id"]
+    assert second != first
+
+    _complete(fake_redis, second)
+    (tmp_path / f"{second}.xlsx").write_bytes(b"xlsx")
+    again = await auth_client.post("/api/reports/export")
+    assert again.json() == {"job_id": second, "status": "ready"}
+    assert published == [first, second]
+
+
+async def test_dead_lettered_job_is_failed_and_not_reused(
+    auth_client, fake_redis, published, ref_data, monkeypatch
+):
+    monkeypatch.setattr(consumers, "get_redis", lambda: fake_redis)
+    first = (await auth_client.post("/api/reports/export")).json()["job_id"]
+
+    async with TestRedisBroker(broker) as br:
+        await br.publish(
+            ReportRequestedMsg(job_id=first, user_id=1), stream=REPORT_REQUESTED_DEAD
+        )
+
+    status = await auth_client.get(f"/api/reports/export/{first}/status")
+    assert status.json() == {"status": "failed"}
+    second = (await auth_client.post("/api/reports/export")).json()["job_id"]
+    assert second != first
+    assert published == [first, second]
+
+
+async def test_pending_job_is_reused_only_within_the_window(
+    auth_client, fake_redis, published, ref_data
+):
+    first = (await auth_client.post("/api/reports/export")).json()["job_id"]
+    created_at = time.time() - reports.settings.REPORT_PENDING_REUSE_SECONDS + 60
+    _update_job(fake_redis, first, created_at=created_at)
+    assert (await auth_client.post("/api/reports/export")).json()["job_id"] == first
+
+    _update_job(fake_redis, first, created_at=created_at - 120)
+    second = (await auth_client.post("/api/reports/export")).json()["job_id"]
+    assert second != first
+    assert (await auth_client.post("/api/reports/export")).json()["job_id"] == second
+    assert published == [first, second]
+
+
+async def test_request_losing_the_version_race_does_not_publish(
+    auth_client, fake_redis, published, ref_data
+):
+    set_ = fake_redis.set
+
+    async def set_with_rival(key, value, ex=None, nx=False):
+        if nx and key not in fake_redis.data:
+            # A concurrent request for the same data claims the version first.
+            fake_redis.data["report:rival"] = json.dumps(
+                {"status": "pending", "user_id": 1, "created_at": time.time()}
+            )
+            fake_redis.data[key] = "rival"
+        return await set_(key, value, ex=ex, nx=nx)
+
+    fake_redis.set = set_with_rival
+    resp = await auth_client.post("/api/reports/export")
+
+    assert resp.json() == {"job_id": "rival", "status": "pending"}
+    assert published == []
+    # The loser's own job record is removed again.
+    jobs = [k for k in fake_redis.data if not k.startswith("report:version:")]
+    assert jobs == ["report:rival"]
+
+
+async def test_formats_are_separate_jobs(auth_client, fake_redis, published, ref_data):
+    xlsx = (await auth_client.post("/api/reports/export")).json()["job_id"]
+    parquet = await auth_client.post(
+        "/api/reports/export", params={"format": "parquet"}
+    )
+    again = await auth_client.post("/api/reports/export", params={"format": "parquet"})
+
+    assert parquet.json()["job_id"] != xlsx
+    assert again.json()["job_id"] == parquet.json()["job_id"]
+    assert published == [xlsx, parquet.json()["job_id"]]
+
+
+async def test_download_serves_bundle_as_zip(
+    auth_client, fake_redis, published, ref_data, tmp_path, monkeypatch
+):
+    monkeypatch.setattr(reports.settings, "REPORTS_DIR", str(tmp_path))
+    resp = await auth_client.post("/api/reports/export", params={"format": "csv"})
+    job_id = resp.json()["job_id"]
+    _complete(fake_redis, job_id)
+    (tmp_path / f"{job_id}.csv.zip").write_bytes(b"zip")
+
+    resp = await auth_client.get(f"/api/reports/export/{job_id}/download")
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/zip"
+    assert f"wallet-export-{job_id}.csv.zip" in resp.headers["content-disposition"]
+
+
+async def test_unknown_format_is_rejected(auth_client, fake_redis, published):
+    resp = await auth_client.post("/api/reports/export", params={"format": "pdf"})
+
+    assert resp.status_code == 422
+    assert published == []
+
+
+async def test_data_version_tracks_updates_and_deletes(
+    db_session, ref_data, test_user, other_user
+):
+    tx = await _income(db_session, ref_data, test_user)
+    before = await user_data_version(db_session, test_user.id)
+    assert await user_data_version(db_session, test_user.id) == before
+
+    # Each request commits its own transaction; a savepoint gives the update
+    # a transaction id of its own in the same way.
+    async with db_session.begin_nested():
+        tx.amount = Decimal("11.00")
+    updated = await user_data_version(db_session, test_user.id)
+    assert updated != before
+
+    other_before = await user_data_version(db_session, other_user.id)
+    await db_session.delete(tx)
+    await db_session.flush()
+    assert await user_data_version(db_session, test_user.id) not in (before, updated)
+    assert await user_data_version(db_session, other_user.id) == other_before
@@ -51,6 +51,27 @@ async def test_create_account(auth_client):
     data = resp.json()
     assert data["storage_location_id"] == loc_id
     assert data["currency_id"] == cur_id
+    assert data["storage_location"]["name"] == "Bank"
+    assert data["currency"]["code"] == "USD"
+
+
+async def test_create_account_with_foreign_references(auth_client, other_auth_client):
+    loc_id, cur_id = await _create_loc_and_cur(auth_client)
+    other_loc_id, other_cur_id = await _create_loc_and_cur(other_auth_client)
+
+    for body, code in (
+        (
+            {"storage_location_id": other_loc_id, "currency_id": other_cur_id},
+            "resource/storage_location_not_found",
+        ),
+        (
+            {"storage_location_id": loc_id, "currency_id": other_cur_id},
+            "resource/currency_not_found",
+        ),
+    ):
+        resp = await auth_client.post("/api/storage-accounts/", json=body)
+        assert resp.status_code == 404
+        assert resp.json()["code"] == code
 
 
 async def test_list_accounts_with_nested(auth_client):
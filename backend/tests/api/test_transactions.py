@@ -1,3 +1,8 @@
+import csv
+import io
+import json
+from decimal import Decimal
+
 from app.models import Currency, StorageAccount, StorageLocation
 
 
@@ -184,6 +189,23 @@ async def test_currency_mismatch_rejected(auth_client, ref_data, db_session, tes
     assert resp.json()["code"] == "transaction/currency_mismatch"
 
 
+async def test_update_currency_checked_against_current_account(
+    auth_client, ref_data, db_session, test_user
+):
+    from app.models import Currency
+
+    tx = await _create_income(auth_client, ref_data, "100.00")
+    other_currency = Currency(code="EUR", symbol="€", user_id=test_user.id)
+    db_session.add(other_currency)
+    await db_session.flush()
+
+    resp = await auth_client.put(
+        f"/api/transactions/{tx['id']}", json={"currency_id": other_currency.id}
+    )
+    assert resp.status_code == 422
+    assert resp.json()["code"] == "transaction/currency_mismatch"
+
+
 async def test_update_income_source_to_other_user(
     auth_client, other_user, db_session, ref_data
 ):
@@ -500,3 +522,286 @@ async def test_summary_multi_tenancy(auth_client, other_auth_client, ref_data):
 async def test_summary_requires_auth(client):
     resp = await client.get("/api/transactions/summary")
     assert resp.status_code == 401
+
+
+async def _walk_cursor_pages(auth_client, params):
+    seen, cursor = [], None
+    while True:
+        page_params = dict(params, limit=2)
+        if cursor:
+            page_params["cursor"] = cursor
+        resp = await auth_client.get("/api/transactions/", params=page_params)
+        assert resp.status_code == 200
+        seen.extend(t["id"] for t in resp.json())
+        cursor = resp.headers.get("x-next-cursor")
+        if not cursor:
+            return seen
+
+
+async def test_cursor_pagination_matches_full_listing(auth_client, ref_data):
+    # Repeated dates and amounts force the id tiebreaker to do its job.
+    for day, amount in ((1, "10.00"), (1, "30.00"), (2, "10.00"), (2, "20.00")):
+        await _create_income(auth_client, ref_data, amount, f"2025-08-{day:02d}")
+    await _create_income(
+        auth_client,
+        ref_data,
+        "5.00",
+        "2025-08-03",
+        income_source_id=ref_data["income_source"].id,
+    )
+
+    for params in (
+        {},
+        {"sort_by": "date", "sort_order": "asc"},
+        {"sort_by": "amount", "sort_order": "desc"},
+        {"sort_by": "amount", "sort_order": "asc"},
+        {"sort_by": "income_source", "sort_order": "asc"},
+        {"sort_by": "storage_account", "sort_order": "desc"},
+    ):
+        full = await auth_client.get("/api/transactions/", params=params)
+        assert await _walk_cursor_pages(auth_client, params) == [
+            t["id"] for t in full.json()
+        ]
+
+
+async def test_cursor_is_stable_under_inserts(auth_client, ref_data):
+    for i in range(4):
+        await _create_income(auth_client, ref_data, "10.00", f"2025-08-{i + 1:02d}")
+
+    page1 = await auth_client.get("/api/transactions/", params={"limit": 2})
+    # A newer row lands on page 1, which would shift an offset walk by one.
+    await _create_income(auth_client, ref_data, "10.00", "2025-09-01")
+    page2 = await auth_client.get(
+        "/api/transactions/",
+        params={"limit": 2, "cursor": page1.headers["x-next-cursor"]},
+    )
+    assert [t["date"] for t in page2.json()] == ["2025-08-02", "2025-08-01"]
+
+
+async def test_cursor_from_other_sort_rejected(auth_client, ref_data):
+    for i in range(2):
+        await _create_income(auth_client, ref_data, "10.00", f"2025-08-{i + 1:02d}")
+    page1 = await auth_client.get("/api/transactions/", params={"limit": 1})
+
+    resp = await auth_client.get(
+        "/api/transactions/",
+        params={"cursor": page1.headers["x-next-cursor"], "sort_by": "amount"},
+    )
+    assert resp.status_code == 422
+    assert resp.json()["code"] == "pagination/invalid_cursor"
+
+
+async def test_garbage_cursor_rejected(auth_client, ref_data):
+    resp = await auth_client.get("/api/transactions/", params={"cursor": "nope"})
+    assert resp.status_code == 422
+    assert resp.json()["code"] == "pagination/invalid_cursor"
+
+
+async def _seed_descriptions(auth_client, ref_data):
+    ids = {}
+    for i, description in enumerate(
+        (
+            "Coffee at Blue Bottle",
+            "Monthly salary",
+            "Refund: coffee grinder",
+            "coffee",
+            "100% cashback bonus",
+        )
+    ):
+        tx = await _create_income(
+            auth_client,
+            ref_data,
+            "10.00",
+            f"2025-08-{i + 1:02d}",
+            description=description,
+        )
+        ids[description] = tx["id"]
+    return ids
+
+
+async def test_search_ranks_closest_descriptions_first(auth_client, ref_data):
+    ids = await _seed_descriptions(auth_client, ref_data)
+
+    resp = await auth_client.get("/api/transactions/", params={"q": "COFFEE"})
+    assert resp.status_code == 200
+    assert [t["id"] for t in resp.json()] == [
+        ids["coffee"],
+        ids["Coffee at Blue Bottle"],
+        ids["Refund: coffee grinder"],
+    ]
+
+
+async def test_search_treats_wildcards_literally(auth_client, ref_data):
+    ids = await _seed_descriptions(auth_client, ref_data)
+    resp = await auth_client.get("/api/transactions/", params={"q": "100%"})
+    assert [t["id"] for t in resp.json()] == [ids["100% cashback bonus"]]
+
+
+async def test_search_combines_with_filters_and_summary(auth_client, ref_data):
+    await _seed_descriptions(auth_client, ref_data)
+    params = {"q": "coffee", "date_from": "2025-08-02"}
+
+    resp = await auth_client.get("/api/transactions/", params=params)
+    assert {t["description"] for t in resp.json()} == {
+        "Refund: coffee grinder",
+        "coffee",
+    }
+    summary = await auth_client.get("/api/transactions/summary", params=params)
+    assert summary.json()["count"] == 2
+
+
+async def test_search_pages_by_cursor(auth_client, ref_data):
+    await _seed_descriptions(auth_client, ref_data)
+    for params in ({"q": "coffee"}, {"q": "coffee", "sort_by": "date"}):
+        full = await auth_client.get("/api/transactions/", params=params)
+        assert await _walk_cursor_pages(auth_client, params) == [
+            t["id"] for t in full.json()
+        ]
+
+
+async def test_search_term_too_short(auth_client, ref_data):
+    resp = await auth_client.get("/api/transactions/", params={"q": "co"})
+    assert resp.status_code == 422
+
+
+async def test_export_ndjson_matches_listing(auth_client, other_auth_client, ref_data):
+    for i in range(3):
+        await _create_income(auth_client, ref_data, f"{i + 1}0.50", f"2025-08-0{i + 1}")
+
+    resp = await auth_client.get("/api/transactions/export")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/x-ndjson"
+    exported = [json.loads(line) for line in resp.text.splitlines()]
+    listed = (await auth_client.get("/api/transactions/")).json()
+    assert exported == listed
+
+    other = await other_auth_client.get("/api/transactions/export")
+    assert other.text == ""
+
+
+async def test_export_csv_applies_filters(auth_client, ref_data):
+    await _create_income(auth_client, ref_data, "10.00", "2025-08-01")
+    await _create_income(
+        auth_client, ref_data, "20.00", "2025-08-02", description="Bonus, Q3"
+    )
+
+    resp = await auth_client.get(
+        "/api/transactions/export",
+        params={"format": "csv", "date_from": "2025-08-02"},
+    )
+    assert resp.status_code == 200
+    assert 'filename="transactions.csv"' in resp.headers["content-disposition"]
+    rows = list(csv.DictReader(io.StringIO(resp.text)))
+    assert len(rows) == 1
+    assert rows[0]["date"] == "2025-08-02"
+    assert rows[0]["description"] == "Bonus, Q3"
+    assert Decimal(rows[0]["amount"]) == Decimal("20.00")
+    assert rows[0]["type"] == "income"
+    assert rows[0]["expense_category_id"] == ""
+
+
+def _income_item(ref_data, amount="100.00", tx_date="2025-01-15", **extra):
+    item = {
+        "type": "income",
+        "date": tx_date,
+        "amount": amount,
+        "currency_id": ref_data["currency"].id,
+        "storage_account_id": ref_data["account"].id,
+    }
+    item.update(extra)
+    return item
+
+
+async def test_bulk_create(auth_client, ref_data):
+    resp = await auth_client.post(
+        "/api/transactions/bulk",
+        json={"create": [_income_item(ref_data, f"{i + 1}.00") for i in range(50)]},
+    )
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["errors"] == []
+    # Returned in request order, so the client can map rows back to its input.
+    assert [float(t["amount"]) for t in data["created"]] == [
+        float(i + 1) for i in range(50)
+    ]
+
+    listed = await auth_client.get("/api/transactions/", params={"limit": 1000})
+    assert len(listed.json()) == 50
+
+
+async def test_bulk_reports_per_item_errors(
+    auth_client, ref_data, other_user, db_session, test_user
+):
+    from app.models import IncomeSource
+
+    foreign_source = IncomeSource(name="Foreign", user_id=other_user.id)
+    eur = Currency(code="EUR", symbol="€", user_id=test_user.id)
+    db_session.add_all([foreign_source, eur])
+    await db_session.flush()
+
+    resp = await auth_client.post(
+        "/api/transactions/bulk",
+        json={
+            "create": [
+                _income_item(ref_data),
+                _income_item(ref_data, type="expense"),
+                _income_item(ref_data, income_source_id=foreign_source.id),
+                _income_item(ref_data, currency_id=eur.id),
+                _income_item(ref_data, storage_account_id=999999),
+            ]
+        },
+    )
+    assert resp.status_code == 200
+    data = resp.json()
+    assert len(data["created"]) == 1
+    assert [(e["op"], e["index"], e["code"]) for e in data["errors"]] == [
+        ("create", 1, "transaction/expense_not_allowed"),
+        ("create", 2, "resource/income_source_not_found"),
+        ("create", 3, "transaction/currency_mismatch"),
+        ("create", 4, "resource/storage_account_not_found"),
+    ]
+
+
+async def test_bulk_update_and_delete(auth_client, ref_data):
+    keep = await _create_income(auth_client, ref_data, "100.00")
+    drop = await _create_income(auth_client, ref_data, "200.00")
+
+    resp = await auth_client.post(
+        "/api/transactions/bulk",
+        json={
+            "update": [
+                {"id": keep["id"], "amount": "150.00"},
+                {"id": 999999, "amount": "1.00"},
+            ],
+            "delete": [drop["id"], 999999],
+        },
+    )
+    assert resp.status_code == 200
+    data = resp.json()
+    assert [float(t["amount"]) for t in data["updated"]] == [150.0]
+    assert data["deleted"] == [drop["id"]]
+    assert [(e["op"], e["index"], e["code"]) for e in data["errors"]] == [
+        ("update", 1, "resource/transaction_not_found"),
+        ("delete", 1, "resource/transaction_not_found"),
+    ]
+
+    listed = await auth_client.get("/api/transactions/")
+    assert [t["id"] for t in listed.json()] == [keep["id"]]
+
+
+async def test_bulk_cannot_touch_other_users_rows(
+    auth_client, other_auth_client, ref_data
+):
+    tx = await _create_income(auth_client, ref_data, "100.00")
+
+    resp = await other_auth_client.post(
+        "/api/transactions/bulk",
+        json={"update": [{"id": tx["id"], "amount": "1.00"}], "delete": [tx["id"]]},
+    )
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["updated"] == [] and data["deleted"] == []
+    assert len(data["errors"]) == 2
+
+    listed = await auth_client.get("/api/transactions/")
+    assert float(listed.json()[0]["amount"]) == 100.0
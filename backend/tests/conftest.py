@@ -5,7 +5,9 @@ from decimal import Decimal
 import pytest
 from app.core.config import settings
 from app.core.database import Base, get_db
+from app.core.dependencies import get_read_db
 from app.core.security import create_access_token, hash_password
+from app.core.user_cache import _local as _user_cache
 from app.main import app
 from app.models import (
     Currency,
@@ -17,14 +19,17 @@ from app.models import (
 )
 from app.models.currency_catalog import CurrencyCatalog
 from app.models.exchange_rate import ExchangeRate
-from httpx import ASGITransport, AsyncClient
-from sqlalchemy import text
+from httpx import ASGITransport, AsyncClient, Request, Response
+from sqlalchemy import event, text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import ORMExecuteState, raiseload
 
 # Tests run over plain HTTP — disable the Secure cookie flag so httpx
 # stores and forwards auth cookies correctly.
 settings.DEV_MODE = True
 settings.COOKIE_SECURE = False
+# The cheapest cost bcrypt accepts; the default would dominate the run time.
+settings.BCRYPT_ROUNDS = 4
 
 TEST_DB_NAME = "wallet_test"
 _base_url = settings.DATABASE_URL.rsplit("/", 1)[0]
@@ -44,6 +49,8 @@ async def setup_test_db():
 
     engine = create_async_engine(TEST_DB_URL)
     async with engine.begin() as conn:
+        # Extensions are installed by migrations, which create_all bypasses.
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
         await conn.run_sync(Base.metadata.create_all)
     await engine.dispose()
 
@@ -57,6 +64,14 @@ async def setup_test_db():
     await admin_engine.dispose()
 
 
+@pytest.fixture(autouse=True)
+def _clear_user_cache():
+    """Cached users would outlive the rollback that removes their rows."""
+    _user_cache.clear()
+    yield
+    _user_cache.clear()
+
+
 @pytest.fixture()
 async def _test_engine(setup_test_db):
     engine = create_async_engine(TEST_DB_URL)
@@ -82,15 +97,87 @@ async def db_session(_test_engine) -> AsyncGenerator[AsyncSession, None]:
 
 
 @pytest.fixture()
-async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
+async def query_log(db_session: AsyncSession) -> AsyncGenerator[list[str], None]:
+    """Every SQL statement sent on the test connection, in order."""
+    conn = await db_session.connection()
+    statements: list[str] = []
+
+    def on_execute(_conn, _cursor, statement, *_):
+        statements.append(statement)
+
+    event.listen(conn.sync_connection, "before_cursor_execute", on_execute)
+    yield statements
+    event.remove(conn.sync_connection, "before_cursor_execute", on_execute)
+
+
+@pytest.fixture()
+def _query_budget_hooks(request: pytest.FixtureRequest, db_session: AsyncSession):
+    """httpx event hooks enforcing the test's ``query_budget`` marker.
+
+    ``@pytest.mark.query_budget(n)`` fails any GET request of the test that
+    sends more than ``n`` statements. Unless ``raiseload=False`` is given,
+    top-level ORM selects made during those requests also get
+    ``raiseload("*")``, so touching a relationship the endpoint did not load
+    eagerly raises instead of quietly issuing one query per row. Requests
+    with other methods, like those setting up data, are not counted.
+    """
+    marker = request.node.get_closest_marker("query_budget")
+    if marker is None:
+        return {}
+    budget = marker.args[0]
+    statements = request.getfixturevalue("query_log")
+    state = {"start": None}
+
+    def add_raiseload(orm_state: ORMExecuteState) -> None:
+        if (
+            state["start"] is not None
+            and orm_state.is_select
+            and not orm_state.is_column_load
+            and not orm_state.is_relationship_load
+        ):
+            orm_state.statement = orm_state.statement.options(raiseload("*"))
+
+    if marker.kwargs.get("raiseload", True):
+        event.listen(db_session.sync_session, "do_orm_execute", add_raiseload)
+        request.addfinalizer(
+            lambda: event.remove(
+                db_session.sync_session, "do_orm_execute", add_raiseload
+            )
+        )
+
+    async def on_request(req: Request) -> None:
+        if req.method == "GET":
+            state["start"] = len(statements)
+
+    async def on_response(resp: Response) -> None:
+        if state["start"] is None:
+            return
+        used = statements[state["start"] :]
+        state["start"] = None
+        if len(used) > budget:
+            raise AssertionError(
+                f"GET {resp.request.url.path} sent {len(used)} queries, "
+                f"over its budget of {budget}:\n" + "\n---\n".join(used)
+            )
+
+    return {"request": [on_request], "response": [on_response]}
+
+
+@pytest.fixture()
+async def client(
+    db_session: AsyncSession, _query_budget_hooks: dict
+) -> AsyncGenerator[AsyncClient, None]:
     """HTTPX async client with get_db overridden to use the test session."""
 
     async def _override_get_db() -> AsyncGenerator[AsyncSession, None]:
         yield db_session
 
     app.dependency_overrides[get_db] = _override_get_db
+    app.dependency_overrides[get_read_db] = _override_get_db
     transport = ASGITransport(app=app)
-    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+    async with AsyncClient(
+        transport=transport, base_url="http://test", event_hooks=_query_budget_hooks
+    ) as ac:
         yield ac
     app.dependency_overrides.clear()
 
@@ -120,7 +207,10 @@ async def other_user(db_session: AsyncSession) -> User:
 
 @pytest.fixture()
 async def other_auth_client(
-    client: AsyncClient, other_user: User, db_session: AsyncSession
+    client: AsyncClient,
+    other_user: User,
+    db_session: AsyncSession,
+    _query_budget_hooks: dict,
 ) -> AsyncGenerator[AsyncClient, None]:
     """A second authenticated client for multi-tenancy tests."""
 
@@ -128,12 +218,14 @@ async def other_auth_client(
         yield db_session
 
     app.dependency_overrides[get_db] = _override
+    app.dependency_overrides[get_read_db] = _override
     transport = ASGITransport(app=app)
     token = create_access_token(other_user.id)
     async with AsyncClient(
         transport=transport,
         base_url="http://test",
         cookies={"access_token": token},
+        event_hooks=_query_budget_hooks,
     ) as ac:
         yield ac
 
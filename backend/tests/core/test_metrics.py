@@ -0,0 +1,44 @@
+from prometheus_client import REGISTRY
+
+from app.tasks._metrics import _task_finished, _task_started
+
+
+def _sample(name: str, **labels) -> float | None:
+    return REGISTRY.get_sample_value(name, labels)
+
+
+async def test_request_latency_is_labelled_by_route_template(auth_client):
+    """The template, not the raw path, so ids do not each become a series."""
+    labels = {
+        "method": "DELETE",
+        "route": "/api/transactions/{transaction_id}",
+        "status": "404",
+    }
+    before = _sample("wallet_http_request_duration_seconds_count", **labels) or 0
+
+    resp = await auth_client.delete("/api/transactions/99999")
+    assert resp.status_code == 404
+
+    after = _sample("wallet_http_request_duration_seconds_count", **labels)
+    assert after == before + 1
+
+
+async def test_metrics_endpoint_exposes_pool_gauges(client):
+    resp = await client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain")
+    body = resp.text
+    assert 'wallet_db_pool_checked_out{engine="primary"}' in body
+    assert 'wallet_db_pool_overflow{engine="primary"}' in body
+    assert "wallet_password_hash_waiting" in body
+
+
+def test_task_duration_is_recorded_per_state():
+    class _Task:
+        name = "app.tasks.example"
+
+    labels = {"task": "app.tasks.example", "state": "SUCCESS"}
+    before = _sample("wallet_celery_task_duration_seconds_count", **labels) or 0
+    _task_started(task_id="abc")
+    _task_finished(task_id="abc", task=_Task(), state="SUCCESS")
+    assert _sample("wallet_celery_task_duration_seconds_count", **labels) == before + 1
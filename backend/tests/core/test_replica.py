@@ -0,0 +1,126 @@
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.responses import StreamingResponse
+from httpx import ASGITransport, AsyncClient
+from redis.exceptions import ConnectionError as RedisConnectionError
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core import database, redis, replica
+from app.core.dependencies import get_current_user, get_read_db
+from app.core.replica import note_write, read_session_factory, wrote_recently
+from app.core.security import create_access_token
+from app.core.user_cache import cache_user
+from app.models.user import User
+
+
+@pytest.fixture()
+def with_replica(monkeypatch):
+    """Pretend DATABASE_READ_URL is set; no query reaches it in these tests."""
+    monkeypatch.setattr(database, "read_engine", object())
+    monkeypatch.setattr(replica, "_recent_writes", {})
+
+
+async def test_without_replica_reads_use_primary():
+    assert await read_session_factory(1) is database.async_session
+
+
+async def test_reads_stay_on_primary_after_own_write(with_replica, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(replica.time, "monotonic", lambda: now[0])
+
+    assert await read_session_factory(1) is database.read_session
+    await note_write(1)
+    assert await read_session_factory(1) is database.async_session
+    # Other users and anonymous reads are unaffected.
+    assert await read_session_factory(2) is database.read_session
+    assert await read_session_factory(None) is database.read_session
+
+    now[0] += replica.settings.READ_YOUR_WRITES_SECONDS + 1
+    assert await read_session_factory(1) is database.read_session
+
+
+async def test_unreachable_redis_routes_to_primary(with_replica, monkeypatch):
+    class _Down:
+        async def exists(self, key):
+            raise RedisConnectionError()
+
+    monkeypatch.setattr(redis, "redis_pool", _Down())
+    assert await wrote_recently(1) is True
+
+
+async def test_authenticated_write_is_noted(with_replica, auth_client, test_user):
+    await auth_client.get("/api/currencies/")
+    assert not await wrote_recently(test_user.id)
+
+    resp = await auth_client.post("/api/storage-locations/", json={"name": "Broker"})
+    assert resp.status_code == 201
+    assert await wrote_recently(test_user.id)
+
+
+async def test_long_write_is_noted_when_it_commits(
+    with_replica, _test_engine, monkeypatch
+):
+    now = [1000.0]
+    monkeypatch.setattr(replica.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(
+        database,
+        "async_session",
+        async_sessionmaker(_test_engine, class_=AsyncSession, expire_on_commit=False),
+    )
+    # Cached, so resolving the user sends no query.
+    await cache_user(User(id=1, email="slow@wallet.app", token_version=0))
+
+    api = FastAPI()
+
+    @api.post("/")
+    async def write(
+        user: User = Depends(get_current_user),
+        db: AsyncSession = Depends(database.get_db),
+    ):
+        now[0] += replica.settings.READ_YOUR_WRITES_SECONDS + 1
+
+    transport = ASGITransport(app=api)
+    async with AsyncClient(
+        transport=transport,
+        base_url="http://test",
+        cookies={"access_token": create_access_token(1)},
+    ) as client:
+        assert (await client.post("/")).status_code == 200
+
+    assert await wrote_recently(1)
+
+
+async def test_read_session_is_read_only_and_released_before_sending(
+    _test_engine, monkeypatch
+):
+    monkeypatch.setattr(
+        database,
+        "async_session",
+        async_sessionmaker(_test_engine, class_=AsyncSession, expire_on_commit=False),
+    )
+    monkeypatch.setitem(database.pool_hold_stats, "test", None)
+    stats = database.track_pool_hold(_test_engine, "test")
+    commits = []
+    event.listen(_test_engine.sync_engine, "commit", commits.append)
+
+    api = FastAPI()
+    seen = {}
+
+    @api.get("/")
+    async def read(db: AsyncSession = Depends(get_read_db, scope="function")):
+        seen["read_only"] = await db.scalar(text("SHOW transaction_read_only"))
+
+        async def body():
+            seen["held_while_sending"] = _test_engine.pool.checkedout()
+            yield b"ok"
+
+        return StreamingResponse(body())
+
+    transport = ASGITransport(app=api)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        assert (await client.get("/")).status_code == 200
+
+    assert seen == {"read_only": "on", "held_while_sending": 0}
+    assert commits == []
+    assert stats.checkouts == 1
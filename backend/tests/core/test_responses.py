@@ -0,0 +1,48 @@
+import enum
+import json
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.core.responses import DecimalJSONResponse
+
+
+class _Kind(str, enum.Enum):
+    income = "income"
+
+
+@dataclass
+class _Row:
+    period: date
+    amount: Decimal
+
+
+def test_output_matches_default_response():
+    """Same JSON as FastAPI's jsonable_encoder followed by JSONResponse."""
+    payload = {
+        "periods": [
+            {
+                "period": "2025-01-01",
+                "income": Decimal("1200"),
+                "profit": Decimal("-15.50"),
+                "balances": {"USD": Decimal("0.00312500"), "EUR": Decimal("0")},
+                "converted_balance": None,
+                "is_measured": True,
+            }
+        ],
+        "rows": [_Row(date(2025, 1, 31), Decimal("99.99"))],
+        "kind": _Kind.income,
+        "fetched_at": datetime(2025, 1, 31, 12, 30, tzinfo=timezone.utc),
+        "by_account": {7: Decimal("1E+2")},
+        "missing": ("GBP",),
+    }
+
+    rendered = json.loads(DecimalJSONResponse(payload).body)
+
+    assert rendered == json.loads(JSONResponse(jsonable_encoder(payload)).body)
+    assert rendered["periods"][0]["income"] == 1200
+    assert isinstance(rendered["periods"][0]["income"], int)
+    assert rendered["periods"][0]["profit"] == -15.5
@@ -1,10 +1,15 @@
 from app.core.security import (
     create_access_token,
     create_refresh_token,
+    decode_access_claims,
     decode_access_token,
     hash_password,
+    hash_password_async,
     hash_refresh_token,
+    password_hash_stats,
+    password_needs_rehash,
     verify_password,
+    verify_password_async,
 )
 
 
@@ -18,11 +23,50 @@ def test_wrong_password():
     assert not verify_password("Wrong456", hashed)
 
 
+def test_needs_rehash_when_cost_changes(monkeypatch):
+    from app.core.config import settings
+
+    hashed = hash_password("Secret123")
+    assert not password_needs_rehash(hashed)
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS", settings.BCRYPT_ROUNDS + 1)
+    assert password_needs_rehash(hashed)
+
+
+async def test_hashing_runs_off_the_event_loop():
+    import asyncio
+
+    before = password_hash_stats.completed
+    hashes = await asyncio.gather(*(hash_password_async(f"pw{i}") for i in range(4)))
+    assert all(
+        await asyncio.gather(
+            *(verify_password_async(f"pw{i}", h) for i, h in enumerate(hashes))
+        )
+    )
+    assert password_hash_stats.completed == before + 8
+    assert password_hash_stats.waiting == password_hash_stats.running == 0
+
+
 def test_access_token_roundtrip():
     token = create_access_token(42)
     assert decode_access_token(token) == 42
 
 
+def test_access_token_carries_version():
+    assert decode_access_claims(create_access_token(42, 3)) == (42, 3)
+
+
+def test_unversioned_token_is_version_zero():
+    from datetime import datetime, timedelta, timezone
+
+    from jose import jwt
+
+    from app.core.config import settings
+
+    payload = {"sub": "7", "exp": datetime.now(timezone.utc) + timedelta(minutes=5)}
+    token = jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    assert decode_access_claims(token) == (7, 0)
+
+
 def test_invalid_token_returns_none():
     assert decode_access_token("not.a.token") is None
 
@@ -0,0 +1,122 @@
+import json
+from datetime import datetime, timezone
+
+from app.core import redis, user_cache
+from app.core.user_cache import (
+    _LocalCache,
+    cache_user,
+    get_cached_user,
+    invalidate_user,
+)
+from app.models.user import User
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+
+def _user(**overrides) -> User:
+    fields = {
+        "id": 1,
+        "email": "cached@wallet.app",
+        "password_hash": "x",
+        "github_id": None,
+        "google_sub": None,
+        "created_at": datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+        "onboarding_completed_at": None,
+        "base_currency_code": "EUR",
+        "token_version": 0,
+    }
+    return User(**{**fields, **overrides})
+
+
+def test_local_cache_evicts_least_recently_used():
+    cache = _LocalCache(maxsize=2, ttl=60)
+    cache.set("a", {"n": 1})
+    cache.set("b", {"n": 2})
+    cache.get("a")
+    cache.set("c", {"n": 3})
+    assert cache.get("b") is None
+    assert cache.get("a") == {"n": 1}
+    assert len(cache) == 2
+
+
+def test_local_cache_expires_entries(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(user_cache.time, "monotonic", lambda: now[0])
+    cache = _LocalCache(maxsize=2, ttl=5)
+    cache.set("a", {"n": 1})
+    now[0] += 6
+    assert cache.get("a") is None
+
+
+async def test_redis_entry_survives_local_eviction(monkeypatch):
+    fake = _FakeRedis()
+    monkeypatch.setattr(redis, "redis_pool", fake)
+    await cache_user(_user())
+    user_cache._local.clear()
+
+    fields = await get_cached_user(1, 0)
+    assert fields["email"] == "cached@wallet.app"
+    assert fields["created_at"] == datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    # A token from another version never reads this entry.
+    assert await get_cached_user(1, 1) is None
+
+
+async def test_invalidate_clears_both_levels(monkeypatch):
+    fake = _FakeRedis()
+    monkeypatch.setattr(redis, "redis_pool", fake)
+    await cache_user(_user())
+    await invalidate_user(1, 0)
+    assert fake.data == {user_cache._key(1, 0): user_cache._TOMBSTONE}
+    assert await get_cached_user(1, 0) is None
+    user_cache._local.clear()
+    assert await get_cached_user(1, 0) is None
+
+
+async def test_row_read_before_invalidation_is_not_cached_again(monkeypatch):
+    fake = _FakeRedis()
+    monkeypatch.setattr(redis, "redis_pool", fake)
+    stale = _user(email="old@wallet.app")
+    await invalidate_user(1, 0)
+
+    # A request that loaded the row before the change finishes after it.
+    await cache_user(stale)
+    assert await get_cached_user(1, 0) is None
+    assert fake.data == {user_cache._key(1, 0): user_cache._TOMBSTONE}
+
+    # Nor through a process that never saw the invalidation.
+    user_cache._local.clear()
+    await cache_user(stale)
+    user_cache._local.clear()
+    assert await get_cached_user(1, 0) is None
+
+
+async def test_password_hash_is_never_cached(monkeypatch):
+    fake = _FakeRedis()
+    monkeypatch.setattr(redis, "redis_pool", fake)
+    await cache_user(_user())
+
+    (raw,) = fake.data.values()
+    assert "password_hash" not in json.loads(raw)
+    assert "password_hash" not in await get_cached_user(1, 0)
+
+    # An entry written while the hash was still cached does not hand it out.
+    user_cache._local.clear()
+    fake.data[user_cache._key(1, 0)] = json.dumps(
+        {**json.loads(raw), "password_hash": "x"}
+    ).encode()
+    assert "password_hash" not in await get_cached_user(1, 0)
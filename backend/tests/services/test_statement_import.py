@@ -0,0 +1,273 @@
+import io
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import func, select
+
+from app.models import BalanceSnapshot, Transaction
+from app.services.statement_import import (
+    ImportTarget,
+    StatementFormat,
+    load_statement,
+    parse_statement,
+)
+from app.services.statement_import.parsers import (
+    RowError,
+    StatementBalance,
+    StatementEntry,
+)
+
+CSV = b"""Date,Description,Amount,Balance
+2025-01-02,Salary,3000.00,3000.00
+2025-01-02,Coffee,-4.50,2995.50
+2025-01-03,Refund,4.50,3000.00
+not-a-date,Broken,1.00,
+"""
+
+OFX = b"""OFXHEADER:100
+DATA:OFXSGML
+
+<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS>
+<CURDEF>USD
+<BANKTRANLIST>
+<STMTTRN>
+<TRNTYPE>CREDIT
+<DTPOSTED>20250102120000.000[-5:EST]
+<TRNAMT>3000.00
+<FITID>A1
+<NAME>Salary
+</STMTTRN>
+<STMTTRN>
+<TRNTYPE>DEBIT
+<DTPOSTED>20250103
+<TRNAMT>-12.00
+<FITID>A2
+<NAME>Lunch
+</STMTTRN>
+</BANKTRANLIST>
+<LEDGERBAL><BALAMT>2988.00<DTASOF>20250103</LEDGERBAL>
+</STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>
+"""
+
+CAMT = b"""<?xml version="1.0" encoding="UTF-8"?>
+<Document xmlns="urn:iso:std:iso:20022:tech:xsd:camt.053.001.02">
+<BkToCstmrStmt><Stmt>
+<Bal><Tp><CdOrPrtry><Cd>OPBD</Cd></CdOrPrtry></Tp>
+  <Amt Ccy="USD">0.00</Amt><CdtDbtInd>CRDT</CdtDbtInd><Dt><Dt>2025-01-01</Dt></Dt></Bal>
+<Bal><Tp><CdOrPrtry><Cd>CLBD</Cd></CdOrPrtry></Tp>
+  <Amt Ccy="USD">150.00</Amt><CdtDbtInd>CRDT</CdtDbtInd><Dt><Dt>2025-01-31</Dt></Dt></Bal>
+<Ntry><Amt Ccy="USD">200.00</Amt><CdtDbtInd>CRDT</CdtDbtInd>
+  <BookgDt><Dt>2025-01-05</Dt></BookgDt><AcctSvcrRef>REF1</AcctSvcrRef>
+  <NtryDtls><TxDtls><RmtInf><Ustrd>Invoice 42</Ustrd></RmtInf></TxDtls></NtryDtls></Ntry>
+<Ntry><Amt Ccy="USD">50.00</Amt><CdtDbtInd>DBIT</CdtDbtInd>
+  <BookgDt><Dt>2025-01-06</Dt></BookgDt><AddtlNtryInf>Groceries</AddtlNtryInf></Ntry>
+</Stmt></BkToCstmrStmt></Document>
+"""
+
+
+def _parse(data: bytes, fmt: StatementFormat) -> list:
+    return list(parse_statement(io.BytesIO(data), fmt))
+
+
+def test_parse_csv():
+    records = _parse(CSV, StatementFormat.csv)
+    entries = [r for r in records if isinstance(r, StatementEntry)]
+    assert [(e.date, e.amount, e.description) for e in entries] == [
+        (date(2025, 1, 2), Decimal("3000.00"), "Salary"),
+        (date(2025, 1, 2), Decimal("-4.50"), "Coffee"),
+        (date(2025, 1, 3), Decimal("4.50"), "Refund"),
+    ]
+    assert [r.position for r in records if isinstance(r, RowError)] == ["line 5"]
+    # The balance of a day is the one after its last row.
+    assert [r for r in records if isinstance(r, StatementBalance)] == [
+        StatementBalance(date(2025, 1, 2), Decimal("2995.50")),
+        StatementBalance(date(2025, 1, 3), Decimal("3000.00")),
+    ]
+
+
+def test_parse_csv_newest_first_keeps_end_of_day_balance():
+    data = b"date;amount;balance\n2025-01-03;1;12\n2025-01-02;5;11\n2025-01-02;6;6\n"
+    balances = [
+        r for r in _parse(data, StatementFormat.csv) if isinstance(r, StatementBalance)
+    ]
+    assert [(b.date, b.amount) for b in balances] == [
+        (date(2025, 1, 2), Decimal("11")),
+        (date(2025, 1, 3), Decimal("12")),
+    ]
+
+
+def _entries_and_balances(data: bytes) -> tuple[list, list]:
+    records = _parse(data, StatementFormat.csv)
+    return (
+        [
+            (r.amount if isinstance(r, StatementEntry) else r)
+            for r in records
+            if not isinstance(r, StatementBalance)
+        ],
+        [r.amount for r in records if isinstance(r, StatementBalance)],
+    )
+
+
+def test_parse_csv_decimal_comma():
+    data = b"date;description;amount;balance\n2025-01-02;Salary;1234,56;2000,00\n"
+    assert _entries_and_balances(data) == ([Decimal("1234.56")], [Decimal("2000.00")])
+
+
+def test_parse_csv_thousands_separators():
+    european = b"date;amount;balance\n2025-01-02;-1.234,5;1.000.000\n2025-01-03;7;12\n"
+    assert _entries_and_balances(european) == (
+        [Decimal("-1234.5"), Decimal("7")],
+        [Decimal("1000000"), Decimal("12")],
+    )
+    english = b'date,amount,balance\n2025-01-02,"1,234.56","10,000"\n'
+    assert _entries_and_balances(english) == (
+        [Decimal("1234.56")],
+        [Decimal("10000")],
+    )
+
+
+def test_parse_csv_learns_the_decimal_mark_from_any_row():
+    # 1.234 alone could be either; a later 5,50 settles it.
+    data = b"date;amount\n2025-01-02;1.234\n2025-01-03;5,50\n"
+    assert _entries_and_balances(data)[0] == [Decimal("1234"), Decimal("5.50")]
+
+
+def test_parse_csv_rejects_ambiguous_and_mixed_amounts():
+    # Whole amounts fill the sample and say nothing about the decimal mark.
+    data = b"date;amount\n" + b"2025-01-01;1\n" * 1000
+    data += b"2025-01-02;1,234\n2025-01-03;5,50\n2025-01-04;5.50\n"
+    amounts = _entries_and_balances(data)[0][1000:]
+    assert isinstance(amounts[0], RowError)
+    assert "either decimal mark" in amounts[0].message
+    assert amounts[1] == Decimal("5.50")
+    assert isinstance(amounts[2], RowError)
+    assert "decimal mark ','" in amounts[2].message
+
+
+def test_parse_ofx():
+    records = _parse(OFX, StatementFormat.ofx)
+    assert records == [
+        StatementEntry(date(2025, 1, 2), Decimal("3000.00"), "Salary", "A1", "USD"),
+        StatementEntry(date(2025, 1, 3), Decimal("-12.00"), "Lunch", "A2", "USD"),
+        StatementBalance(date(2025, 1, 3), Decimal("2988.00"), "USD"),
+    ]
+
+
+def test_parse_ofx_tags_split_across_chunks(monkeypatch):
+    from app.services.statement_import import parsers
+
+    monkeypatch.setattr(parsers, "_OFX_CHUNK", 7)
+    assert _parse(OFX, StatementFormat.ofx) == [
+        StatementEntry(date(2025, 1, 2), Decimal("3000.00"), "Salary", "A1", "USD"),
+        StatementEntry(date(2025, 1, 3), Decimal("-12.00"), "Lunch", "A2", "USD"),
+        StatementBalance(date(2025, 1, 3), Decimal("2988.00"), "USD"),
+    ]
+
+
+def test_parse_camt053():
+    records = _parse(CAMT, StatementFormat.camt053)
+    assert records == [
+        StatementBalance(date(2025, 1, 31), Decimal("150.00"), "USD"),
+        StatementEntry(
+            date(2025, 1, 5), Decimal("200.00"), "Invoice 42", "REF1", "USD"
+        ),
+        StatementEntry(date(2025, 1, 6), Decimal("-50.00"), "Groceries", None, "USD"),
+    ]
+
+
+async def _load(db_session, target, data, fmt, chunk_size=2):
+    stats = None
+    async for stats in load_statement(
+        db_session, target, parse_statement(io.BytesIO(data), fmt), chunk_size
+    ):
+        pass
+    return stats
+
+
+def _target(ref_data, test_user) -> ImportTarget:
+    return ImportTarget(
+        user_id=test_user.id,
+        storage_account_id=ref_data["account"].id,
+        currency_id=ref_data["currency"].id,
+        currency_code="USD",
+        income_source_id=ref_data["income_source"].id,
+    )
+
+
+async def test_load_statement(db_session, ref_data, test_user):
+    stats = await _load(db_session, _target(ref_data, test_user), CSV, "csv")
+    assert stats.imported == 2
+    assert stats.skipped_debits == 1
+    assert stats.snapshots == 2
+    assert stats.error_count == 1
+
+    rows = (
+        await db_session.execute(
+            select(Transaction.date, Transaction.amount, Transaction.income_source_id)
+            .where(Transaction.user_id == test_user.id)
+            .order_by(Transaction.date)
+        )
+    ).all()
+    assert [(r.date, r.amount) for r in rows] == [
+        (date(2025, 1, 2), Decimal("3000.00")),
+        (date(2025, 1, 3), Decimal("4.50")),
+    ]
+    assert {r.income_source_id for r in rows} == {ref_data["income_source"].id}
+
+
+async def test_reimport_is_deduplicated(db_session, ref_data, test_user):
+    target = _target(ref_data, test_user)
+    await _load(db_session, target, OFX, StatementFormat.ofx)
+    stats = await _load(db_session, target, OFX, StatementFormat.ofx)
+    assert stats.imported == 0
+    assert stats.duplicates == 1
+    assert stats.snapshots == 0
+
+    count = await db_session.scalar(
+        select(func.count())
+        .select_from(BalanceSnapshot)
+        .where(BalanceSnapshot.user_id == test_user.id)
+    )
+    assert count == 1
+
+
+async def test_identical_entries_in_one_file_are_both_kept(
+    db_session, ref_data, test_user
+):
+    data = b"date,amount,description\n2025-02-01,5,Tip\n2025-02-01,5,Tip\n"
+    stats = await _load(db_session, _target(ref_data, test_user), data, "csv")
+    assert stats.imported == 2
+
+
+async def test_later_balance_of_a_day_wins_across_chunks(
+    db_session, ref_data, test_user
+):
+    day = date(2025, 3, 1)
+    records = [
+        StatementBalance(day, Decimal("10.00")),
+        StatementEntry(day, Decimal("1.00"), "A"),
+        StatementEntry(day, Decimal("2.00"), "B"),
+        StatementEntry(day, Decimal("3.00"), "C"),
+        StatementBalance(day, Decimal("12.00")),
+    ]
+    stats = None
+    async for stats in load_statement(
+        db_session, _target(ref_data, test_user), records, chunk_size=2
+    ):
+        pass
+    assert (stats.imported, stats.snapshots) == (3, 1)
+
+    amount = await db_session.scalar(
+        select(BalanceSnapshot.amount).where(
+            BalanceSnapshot.storage_account_id == ref_data["account"].id
+        )
+    )
+    assert amount == Decimal("12.00")
+
+
+async def test_foreign_currency_rejected(db_session, ref_data, test_user):
+    target = _target(ref_data, test_user)
+    target.currency_code = "EUR"
+    stats = await _load(db_session, target, CAMT, StatementFormat.camt053)
+    assert stats.imported == 0
+    assert stats.error_count == 3
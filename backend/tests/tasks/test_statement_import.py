@@ -0,0 +1,123 @@
+import asyncio
+import json
+import shutil
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+from app.models import (
+    BalanceSnapshot,
+    Currency,
+    StorageAccount,
+    StorageLocation,
+    Transaction,
+    User,
+)
+from app.tasks import statement_import
+from app.tasks.statement_import import import_statement, import_status_key
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from tests.conftest import TEST_DB_URL
+
+STATEMENT = Path(__file__).parent.parent / "fixtures" / "statement.csv"
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    async def aclose(self):
+        pass
+
+
+def _run(coro_fn):
+    """Run against the test database outside any test transaction.
+
+    The task commits and runs its own event loop, so its data cannot live in
+    the rolled-back session the other tests share.
+    """
+
+    async def run():
+        engine = create_async_engine(TEST_DB_URL, poolclass=NullPool)
+        try:
+            async with AsyncSession(engine, expire_on_commit=False) as db:
+                return await coro_fn(db)
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(run())
+
+
+@pytest.fixture()
+def account(setup_test_db):
+    async def create(db):
+        user = User(email="import@wallet.app")
+        db.add(user)
+        await db.flush()
+        currency = Currency(code="USD", symbol="$", user_id=user.id)
+        location = StorageLocation(name="Bank", user_id=user.id)
+        db.add_all([currency, location])
+        await db.flush()
+        account = StorageAccount(
+            storage_location_id=location.id, currency_id=currency.id, user_id=user.id
+        )
+        db.add(account)
+        await db.commit()
+        return account
+
+    account = _run(create)
+    yield account
+
+    async def drop(db):
+        await db.execute(delete(User).where(User.id == account.user_id))
+        await db.commit()
+
+    _run(drop)
+
+
+def test_import_statement_end_to_end(account, tmp_path, monkeypatch):
+    fake = _FakeRedis()
+    monkeypatch.setattr(statement_import.aioredis, "from_url", lambda url: fake)
+    monkeypatch.setattr(
+        statement_import,
+        "get_engine",
+        lambda: create_async_engine(TEST_DB_URL, poolclass=NullPool),
+    )
+    upload = tmp_path / "job-1.csv"
+    shutil.copyfile(STATEMENT, upload)
+
+    import_statement(
+        "job-1", account.user_id, account.id, None, "csv", str(upload), "%Y-%m-%d"
+    )
+
+    status = json.loads(fake.data[import_status_key("job-1")])
+    assert status["status"] == "ready"
+    assert (status["imported"], status["skipped_debits"]) == (2, 1)
+    assert (status["snapshots"], status["error_count"]) == (3, 1)
+    assert not upload.exists()
+
+    async def stored(db):
+        transactions = await db.execute(
+            select(Transaction.date, Transaction.amount)
+            .where(Transaction.user_id == account.user_id)
+            .order_by(Transaction.date)
+        )
+        snapshots = await db.scalars(
+            select(BalanceSnapshot.amount)
+            .where(BalanceSnapshot.storage_account_id == account.id)
+            .order_by(BalanceSnapshot.date)
+        )
+        return transactions.all(), snapshots.all()
+
+    transactions, snapshots = _run(stored)
+    assert [tuple(t) for t in transactions] == [
+        (date(2025, 3, 1), Decimal("2500.00")),
+        (date(2025, 3, 3), Decimal("15.00")),
+    ]
+    assert snapshots == [Decimal("2500.00"), Decimal("1600.00"), Decimal("1615.00")]
@@ -0,0 +1,51 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select
+
+from app.core.security import create_refresh_token
+from app.models.refresh_token import RefreshToken
+from app.tasks.token_purge import purge_batch
+
+
+async def _token(db_session, user, *, revoked=False, expires_in=timedelta(days=1)):
+    token = RefreshToken(
+        user_id=user.id,
+        token_hash=create_refresh_token()[1],
+        expires_at=datetime.now(timezone.utc) + expires_in,
+        revoked=revoked,
+    )
+    db_session.add(token)
+    await db_session.flush()
+    return token
+
+
+async def test_purge_deletes_revoked_and_expired(db_session, test_user, other_user):
+    live = await _token(db_session, test_user)
+    await _token(db_session, test_user, revoked=True)
+    await _token(db_session, other_user, expires_in=timedelta(days=-1))
+
+    deleted = await purge_batch(db_session, datetime.now(timezone.utc), 100)
+
+    assert deleted == 2
+    remaining = (await db_session.scalars(select(RefreshToken.id))).all()
+    assert remaining == [live.id]
+
+
+async def test_purge_stops_at_batch_size(db_session, test_user):
+    for _ in range(3):
+        await _token(db_session, test_user, revoked=True)
+    now = datetime.now(timezone.utc)
+    assert await purge_batch(db_session, now, 2) == 2
+    assert await purge_batch(db_session, now, 2) == 1
+    assert await purge_batch(db_session, now, 2) == 0
+
+
+async def test_login_leaves_dead_tokens_to_the_purge(client, test_user, db_session):
+    await _token(db_session, test_user, revoked=True)
+    resp = await client.post(
+        "/api/auth/login",
+        json={"email": "test@wallet.app", "password": "Test1234"},
+    )
+    assert resp.status_code == 200
+    tokens = (await db_session.scalars(select(RefreshToken.revoked))).all()
+    assert sorted(tokens) == [False, True]
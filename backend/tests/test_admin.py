@@ -0,0 +1,29 @@
+from app.admin.views import UserAdmin
+from app.core.user_cache import cache_user, get_cached_user
+from app.models.user import User
+
+
+async def test_admin_site_is_built_on_first_request(client):
+    resp = await client.get("/admin/login")
+    assert resp.status_code == 200
+    # Asset links are resolved through url_for on the mount.
+    assert "/admin/statics/" in resp.text
+
+
+async def test_admin_requires_login(client):
+    resp = await client.get("/admin/")
+    assert resp.status_code == 302
+    assert resp.headers["location"].endswith("/admin/login")
+
+
+async def test_admin_edit_and_delete_drop_the_cached_user():
+    user = User(id=1, email="admin-edited@wallet.app", token_version=3)
+    admin = UserAdmin()
+
+    await cache_user(user)
+    await admin.after_model_change({}, user, False, None)
+    assert await get_cached_user(1, 3) is None
+
+    await admin.after_model_delete(user, None)
+    await cache_user(user)
+    assert await get_cached_user(1, 3) is None
@@ -0,0 +1,54 @@
+"""Cold-start imports of the API and the Celery workers.
+
+Each statement runs in a fresh interpreter under ``python -X importtime``.
+Modules only needed on rarely used paths must not load at startup. Wall
+clock time is not asserted: it varies too much between machines to tell
+an eager import from a slow runner.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+API = "import app.main"
+WORKER = (
+    "import importlib\n"
+    "from app.celery_app import celery_app\n"
+    "for name in celery_app.conf.include:\n"
+    "    importlib.import_module(name)\n"
+)
+
+
+def _imported(statement: str) -> set[str]:
+    """Top-level package of every module the statement imports."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=BACKEND_DIR,
+    )
+    loaded = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        name = line.rpartition("|")[2]
+        loaded.add(name.strip().partition(".")[0])
+    return loaded
+
+
+@pytest.mark.parametrize(
+    ("statement", "deferred"),
+    [
+        pytest.param(API, {"sqladmin", "openpyxl"}, id="api"),
+        pytest.param(
+            WORKER, {"sqladmin", "babel", "fastapi", "faststream"}, id="worker"
+        ),
+    ],
+)
+def test_startup_imports(statement, deferred):
+    assert not deferred & _imported(statement)
@@ -7,5 +7,5 @@ cleanup() {
 }
 trap cleanup EXIT
 
-$COMPOSE build backend
-$COMPOSE run --rm -T backend
+$COMPOSE build backend report-service
+$COMPOSE run --rm -T backend && $COMPOSE run --rm -T report-service
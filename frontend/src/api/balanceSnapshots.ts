@@ -21,6 +21,7 @@ export const balanceSnapshotsApi = {
     limit?: number
   }) =>
     api.get<BalanceSnapshot[]>('/balance-snapshots/', { params }),
+  // Replaces the account's balance for that date, if it already has one.
   create: (data: BalanceSnapshotCreate) => api.post<BalanceSnapshot>('/balance-snapshots/', data),
   update: (id: number, data: Partial<BalanceSnapshotCreate>) =>
     api.put<BalanceSnapshot>(`/balance-snapshots/${id}`, data),
@@ -1,7 +1,10 @@
 import api from './client'
 
+export type ReportFormat = 'xlsx' | 'csv' | 'parquet'
+
 export const reportsApi = {
-  requestExport: () => api.post<{ job_id: string }>('/reports/export'),
+  requestExport: (format: ReportFormat = 'xlsx') =>
+    api.post<{ job_id: string; status: string }>('/reports/export', null, { params: { format } }),
   getStatus: (jobId: string) => api.get<{ status: string }>(`/reports/export/${jobId}/status`),
   downloadExport: (jobId: string) =>
     api.get(`/reports/export/${jobId}/download`, { responseType: 'blob' }),
@@ -1,13 +1,45 @@
+import logging
 from collections.abc import AsyncGenerator
 
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 engine = create_async_engine(settings.DATABASE_URL, echo=False)
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
+read_engine = (
+    create_async_engine(settings.DATABASE_READ_URL, echo=False)
+    if settings.DATABASE_READ_URL
+    else engine
+)
+read_session = async_sessionmaker(
+    read_engine, class_=AsyncSession, expire_on_commit=False
+)
+
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with async_session() as session:
         yield session
+
+
+async def session_for(redis: Redis, user_id: int) -> async_sessionmaker[AsyncSession]:
+    """The sessionmaker an export for ``user_id`` should read from.
+
+    The backend marks a user in Redis for READ_YOUR_WRITES_SECONDS after each
+    of their writes (backend/app/core/replica.py). While the mark is there
+    the replica may not have the write yet, so the export reads the primary.
+    """
+    if read_engine is engine:
+        return async_session
+    try:
+        wrote = await redis.exists(f"db:wrote:{user_id}")
+    except RedisError:
+        # Without the shared record, the primary is the only safe answer.
+        logger.warning("Could not check recent writes for read routing", exc_info=True)
+        return async_session
+    return async_session if wrote else read_session
@@ -0,0 +1,84 @@
+"""Prometheus metrics for report generation, served at /metrics."""
+
+import logging
+
+from prometheus_client import Counter, Gauge, Histogram
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from wallet_sdk.messaging.topics import REPORT_REQUESTED
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CONSUMER_GROUP = "report-service"
+
+REPORT_GENERATION_SECONDS = Histogram(
+    "report_generation_seconds",
+    "Time from picking up a report request to the file being written.",
+    buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300),
+)
+REPORT_SIZE_BYTES = Histogram(
+    "report_size_bytes",
+    "Size of the generated report file.",
+    buckets=(10_000, 50_000, 100_000, 500_000, 1e6, 5e6, 10e6, 50e6, 100e6),
+)
+REPORT_SECONDS_PER_MB = Histogram(
+    "report_generation_seconds_per_mb",
+    "Generation time divided by output size, comparable across report sizes.",
+    buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100),
+)
+REPORT_FAILURES = Counter(
+    "report_failures_total", "Report requests that raised instead of completing."
+)
+REPORT_DEAD_LETTERS = Counter(
+    "report_dead_letters_total",
+    "Report requests moved to the dead-letter stream after failing every delivery.",
+)
+QUEUE_LAG = Gauge(
+    "report_queue_lag",
+    f"Entries in {REPORT_REQUESTED} not yet delivered to the consumer group.",
+)
+QUEUE_PENDING = Gauge(
+    "report_queue_pending",
+    "Entries delivered to a consumer but not yet acknowledged.",
+)
+
+_redis: Redis | None = None
+
+
+def observe_report(seconds: float, size_bytes: int) -> None:
+    REPORT_GENERATION_SECONDS.observe(seconds)
+    REPORT_SIZE_BYTES.observe(size_bytes)
+    if size_bytes:
+        REPORT_SECONDS_PER_MB.observe(seconds / (size_bytes / 1_000_000))
+
+
+async def refresh_queue_depth() -> None:
+    """Read the consumer group's lag and pending count from XINFO GROUPS.
+
+    Called on each scrape rather than on a timer, so the gauges are never
+    older than the scrape itself. A Redis error leaves the previous values.
+    """
+    global _redis
+    if _redis is None:
+        _redis = Redis.from_url(settings.REDIS_URL, decode_responses=True)
+    try:
+        groups = await _redis.xinfo_groups(REPORT_REQUESTED)
+    except RedisError:
+        # Also raised before the first request, while the stream does not exist.
+        logger.warning("Could not read %s consumer groups", REPORT_REQUESTED)
+        return
+    for group in groups:
+        if group["name"] == CONSUMER_GROUP:
+            # "lag" is absent before Redis 7 and None when it cannot be computed.
+            QUEUE_LAG.set(group.get("lag") or 0)
+            QUEUE_PENDING.set(group["pending"])
+
+
+async def close_redis() -> None:
+    global _redis
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
@@ -1,19 +1,32 @@
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
+from fastapi.responses import Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 
+from app.core.metrics import close_redis, refresh_queue_depth
 from app.messaging import consumers  # noqa: F401 — registers @broker.subscriber handlers
 from app.messaging.broker import broker
+from app.reports.export import shutdown_render_pool
 
 
 @asynccontextmanager
 async def lifespan(_: FastAPI):
     await broker.start()
     yield
-    await broker.close()
+    await broker.stop()
+    shutdown_render_pool()
+    await close_redis()
 
 
-# No HTTP routes: reports are requested over the message bus and downloaded
-# through the backend, which checks job ownership. Serving files from here meant
-# an unauthenticated endpoint that handed any user's export to any caller.
+# No routes beyond /metrics: reports are requested over the message bus and
+# downloaded through the backend, which checks job ownership. Serving files from
+# here meant an unauthenticated endpoint that handed any user's export to any
+# caller.
 app = FastAPI(title="Wallet Report Service", lifespan=lifespan)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    await refresh_queue_depth()
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
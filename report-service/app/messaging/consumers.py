@@ -1,31 +1,115 @@
 import logging
+import time
 from pathlib import Path
 
 from faststream.redis import StreamSub
+from faststream.redis.annotations import Redis, RedisStreamMessage
 
 from wallet_sdk.messaging.schemas import ReportCompletedMsg, ReportRequestedMsg
-from wallet_sdk.messaging.topics import REPORT_COMPLETED, REPORT_REQUESTED
+from wallet_sdk.messaging.topics import (
+    REPORT_COMPLETED,
+    REPORT_REQUESTED,
+    REPORT_REQUESTED_DEAD,
+)
 
 from app.core.config import settings
-from app.core.database import async_session
+from app.core.database import session_for
+from app.core.metrics import (
+    CONSUMER_GROUP,
+    REPORT_DEAD_LETTERS,
+    REPORT_FAILURES,
+    observe_report,
+)
 from app.messaging.broker import broker
-from app.reports.excel import generate_account_export
+from app.reports.export import write_account_export
 
 logger = logging.getLogger(__name__)
 
+completed = broker.publisher(stream=REPORT_COMPLETED)
 
-@broker.subscriber(stream=StreamSub(REPORT_REQUESTED, group="report-service", consumer="report-service-1"))
-@broker.publisher(stream=REPORT_COMPLETED)
-async def handle_report_requested(msg: ReportRequestedMsg) -> ReportCompletedMsg:
-    logger.info("Generating report job=%s user=%s", msg.job_id, msg.user_id)
+
+# Two subscriptions feed the same handler. The first reads new requests; the
+# second sweeps the group's pending list with XAUTOCLAIM and takes over any
+# entry left unacknowledged for REPORT_CLAIM_IDLE_SECONDS, whether its replica
+# died mid-report or the report raised. A failed report is not acknowledged,
+# so it stays pending and comes back through the sweep until it succeeds or
+# runs out of deliveries.
+#
+# Reads are capped at REPORT_CONCURRENCY entries: an uncapped XREADGROUP hands
+# the whole backlog to whichever replica asks first, and the others sit idle.
+@broker.subscriber(
+    stream=StreamSub(
+        REPORT_REQUESTED,
+        group=CONSUMER_GROUP,
+        consumer=settings.REPORT_CONSUMER_NAME,
+        max_records=settings.REPORT_CONCURRENCY,
+    ),
+    max_workers=settings.REPORT_CONCURRENCY,
+)
+@broker.subscriber(
+    stream=StreamSub(
+        REPORT_REQUESTED,
+        group=CONSUMER_GROUP,
+        consumer=settings.REPORT_CONSUMER_NAME,
+        min_idle_time=settings.REPORT_CLAIM_IDLE_SECONDS * 1000,
+        polling_interval=settings.REPORT_CLAIM_INTERVAL_SECONDS * 1000,
+    ),
+)
+async def handle_report_requested(
+    msg: ReportRequestedMsg, message: RedisStreamMessage, redis: Redis
+) -> None:
+    stream_id = message.raw_message["message_ids"][0].decode()
+    deliveries = await _delivery_count(redis, stream_id)
+    if deliveries is None:
+        # Another replica finished it after this one claimed it.
+        logger.info("Skipping report job=%s, already acknowledged", msg.job_id)
+        return
+    if deliveries > settings.REPORT_MAX_DELIVERIES:
+        # Returning acknowledges the original, so the sweep stops retrying it.
+        await broker.publish(
+            msg,
+            stream=REPORT_REQUESTED_DEAD,
+            headers={"deliveries": str(deliveries - 1), "stream-id": stream_id},
+        )
+        REPORT_DEAD_LETTERS.inc()
+        logger.error(
+            "Dead-lettered report job=%s after %d failed deliveries",
+            msg.job_id,
+            deliveries - 1,
+        )
+        return
+
+    logger.info(
+        "Generating %s report job=%s user=%s", msg.format.value, msg.job_id, msg.user_id
+    )
+    started = time.perf_counter()
     try:
-        async with async_session() as db:
-            excel_bytes = await generate_account_export(db, msg.user_id)
-        output_path = Path(settings.REPORTS_DIR) / f"{msg.job_id}.xlsx"
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        output_path.write_bytes(excel_bytes)
+        output_path = (
+            Path(settings.REPORTS_DIR) / f"{msg.job_id}.{msg.format.extension}"
+        )
+        sessions = await session_for(redis, msg.user_id)
+        async with sessions() as db:
+            size, version = await write_account_export(
+                db, msg.user_id, output_path, msg.format
+            )
+        observe_report(time.perf_counter() - started, size)
         logger.info("Report saved to %s", output_path)
-        return ReportCompletedMsg(job_id=msg.job_id)
     except Exception:
-        logger.exception("Failed to generate report job=%s", msg.job_id)
+        REPORT_FAILURES.inc()
+        logger.exception(
+            "Failed to generate report job=%s (delivery %d)", msg.job_id, deliveries
+        )
         raise
+    await completed.publish(ReportCompletedMsg(job_id=msg.job_id, data_version=version))
+
+
+async def _delivery_count(redis: Redis, stream_id: str) -> int | None:
+    """Times the group has handed out ``stream_id``, this delivery included.
+
+    XREADGROUP and XAUTOCLAIM both count a delivery in the entry's pending
+    record, which XPENDING reports. None if the entry is no longer pending.
+    """
+    entries = await redis.xpending_range(
+        REPORT_REQUESTED, CONSUMER_GROUP, min=stream_id, max=stream_id, count=1
+    )
+    return entries[0]["times_delivered"] if entries else None
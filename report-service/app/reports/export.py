@@ -0,0 +1,379 @@
+import asyncio
+import multiprocessing
+import os
+import queue
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import suppress
+from dataclasses import dataclass
+from multiprocessing.managers import SyncManager
+from pathlib import Path
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from wallet_sdk.messaging.schemas import ReportFormat
+
+from app.core.config import settings
+from app.models import (
+    BalanceSnapshot,
+    Currency,
+    ExpenseCategory,
+    IncomeSource,
+    StorageAccount,
+    StorageLocation,
+    Transaction,
+)
+from app.reports.render import SPOOL_SUFFIX, Column, render_report
+from app.reports.version import user_data_version
+
+# Rows fetched per round trip for the sheets that can grow without bound, and
+# so the most rows in one batch sent to the renderer.
+FETCH_SIZE = 2000
+# Batches queued ahead of the renderer. The fetch side is much faster, so
+# this is what bounds the rows held in memory.
+RENDER_QUEUE_BATCHES = 4
+
+# One worker per export that can run at once: a worker is busy for the whole
+# of its export. Both are created on first use, so importing this module
+# starts no processes.
+_render_pool: ProcessPoolExecutor | None = None
+_manager: SyncManager | None = None
+
+
+def _render_resources() -> tuple[ProcessPoolExecutor, SyncManager]:
+    global _render_pool, _manager
+    if _render_pool is None:
+        # Forking a process that runs an event loop and driver threads can
+        # copy a held lock into the child; spawned workers start clean.
+        context = multiprocessing.get_context("spawn")
+        _manager = context.Manager()
+        _render_pool = ProcessPoolExecutor(
+            max_workers=settings.REPORT_CONCURRENCY, mp_context=context
+        )
+    return _render_pool, _manager
+
+
+def shutdown_render_pool(pool: ProcessPoolExecutor | None = None) -> None:
+    """Shut the render pool down, or only ``pool`` if it is still current.
+
+    An export that found its pool broken passes that pool: another export
+    may already have replaced it, and the new one must be left alone.
+    """
+    global _render_pool, _manager
+    if _render_pool is not None and pool in (None, _render_pool):
+        _render_pool.shutdown(cancel_futures=True)
+        _manager.shutdown()
+        _render_pool = _manager = None
+
+
+def _start_render(fmt: ReportFormat, path: str):
+    """Submit a render_report call; return the pool, its queue and future."""
+    pool, manager = _render_resources()
+    batches = manager.Queue(maxsize=RENDER_QUEUE_BATCHES)
+    try:
+        render = asyncio.get_running_loop().run_in_executor(
+            pool, render_report, fmt.value, path, batches
+        )
+    except BrokenProcessPool:
+        # A worker died while the pool sat idle, so nothing saw it go; start
+        # a new pool rather than fail this export and every one after it.
+        shutdown_render_pool(pool)
+        pool, manager = _render_resources()
+        batches = manager.Queue(maxsize=RENDER_QUEUE_BATCHES)
+        render = asyncio.get_running_loop().run_in_executor(
+            pool, render_report, fmt.value, path, batches
+        )
+    return pool, batches, render
+
+
+class _RenderFeed:
+    """The producer's end of the queue into a render_report call."""
+
+    def __init__(self, batches, render: asyncio.Future) -> None:
+        self._batches = batches
+        self._render = render
+
+    async def _put(self, item: tuple) -> None:
+        # A renderer that has died reads nothing more, so a blocking put
+        # would wait forever; time out and check on it instead.
+        while not self._render.done():
+            try:
+                await asyncio.to_thread(self._batches.put, item, True, 1.0)
+                return
+            except queue.Full:
+                continue
+        self._render.result()
+        raise RuntimeError("report renderer exited before the export was complete")
+
+    async def sheet(self, title: str, columns: list[Column]) -> None:
+        await self._put(("sheet", title, columns))
+
+    async def rows(self, rows: list[list]) -> None:
+        if rows:
+            await self._put(("rows", rows))
+
+    async def finish(self, save: bool) -> None:
+        await self._put(("done",) if save else ("abandon",))
+
+
+async def write_account_export(
+    db: AsyncSession, user_id: int, path: Path, fmt: ReportFormat = ReportFormat.xlsx
+) -> tuple[int, str]:
+    """Write the user's export to ``path``; return its size in bytes and the
+    version of the user's data it shows.
+
+    Rows are streamed from the database as plain tuples and sent in batches
+    to a worker in the render pool, which writes them in ``fmt``: a
+    write-only workbook, or a zip of one CSV or Parquet file per sheet. The
+    event loop never builds a cell, and memory on both sides stays flat
+    however many rows the user has. The file is saved under a temporary name
+    next to ``path`` and renamed over it, so the backend never serves a
+    half-written report.
+
+    ``db`` must not have begun a transaction: the export runs in one at
+    REPEATABLE READ, so every sheet and the version come from one snapshot.
+    On a lagging replica that snapshot can be older than the request, and
+    the version says so.
+    """
+    await db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+    version = await user_data_version(db, user_id)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+    )
+    os.close(fd)
+    try:
+        pool, batches, render = _start_render(fmt, tmp_name)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+    feed = _RenderFeed(batches, render)
+    try:
+        lookups = await _load_lookups(db, user_id)
+        await _sheet_transactions(feed, db, user_id, lookups)
+        await _sheet_balance_snapshots(feed, db, user_id, lookups)
+        await _sheet_storage_accounts(feed, lookups)
+        await _sheet_income_sources(feed, db, user_id)
+        await _sheet_expense_categories(feed, db, user_id)
+        await _sheet_currencies(feed, db, user_id)
+        await feed.finish(save=True)
+        await render
+        # mkstemp creates the file 0600; the backend serves it from another
+        # container and needs to read it.
+        os.chmod(tmp_name, 0o644)
+        os.replace(tmp_name, path)
+    except BaseException:
+        if not render.done():
+            # Free the worker rather than leave it waiting on the queue.
+            await feed.finish(save=False)
+        (outcome,) = await asyncio.gather(render, return_exceptions=True)
+        if isinstance(outcome, BrokenProcessPool):
+            # A worker died (the OOM killer, most likely) and the pool refuses
+            # all further work; the next export starts a new one.
+            shutdown_render_pool(pool)
+        for leftover in (tmp_name, tmp_name + SPOOL_SUFFIX):
+            with suppress(FileNotFoundError):
+                os.unlink(leftover)
+        raise
+    return path.stat().st_size, version
+
+
+@dataclass
+class _Account:
+    location: str
+    currency_code: str
+    currency_symbol: str
+
+
+@dataclass
+class _Lookups:
+    """Names the big sheets refer to by id, loaded once per export.
+
+    A user has a handful of accounts, currencies and income sources against
+    up to millions of transactions, so resolving them from dicts beats
+    joining them onto every streamed row. An id with no name, such as the
+    income source of an expense, is written as None like any other missing
+    value, so each format shows it as its own null.
+    """
+
+    accounts: dict[int, _Account]
+    currency_codes: dict[int, str]
+    income_sources: dict[int, str]
+
+
+async def _load_lookups(db: AsyncSession, user_id: int) -> _Lookups:
+    accounts = await db.execute(
+        select(StorageAccount.id, StorageLocation.name, Currency.code, Currency.symbol)
+        .join(StorageLocation, StorageAccount.storage_location_id == StorageLocation.id)
+        .join(Currency, StorageAccount.currency_id == Currency.id)
+        .where(StorageAccount.user_id == user_id)
+    )
+    currencies = await db.execute(
+        select(Currency.id, Currency.code).where(Currency.user_id == user_id)
+    )
+    sources = await db.execute(
+        select(IncomeSource.id, IncomeSource.name).where(
+            IncomeSource.user_id == user_id
+        )
+    )
+    return _Lookups(
+        accounts={id_: _Account(*rest) for id_, *rest in accounts},
+        currency_codes={id_: code for id_, code in currencies},
+        income_sources={id_: name for id_, name in sources},
+    )
+
+
+async def _sheet_transactions(
+    feed: _RenderFeed, db: AsyncSession, user_id: int, lookups: _Lookups
+) -> None:
+    await feed.sheet(
+        "Transactions",
+        [
+            Column("Date", "date"),
+            Column("Type"),
+            Column("Amount", "decimal", 28, 8),
+            Column("Currency"),
+            Column("Storage Location"),
+            Column("Income Source"),
+            Column("Description"),
+        ],
+    )
+
+    result = await db.stream(
+        select(
+            Transaction.date,
+            Transaction.type,
+            Transaction.amount,
+            Transaction.currency_id,
+            Transaction.storage_account_id,
+            Transaction.income_source_id,
+            Transaction.description,
+        )
+        .where(Transaction.user_id == user_id)
+        .order_by(Transaction.date.desc())
+        .execution_options(yield_per=FETCH_SIZE)
+    )
+    async for rows in result.partitions():
+        batch = []
+        for (
+            tx_date,
+            tx_type,
+            amount,
+            currency_id,
+            account_id,
+            source_id,
+            description,
+        ) in rows:
+            account = lookups.accounts.get(account_id)
+            batch.append(
+                [
+                    tx_date,
+                    tx_type.value,
+                    amount,
+                    lookups.currency_codes.get(currency_id),
+                    account.location if account else None,
+                    lookups.income_sources.get(source_id),
+                    description,
+                ]
+            )
+        await feed.rows(batch)
+
+
+async def _sheet_balance_snapshots(
+    feed: _RenderFeed, db: AsyncSession, user_id: int, lookups: _Lookups
+) -> None:
+    await feed.sheet(
+        "Balance Snapshots",
+        [
+            Column("Date", "date"),
+            Column("Storage Location"),
+            Column("Currency"),
+            Column("Amount", "decimal", 28, 8),
+        ],
+    )
+
+    result = await db.stream(
+        select(
+            BalanceSnapshot.date,
+            BalanceSnapshot.storage_account_id,
+            BalanceSnapshot.amount,
+        )
+        .where(BalanceSnapshot.user_id == user_id)
+        .order_by(BalanceSnapshot.date.desc())
+        .execution_options(yield_per=FETCH_SIZE)
+    )
+    async for rows in result.partitions():
+        batch = []
+        for snap_date, account_id, amount in rows:
+            account = lookups.accounts.get(account_id)
+            batch.append(
+                [
+                    snap_date,
+                    account.location if account else None,
+                    account.currency_code if account else None,
+                    amount,
+                ]
+            )
+        await feed.rows(batch)
+
+
+async def _sheet_storage_accounts(feed: _RenderFeed, lookups: _Lookups) -> None:
+    await feed.sheet(
+        "Storage Accounts",
+        [Column("Location Name"), Column("Currency Code"), Column("Currency Symbol")],
+    )
+    await feed.rows(
+        [
+            [account.location, account.currency_code, account.currency_symbol]
+            for account in lookups.accounts.values()
+        ]
+    )
+
+
+async def _sheet_income_sources(
+    feed: _RenderFeed, db: AsyncSession, user_id: int
+) -> None:
+    await feed.sheet("Income Sources", [Column("Name")])
+
+    result = await db.execute(
+        select(IncomeSource.name)
+        .where(IncomeSource.user_id == user_id)
+        .order_by(IncomeSource.name)
+    )
+    await feed.rows([[name] for name in result.scalars()])
+
+
+async def _sheet_expense_categories(
+    feed: _RenderFeed, db: AsyncSession, user_id: int
+) -> None:
+    await feed.sheet(
+        "Expense Categories",
+        [Column("Name"), Column("Budgeted Amount", "decimal", 12, 2), Column("Tags")],
+    )
+
+    result = await db.execute(
+        select(
+            ExpenseCategory.name, ExpenseCategory.budgeted_amount, ExpenseCategory.tags
+        )
+        .where(ExpenseCategory.user_id == user_id)
+        .order_by(ExpenseCategory.name)
+    )
+    await feed.rows(
+        [
+            [name, budgeted_amount, ", ".join(tags) if tags else ""]
+            for name, budgeted_amount, tags in result
+        ]
+    )
+
+
+async def _sheet_currencies(feed: _RenderFeed, db: AsyncSession, user_id: int) -> None:
+    await feed.sheet("Currencies", [Column("Code"), Column("Symbol"), Column("Name")])
+
+    result = await db.execute(
+        select(Currency.code, Currency.symbol, Currency.name)
+        .where(Currency.user_id == user_id)
+        .order_by(Currency.code)
+    )
+    await feed.rows([[code, symbol, name] for code, symbol, name in result])
@@ -0,0 +1,247 @@
+"""Report rendering, run in the report-service process pool.
+
+openpyxl builds every cell in pure Python, and the CSV and Parquet writers
+convert every value, so writing a large export holds the GIL for as long as
+it takes. Here it runs in a worker process fed over a queue, while the
+consumer's event loop only fetches rows and keeps reading and acknowledging
+other messages. Workers import this module and nothing of the app beyond it,
+so they start without SQLAlchemy or the settings.
+
+The queue carries tagged tuples:
+
+    ("sheet", title, columns)  start a new sheet
+    ("rows", rows)             append a batch of rows to the current sheet
+    ("done",)                  finish the report at ``path`` and return
+    ("abandon",)               return without finishing it
+
+Rows hold plain values: str, date, Decimal or None. Each format decides how
+to write them.
+"""
+
+import csv
+import io
+import os
+import zipfile
+from typing import NamedTuple
+
+# Rows per Parquet row group. Readers skip and parallelise by row group, so
+# they should be far larger than the batches the queue carries; batches are
+# converted to Arrow as they arrive and buffered until this many rows are in.
+PARQUET_ROW_GROUP_ROWS = 65_536
+# Appended to the report's path to name the file a Parquet sheet is spooled
+# to, so that the producer can remove it if a worker dies mid-sheet.
+SPOOL_SUFFIX = ".sheet"
+
+
+class Column(NamedTuple):
+    name: str
+    kind: str = "text"  # "text" | "date" | "decimal"
+    precision: int = 0
+    scale: int = 0
+
+
+def _sheet_filename(title: str, extension: str) -> str:
+    return f"{title.lower().replace(' ', '_')}.{extension}"
+
+
+class _Workbook:
+    """XLSX, one worksheet per sheet. Dates are ISO text and amounts floats."""
+
+    def __init__(self, path: str) -> None:
+        import openpyxl
+
+        self._path = path
+        self._wb = openpyxl.Workbook(write_only=True)
+        self._ws = None
+        self._converters = []
+
+    def sheet(self, title: str, columns: list[Column]) -> None:
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Alignment, Font, PatternFill
+
+        self._ws = self._wb.create_sheet(title)
+        cells = []
+        for column in columns:
+            cell = WriteOnlyCell(self._ws, value=column.name)
+            cell.font = Font(bold=True)
+            cell.fill = PatternFill("solid", fgColor="D9E1F2")
+            cell.alignment = Alignment(horizontal="center")
+            cells.append(cell)
+        self._ws.append(cells)
+        self._converters = [_XLSX_CONVERTERS[column.kind] for column in columns]
+
+    def rows(self, rows: list) -> None:
+        converters = self._converters
+        for row in rows:
+            self._ws.append([convert(value) for convert, value in zip(converters, row)])
+
+    def finish(self) -> None:
+        self._wb.save(self._path)
+
+    def abandon(self) -> None:
+        # Nothing will save these sheets, so remove the files openpyxl
+        # spooled their rows to; a worker outlives many exports.
+        for sheet in self._wb.worksheets:
+            sheet.close()
+            sheet._writer.cleanup()
+
+
+_XLSX_CONVERTERS = {
+    "text": lambda value: "" if value is None else value,
+    "date": lambda value: value.isoformat(),
+    "decimal": lambda value: float(value),
+}
+
+
+class _CsvBundle:
+    """A zip of CSV files, one per sheet, with amounts at full precision."""
+
+    def __init__(self, path: str) -> None:
+        self._zip = zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED)
+        self._file = None
+        self._writer = None
+        self._decimals = []
+
+    def _close_sheet(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def sheet(self, title: str, columns: list[Column]) -> None:
+        self._close_sheet()
+        member = self._zip.open(_sheet_filename(title, "csv"), "w", force_zip64=True)
+        self._file = io.TextIOWrapper(member, encoding="utf-8", newline="")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow([column.name for column in columns])
+        self._decimals = [
+            i for i, column in enumerate(columns) if column.kind == "decimal"
+        ]
+
+    def rows(self, rows: list) -> None:
+        if self._decimals:
+            rows = [list(row) for row in rows]
+            for row in rows:
+                for i in self._decimals:
+                    # str() would give "0E-8" for a zero numeric(28, 8).
+                    row[i] = format(row[i], "f")
+        self._writer.writerows(rows)
+
+    def finish(self) -> None:
+        self._close_sheet()
+        self._zip.close()
+
+    def abandon(self) -> None:
+        self._close_sheet()
+        self._zip.close()
+
+
+class _ParquetBundle:
+    """A zip of Parquet files, one per sheet, with typed columns."""
+
+    def __init__(self, path: str) -> None:
+        # Parquet pages are compressed already; deflating them again is wasted.
+        self._zip = zipfile.ZipFile(path, "w", compression=zipfile.ZIP_STORED)
+        # Each sheet is spooled next to the report, where its disk space is,
+        # and copied into the zip once complete.
+        self._spool = path + SPOOL_SUFFIX
+        self._writer = None
+        self._member = ""
+        self._schema = None
+        self._buffered = []
+        self._buffered_rows = 0
+
+    def _flush(self) -> None:
+        import pyarrow as pa
+
+        if self._buffered:
+            self._writer.write_table(
+                pa.Table.from_batches(self._buffered),
+                row_group_size=PARQUET_ROW_GROUP_ROWS,
+            )
+        self._buffered = []
+        self._buffered_rows = 0
+
+    def _close_sheet(self, keep: bool) -> None:
+        if self._writer is None:
+            return
+        try:
+            if keep:
+                self._flush()
+            self._writer.close()
+            if keep:
+                self._zip.write(self._spool, self._member)
+        finally:
+            self._writer = None
+            self._buffered = []
+            self._buffered_rows = 0
+            os.unlink(self._spool)
+
+    def sheet(self, title: str, columns: list[Column]) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self._close_sheet(keep=True)
+        self._member = _sheet_filename(title, "parquet")
+        self._schema = pa.schema(
+            [pa.field(column.name, _parquet_type(column)) for column in columns]
+        )
+        self._writer = pq.ParquetWriter(self._spool, self._schema, compression="zstd")
+
+    def rows(self, rows: list) -> None:
+        import pyarrow as pa
+
+        # Arrow holds the rows in a fraction of the memory of the tuples.
+        columns = zip(*rows)
+        self._buffered.append(
+            pa.record_batch(
+                [
+                    pa.array(values, type=field.type)
+                    for values, field in zip(columns, self._schema)
+                ],
+                schema=self._schema,
+            )
+        )
+        self._buffered_rows += len(rows)
+        if self._buffered_rows >= PARQUET_ROW_GROUP_ROWS:
+            self._flush()
+
+    def finish(self) -> None:
+        self._close_sheet(keep=True)
+        self._zip.close()
+
+    def abandon(self) -> None:
+        self._close_sheet(keep=False)
+        self._zip.close()
+
+
+def _parquet_type(column: Column):
+    import pyarrow as pa
+
+    if column.kind == "date":
+        return pa.date32()
+    if column.kind == "decimal":
+        return pa.decimal128(column.precision, column.scale)
+    return pa.string()
+
+
+_RENDERERS = {"xlsx": _Workbook, "csv": _CsvBundle, "parquet": _ParquetBundle}
+
+
+def render_report(fmt: str, path: str, batches) -> bool:
+    """Write the report in format ``fmt`` to ``path`` from ``batches``.
+
+    Returns False when the producer abandoned the export.
+    """
+    renderer = _RENDERERS[fmt](path)
+    while True:
+        tag, *args = batches.get()
+        if tag == "sheet":
+            renderer.sheet(*args)
+        elif tag == "rows":
+            renderer.rows(args[0])
+        elif tag == "done":
+            renderer.finish()
+            return True
+        else:
+            renderer.abandon()
+            return False
@@ -0,0 +1,52 @@
+import hashlib
+
+from sqlalchemy import func, literal, literal_column, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import (
+    BalanceSnapshot,
+    Currency,
+    ExpenseCategory,
+    IncomeSource,
+    StorageAccount,
+    StorageLocation,
+    Transaction,
+)
+
+# Every table the export reads.
+_EXPORTED_MODELS = (
+    Transaction,
+    BalanceSnapshot,
+    StorageAccount,
+    StorageLocation,
+    IncomeSource,
+    ExpenseCategory,
+    Currency,
+)
+
+
+async def user_data_version(db: AsyncSession, user_id: int) -> str:
+    """The version of the user's data an export made in ``db`` shows.
+
+    The backend computes the same value (backend/app/services/reports.py)
+    when a report is requested and reuses a finished report only when the
+    two match, so both must stay identical: the user's row count and the
+    sum of their rows' xmin per exported table, hashed.
+    """
+    stmt = union_all(
+        *(
+            select(
+                literal(model.__tablename__),
+                func.count(),
+                func.coalesce(
+                    func.sum(
+                        literal_column(f"{model.__tablename__}.xmin::text::bigint")
+                    ),
+                    0,
+                ),
+            ).where(model.user_id == user_id)
+            for model in _EXPORTED_MODELS
+        )
+    )
+    rows = sorted(tuple(row) for row in await db.execute(stmt))
+    return hashlib.sha256(repr(rows).encode()).hexdigest()
@@ -0,0 +1,161 @@
+"""
+Report throughput as replicas are added, and recovery of lost requests.
+
+For each replica count, starts that many consumer processes on a scratch
+Redis database, with report generation replaced by a fixed sleep so the run
+measures the consumer group rather than the database. Before they start, a
+few requests are read by a consumer that never acknowledges them, standing in
+for a replica that died mid-report, and one request is poisoned so that every
+attempt at it fails. Each run checks that the dead replica's requests are
+reclaimed and completed exactly once and that the poisoned one ends up on the
+dead-letter stream. Throughput should grow linearly with the replica count.
+
+Run from /report-service with a local Redis; REPORT_CONCURRENCY from the
+environment applies to every replica:
+    uv run python scripts/bench_consumer_scaling.py [--replicas 1 2 4] [--reports 200]
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+import subprocess
+import sys
+import time
+import uuid
+
+from faststream.redis import RedisBroker
+from redis.asyncio import Redis
+
+from wallet_sdk.messaging.schemas import ReportRequestedMsg
+from wallet_sdk.messaging.topics import (
+    REPORT_COMPLETED,
+    REPORT_REQUESTED,
+    REPORT_REQUESTED_DEAD,
+)
+
+from app.core.config import settings
+from app.core.metrics import CONSUMER_GROUP
+
+POISONED_USER = -1
+CRASHED_REQUESTS = 3
+DEADLINE_SECONDS = 120
+
+
+async def _replica(seconds_per_report: float) -> None:
+    from app.messaging import consumers
+    from app.messaging.broker import broker
+
+    async def fake_export(db, user_id, path, fmt):
+        if user_id == POISONED_USER:
+            raise RuntimeError("poisoned request")
+        await asyncio.sleep(seconds_per_report)
+        return 0, ""
+
+    consumers.write_account_export = fake_export
+    stop = asyncio.Event()
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stop.set)
+    await broker.start()
+    await stop.wait()
+    await broker.stop()
+
+
+async def _wait_for(redis: Redis, stream: str, length: int) -> float:
+    deadline = time.monotonic() + DEADLINE_SECONDS
+    while await redis.xlen(stream) < length:
+        if time.monotonic() > deadline:
+            raise SystemExit(f"timed out waiting for {length} entries on {stream}")
+        await asyncio.sleep(0.01)
+    return time.perf_counter()
+
+
+async def _run(
+    replicas: int, reports: int, seconds_per_report: float, redis_url: str
+) -> None:
+    redis = Redis.from_url(redis_url)
+    await redis.flushdb()
+    await redis.xgroup_create(REPORT_REQUESTED, CONSUMER_GROUP, id="0", mkstream=True)
+    async with RedisBroker(redis_url) as publisher:
+        for _ in range(reports):
+            await publisher.publish(
+                ReportRequestedMsg(job_id=str(uuid.uuid4()), user_id=1),
+                stream=REPORT_REQUESTED,
+            )
+        await publisher.publish(
+            ReportRequestedMsg(job_id="poisoned", user_id=POISONED_USER),
+            stream=REPORT_REQUESTED,
+        )
+    await redis.xreadgroup(
+        CONSUMER_GROUP,
+        "crashed-replica",
+        {REPORT_REQUESTED: ">"},
+        count=CRASHED_REQUESTS,
+    )
+
+    env = {
+        **os.environ,
+        "REDIS_URL": redis_url,
+        "REPORT_CLAIM_IDLE_SECONDS": "1",
+        "REPORT_CLAIM_INTERVAL_SECONDS": "1",
+    }
+    children = [
+        # The poisoned request's tracebacks are expected; everything else the
+        # replicas log is one line per report.
+        subprocess.Popen(
+            [sys.executable, __file__, "--replica", str(seconds_per_report)],
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        for _ in range(replicas)
+    ]
+    try:
+        started = await _wait_for(redis, REPORT_COMPLETED, 1)
+        finished = await _wait_for(redis, REPORT_COMPLETED, reports)
+        await _wait_for(redis, REPORT_REQUESTED_DEAD, 1)
+        # Give a duplicate delivery the chance to show up before counting.
+        await asyncio.sleep(1)
+        completed = await redis.xlen(REPORT_COMPLETED)
+        pending = (await redis.xpending(REPORT_REQUESTED, CONSUMER_GROUP))["pending"]
+    finally:
+        for child in children:
+            child.send_signal(signal.SIGTERM)
+        await asyncio.to_thread(lambda: [child.wait() for child in children])
+        await redis.flushdb()
+        await redis.aclose()
+
+    if completed != reports or pending:
+        raise SystemExit(
+            f"expected {reports} completions and nothing pending, got {completed} and {pending}"
+        )
+    throughput = (reports - 1) / (finished - started)
+    print(
+        f"{replicas:>3} replicas  {throughput:7.1f} reports/s  "
+        f"(ideal {replicas * settings.REPORT_CONCURRENCY / seconds_per_report:7.1f})  "
+        f"{CRASHED_REQUESTS} reclaimed, 1 dead-lettered"
+    )
+
+
+async def main(
+    replica_counts: list[int], reports: int, seconds_per_report: float, redis_url: str
+) -> None:
+    for replicas in replica_counts:
+        await _run(replicas, reports, seconds_per_report, redis_url)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--replicas", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--reports", type=int, default=200)
+    parser.add_argument("--seconds-per-report", type=float, default=0.05)
+    parser.add_argument("--redis-url", default="redis://localhost:6379/15")
+    parser.add_argument(
+        "--replica", type=float, metavar="SECONDS", help=argparse.SUPPRESS
+    )
+    args = parser.parse_args()
+    if args.replica is not None:
+        asyncio.run(_replica(args.replica))
+    else:
+        asyncio.run(
+            main(args.replicas, args.reports, args.seconds_per_report, args.redis_url)
+        )
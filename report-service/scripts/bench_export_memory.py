@@ -0,0 +1,171 @@
+"""
+Peak memory, time and size of report generation as the number of
+transactions grows, in each export format.
+
+For each row count, seeds a throwaway user with that many transactions
+(generated server-side with generate_series), writes their export in each
+format from a fresh subprocess and reports the peak RSS of that process and
+of its render worker, the time, the file size and the longest the event loop
+went without running. Peak RSS should stay flat from ten thousand rows to a
+million, and the loop should never wait on a cell being written. Each user is
+deleted again afterwards.
+
+Run from /report-service against a migrated database:
+    uv run python scripts/bench_export_memory.py [--rows 10000 100000 1000000] [--formats xlsx csv parquet]
+"""
+
+import argparse
+import asyncio
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+from sqlalchemy import text
+
+from wallet_sdk.messaging.schemas import ReportFormat
+
+from app.core.database import async_session
+from app.reports.export import shutdown_render_pool, write_account_export
+
+# How often the event loop should wake while an export runs; how late it
+# wakes is how long the export kept it busy.
+TICK = 0.005
+
+_SEED = (
+    "INSERT INTO users (email) VALUES (:email) RETURNING id",
+    "INSERT INTO currencies (code, symbol, user_id) VALUES ('USD', '$', :user_id)",
+    "INSERT INTO storage_locations (name, user_id) VALUES ('Bank', :user_id)",
+    "INSERT INTO income_sources (name, user_id) VALUES ('Salary', :user_id)",
+    """
+    INSERT INTO storage_accounts (storage_location_id, currency_id, user_id)
+    SELECT l.id, c.id, :user_id FROM storage_locations l, currencies c
+    WHERE l.user_id = :user_id AND c.user_id = :user_id
+    """,
+    """
+    INSERT INTO transactions
+        (user_id, type, date, amount, description, currency_id,
+         storage_account_id, income_source_id)
+    SELECT :user_id, 'income', DATE '2000-01-01' + (n % 9000),
+           (n % 100000) / 100.0, 'Transaction ' || n, a.currency_id, a.id, s.id
+    FROM generate_series(1, :rows) AS n, storage_accounts a, income_sources s
+    WHERE a.user_id = :user_id AND s.user_id = :user_id
+    """,
+)
+
+
+async def _seed(rows: int) -> int:
+    async with async_session() as db:
+        user_id = (
+            await db.execute(
+                text(_SEED[0]), {"email": f"bench-{uuid.uuid4()}@example.com"}
+            )
+        ).scalar_one()
+        for statement in _SEED[1:]:
+            await db.execute(text(statement), {"user_id": user_id, "rows": rows})
+        await db.commit()
+    return user_id
+
+
+async def _delete(user_id: int) -> None:
+    async with async_session() as db:
+        await db.execute(text("DELETE FROM users WHERE id = :id"), {"id": user_id})
+        await db.commit()
+
+
+async def _ticker(lags: list[float], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(TICK)
+        lags.append(time.perf_counter() - started - TICK)
+
+
+async def _generate(user_id: int, path: Path, fmt: ReportFormat) -> None:
+    lags: list[float] = []
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(_ticker(lags, stop))
+    started = time.perf_counter()
+    async with async_session() as db:
+        size, _ = await write_account_export(db, user_id, path, fmt)
+    seconds = time.perf_counter() - started
+    stop.set()
+    await ticker
+    shutdown_render_pool()
+    print(
+        json.dumps(
+            {
+                "seconds": seconds,
+                "size": size,
+                # Kilobytes on Linux. The largest child is the render worker,
+                # which here re-imports this script and SQLAlchemy with it, so
+                # it reads higher than under uvicorn.
+                "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+                / 1024,
+                "worker_rss_mb": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+                / 1024,
+                "max_loop_lag_ms": max(lags) * 1000,
+            }
+        )
+    )
+
+
+async def main(row_counts: list[int], formats: list[ReportFormat]) -> None:
+    with tempfile.TemporaryDirectory() as reports_dir:
+        for rows in row_counts:
+            user_id = await _seed(rows)
+            try:
+                for fmt in formats:
+                    child = await asyncio.to_thread(
+                        subprocess.run,
+                        [
+                            sys.executable,
+                            __file__,
+                            "--generate",
+                            str(user_id),
+                            reports_dir,
+                            fmt.value,
+                        ],
+                        capture_output=True,
+                        text=True,
+                        check=True,
+                    )
+                    result = json.loads(child.stdout.splitlines()[-1])
+                    print(
+                        f"{rows:>9} rows  {fmt.value:<7}  peak RSS {result['peak_rss_mb']:7.1f} MB "
+                        f"+ worker {result['worker_rss_mb']:5.1f} MB  "
+                        f"{result['seconds']:7.1f} s  {result['size'] / 1e6:7.1f} MB file  "
+                        f"loop lag max {result['max_loop_lag_ms']:6.1f} ms"
+                    )
+            finally:
+                await _delete(user_id)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument(
+        "--formats", type=ReportFormat, nargs="+", default=list(ReportFormat)
+    )
+    parser.add_argument(
+        "--generate",
+        nargs=3,
+        metavar=("USER_ID", "DIR", "FORMAT"),
+        help=argparse.SUPPRESS,
+    )
+    args = parser.parse_args()
+    if args.generate:
+        user_id, reports_dir, fmt = args.generate
+        fmt = ReportFormat(fmt)
+        asyncio.run(
+            _generate(
+                int(user_id), Path(reports_dir) / f"{user_id}.{fmt.extension}", fmt
+            )
+        )
+    else:
+        asyncio.run(main(args.rows, args.formats))
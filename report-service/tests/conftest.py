@@ -0,0 +1,61 @@
+import os
+
+import pytest
+from redis.asyncio import Redis
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from wallet_sdk.messaging.topics import REPORT_REQUESTED
+
+from app.core.config import settings
+from app.models import Base
+
+# The consumers read these when they are imported, so they are set before any
+# test module imports them. Database 15 of a local Redis is flushed around
+# every test; a failed delivery is reclaimed within a couple of seconds.
+settings.REDIS_URL = os.environ.get("TEST_REDIS_URL", "redis://localhost:6379/15")
+settings.REPORT_CONSUMER_NAME = "test-replica"
+settings.REPORT_CLAIM_IDLE_SECONDS = 1
+settings.REPORT_CLAIM_INTERVAL_SECONDS = 1
+
+TEST_DB_NAME = "wallet_report_test"
+_base_url = settings.DATABASE_URL.rsplit("/", 1)[0]
+TEST_DB_URL = f"{_base_url}/{TEST_DB_NAME}"
+
+
+@pytest.fixture()
+async def redis():
+    from app.core.metrics import CONSUMER_GROUP
+
+    client = Redis.from_url(settings.REDIS_URL)
+    await client.flushdb()
+    await client.xgroup_create(REPORT_REQUESTED, CONSUMER_GROUP, id="0", mkstream=True)
+    yield client
+    await client.flushdb()
+    await client.aclose()
+
+
+@pytest.fixture(scope="session")
+async def setup_test_db():
+    """Create the test database from the service's models, yield, then drop it."""
+    admin_engine = create_async_engine(
+        _base_url + "/postgres", isolation_level="AUTOCOMMIT"
+    )
+    async with admin_engine.connect() as conn:
+        await conn.execute(text(f"DROP DATABASE IF EXISTS {TEST_DB_NAME}"))
+        await conn.execute(text(f"CREATE DATABASE {TEST_DB_NAME}"))
+    await admin_engine.dispose()
+
+    engine = create_async_engine(TEST_DB_URL)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await engine.dispose()
+
+    yield
+
+    admin_engine = create_async_engine(
+        _base_url + "/postgres", isolation_level="AUTOCOMMIT"
+    )
+    async with admin_engine.connect() as conn:
+        await conn.execute(text(f"DROP DATABASE IF EXISTS {TEST_DB_NAME}"))
+    await admin_engine.dispose()
@@ -0,0 +1,32 @@
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.core import database
+from app.core.database import session_for
+
+
+@pytest.fixture()
+def with_replica(monkeypatch):
+    """Pretend DATABASE_READ_URL is set; no query reaches it in these tests."""
+    monkeypatch.setattr(database, "read_engine", object())
+
+
+async def test_without_replica_exports_read_the_primary(redis):
+    assert await session_for(redis, 1) is database.async_session
+
+
+async def test_exports_read_the_primary_after_the_users_write(redis, with_replica):
+    assert await session_for(redis, 1) is database.read_session
+
+    # As the backend's note_write leaves it.
+    await redis.set("db:wrote:1", b"1", ex=5)
+    assert await session_for(redis, 1) is database.async_session
+    assert await session_for(redis, 2) is database.read_session
+
+
+async def test_unreachable_redis_routes_to_primary(with_replica):
+    class _Down:
+        async def exists(self, key):
+            raise RedisConnectionError()
+
+    assert await session_for(_Down(), 1) is database.async_session
@@ -0,0 +1,139 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+from faststream.redis import RedisBroker, StreamSub
+from faststream.redis.annotations import RedisStreamMessage
+
+from wallet_sdk.messaging.schemas import ReportRequestedMsg
+from wallet_sdk.messaging.topics import (
+    REPORT_COMPLETED,
+    REPORT_REQUESTED,
+    REPORT_REQUESTED_DEAD,
+)
+
+from app.core.config import settings
+from app.core.metrics import CONSUMER_GROUP
+from app.messaging import consumers
+from app.messaging.broker import broker
+
+POISONED_USER = -1
+
+
+@pytest.fixture()
+def exports(monkeypatch):
+    """Stands in for the export: records each job and fails the poisoned user's."""
+    jobs = []
+
+    async def write_account_export(db, user_id, path, fmt):
+        jobs.append(path.stem.split(".")[0])
+        if user_id == POISONED_USER:
+            raise RuntimeError("poisoned request")
+        return 0, "v1"
+
+    monkeypatch.setattr(consumers, "write_account_export", write_account_export)
+    return jobs
+
+
+@pytest.fixture()
+async def dead_letters(redis):
+    """Requests on the dead-letter stream, with their headers, as they arrive."""
+    received = asyncio.Queue()
+    observer = RedisBroker(settings.REDIS_URL)
+
+    @observer.subscriber(stream=StreamSub(REPORT_REQUESTED_DEAD, last_id="0"))
+    async def collect(msg: ReportRequestedMsg, message: RedisStreamMessage) -> None:
+        received.put_nowait((msg, message.headers))
+
+    await observer.start()
+    yield received
+    await observer.stop()
+
+
+async def _request(redis, job_id: str, user_id: int = 1) -> str:
+    async with RedisBroker(settings.REDIS_URL) as publisher:
+        await publisher.publish(
+            ReportRequestedMsg(job_id=job_id, user_id=user_id), stream=REPORT_REQUESTED
+        )
+    ((stream_id, _),) = await redis.xrevrange(REPORT_REQUESTED, count=1)
+    return stream_id.decode()
+
+
+async def _wait_for(redis, stream: str, length: int, timeout: float = 15) -> None:
+    deadline = time.monotonic() + timeout
+    while await redis.xlen(stream) < length:
+        assert time.monotonic() < deadline, (
+            f"timed out waiting for {length} entries on {stream}"
+        )
+        await asyncio.sleep(0.05)
+
+
+async def _pending(redis) -> int:
+    return (await redis.xpending(REPORT_REQUESTED, CONSUMER_GROUP))["pending"]
+
+
+@pytest.fixture()
+async def running(redis, exports):
+    await broker.start()
+    yield
+    await broker.stop()
+
+
+async def test_request_is_completed_and_acknowledged(redis, exports, running):
+    await _request(redis, "job-1")
+    await _wait_for(redis, REPORT_COMPLETED, 1)
+
+    assert exports == ["job-1"]
+    assert await _pending(redis) == 0
+    ((_, fields),) = await redis.xrange(REPORT_COMPLETED)
+    assert b'"data_version":"v1"' in fields[b"__data__"]
+
+
+async def test_request_of_a_dead_replica_is_reclaimed(redis, exports):
+    await _request(redis, "job-1")
+    # Read, and never acknowledged, by a replica that went away.
+    await redis.xreadgroup(
+        CONSUMER_GROUP, "crashed-replica", {REPORT_REQUESTED: ">"}, count=1
+    )
+
+    await broker.start()
+    try:
+        await _wait_for(redis, REPORT_COMPLETED, 1)
+    finally:
+        await broker.stop()
+
+    assert exports == ["job-1"]
+    assert await _pending(redis) == 0
+
+
+async def test_failing_request_is_dead_lettered_after_max_deliveries(
+    redis, exports, dead_letters, running
+):
+    stream_id = await _request(redis, "poisoned", user_id=POISONED_USER)
+
+    msg, headers = await asyncio.wait_for(dead_letters.get(), timeout=15)
+
+    assert msg.job_id == "poisoned"
+    assert headers["deliveries"] == str(settings.REPORT_MAX_DELIVERIES)
+    assert headers["stream-id"] == stream_id
+    assert exports == ["poisoned"] * settings.REPORT_MAX_DELIVERIES
+    assert await _pending(redis) == 0
+    assert await redis.xlen(REPORT_COMPLETED) == 0
+
+
+async def test_request_acknowledged_by_another_replica_is_skipped(redis, exports):
+    stream_id = await _request(redis, "job-1")
+    # The replica it was claimed from finished it in the meantime.
+    await redis.xreadgroup(
+        CONSUMER_GROUP, "slow-replica", {REPORT_REQUESTED: ">"}, count=1
+    )
+    await redis.xack(REPORT_REQUESTED, CONSUMER_GROUP, stream_id)
+    message = SimpleNamespace(raw_message={"message_ids": [stream_id.encode()]})
+
+    await consumers.handle_report_requested(
+        ReportRequestedMsg(job_id="job-1", user_id=1), message, redis
+    )
+
+    assert exports == []
+    assert await redis.xlen(REPORT_COMPLETED) == 0
@@ -0,0 +1,269 @@
+import asyncio
+import csv
+import io
+import zipfile
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date
+from decimal import Decimal
+
+import openpyxl
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from wallet_sdk.messaging.schemas import ReportFormat
+
+from app.models import (
+    BalanceSnapshot,
+    Currency,
+    ExpenseCategory,
+    IncomeSource,
+    StorageAccount,
+    StorageLocation,
+    Transaction,
+    TransactionType,
+    User,
+)
+from app.reports import export
+from app.reports.export import shutdown_render_pool, write_account_export
+from app.reports.render import SPOOL_SUFFIX
+from app.reports.version import user_data_version
+
+from tests.conftest import TEST_DB_URL
+
+SHEETS = [
+    "Transactions",
+    "Balance Snapshots",
+    "Storage Accounts",
+    "Income Sources",
+    "Expense Categories",
+    "Currencies",
+]
+TRANSACTION_HEADERS = [
+    "Date",
+    "Type",
+    "Amount",
+    "Currency",
+    "Storage Location",
+    "Income Source",
+    "Description",
+]
+
+
+@pytest.fixture()
+async def sessions(setup_test_db):
+    """Sessions on the test database; the export runs its own transaction, so
+    the data it reads is committed rather than rolled back after each test."""
+    engine = create_async_engine(TEST_DB_URL, poolclass=NullPool)
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest.fixture()
+async def user_id(sessions):
+    """A user with an income, an expense with no source or description, a
+    balance snapshot, and a currency without a name."""
+    async with sessions() as db:
+        user = User()
+        db.add(user)
+        await db.flush()
+        usd = Currency(code="USD", symbol="$", name="US Dollar", user_id=user.id)
+        eur = Currency(code="EUR", symbol="€", user_id=user.id)
+        bank = StorageLocation(name="Bank", user_id=user.id)
+        salary = IncomeSource(name="Salary", user_id=user.id)
+        food = ExpenseCategory(
+            name="Food",
+            budgeted_amount=Decimal("300.00"),
+            tags=["daily"],
+            user_id=user.id,
+        )
+        db.add_all([usd, eur, bank, salary, food])
+        await db.flush()
+        account = StorageAccount(
+            storage_location_id=bank.id, currency_id=usd.id, user_id=user.id
+        )
+        db.add(account)
+        await db.flush()
+        db.add_all(
+            [
+                Transaction(
+                    user_id=user.id,
+                    type=TransactionType.income,
+                    date=date(2025, 3, 1),
+                    amount=Decimal("2500.00"),
+                    description="March salary",
+                    currency_id=usd.id,
+                    storage_account_id=account.id,
+                    income_source_id=salary.id,
+                ),
+                Transaction(
+                    user_id=user.id,
+                    type=TransactionType.expense,
+                    date=date(2025, 3, 2),
+                    amount=Decimal("12.50"),
+                    currency_id=usd.id,
+                    storage_account_id=account.id,
+                    expense_category_id=food.id,
+                ),
+                BalanceSnapshot(
+                    user_id=user.id,
+                    storage_account_id=account.id,
+                    date=date(2025, 3, 2),
+                    amount=Decimal("2487.50"),
+                ),
+            ]
+        )
+        await db.commit()
+        created = user.id
+
+    yield created
+
+    async with sessions() as db:
+        await db.execute(delete(User).where(User.id == created))
+        await db.commit()
+
+
+@pytest.fixture(autouse=True)
+def _render_pool():
+    """A fresh render pool per test, so a test that breaks one affects no other."""
+    yield
+    shutdown_render_pool()
+
+
+async def _export(sessions, user_id, path, fmt):
+    async with sessions() as db:
+        return await write_account_export(db, user_id, path, fmt)
+
+
+async def test_xlsx_export(sessions, user_id, tmp_path):
+    path = tmp_path / "report.xlsx"
+    size, version = await _export(sessions, user_id, path, ReportFormat.xlsx)
+
+    assert size == path.stat().st_size
+    async with sessions() as db:
+        assert version == await user_data_version(db, user_id)
+
+    wb = openpyxl.load_workbook(path, read_only=True)
+    assert wb.sheetnames == SHEETS
+    assert list(wb["Transactions"].iter_rows(values_only=True)) == [
+        tuple(TRANSACTION_HEADERS),
+        ("2025-03-02", "expense", 12.5, "USD", "Bank", None, None),
+        ("2025-03-01", "income", 2500.0, "USD", "Bank", "Salary", "March salary"),
+    ]
+    assert list(wb["Balance Snapshots"].iter_rows(values_only=True)) == [
+        ("Date", "Storage Location", "Currency", "Amount"),
+        ("2025-03-02", "Bank", "USD", 2487.5),
+    ]
+    assert list(wb["Currencies"].iter_rows(values_only=True)) == [
+        ("Code", "Symbol", "Name"),
+        ("EUR", "€", None),
+        ("USD", "$", "US Dollar"),
+    ]
+
+
+async def test_csv_export(sessions, user_id, tmp_path):
+    path = tmp_path / "report.zip"
+    await _export(sessions, user_id, path, ReportFormat.csv)
+
+    with zipfile.ZipFile(path) as bundle:
+        assert bundle.namelist() == [
+            f"{sheet.lower().replace(' ', '_')}.csv" for sheet in SHEETS
+        ]
+        sheets = {
+            name: list(
+                csv.reader(
+                    io.TextIOWrapper(bundle.open(name), encoding="utf-8", newline="")
+                )
+            )
+            for name in bundle.namelist()
+        }
+
+    assert sheets["transactions.csv"] == [
+        TRANSACTION_HEADERS,
+        ["2025-03-02", "expense", "12.50", "USD", "Bank", "", ""],
+        ["2025-03-01", "income", "2500.00", "USD", "Bank", "Salary", "March salary"],
+    ]
+    assert sheets["expense_categories.csv"] == [
+        ["Name", "Budgeted Amount", "Tags"],
+        ["Food", "300.00", "daily"],
+    ]
+    assert sheets["income_sources.csv"] == [["Name"], ["Salary"]]
+
+
+async def test_parquet_export(sessions, user_id, tmp_path):
+    path = tmp_path / "report.zip"
+    await _export(sessions, user_id, path, ReportFormat.parquet)
+
+    with zipfile.ZipFile(path) as bundle:
+        assert bundle.namelist() == [
+            f"{sheet.lower().replace(' ', '_')}.parquet" for sheet in SHEETS
+        ]
+        transactions = pq.read_table(io.BytesIO(bundle.read("transactions.parquet")))
+        snapshots = pq.read_table(io.BytesIO(bundle.read("balance_snapshots.parquet")))
+
+    assert transactions.column_names == TRANSACTION_HEADERS
+    assert transactions.schema.field("Date").type == pa.date32()
+    assert transactions.schema.field("Amount").type == pa.decimal128(28, 8)
+    assert transactions.to_pylist() == [
+        {
+            "Date": date(2025, 3, 2),
+            "Type": "expense",
+            "Amount": Decimal("12.50"),
+            "Currency": "USD",
+            "Storage Location": "Bank",
+            "Income Source": None,
+            "Description": None,
+        },
+        {
+            "Date": date(2025, 3, 1),
+            "Type": "income",
+            "Amount": Decimal("2500.00"),
+            "Currency": "USD",
+            "Storage Location": "Bank",
+            "Income Source": "Salary",
+            "Description": "March salary",
+        },
+    ]
+    assert snapshots.num_rows == 1
+
+
+@pytest.mark.parametrize("fmt", list(ReportFormat))
+async def test_failed_export_leaves_no_files(
+    sessions, user_id, tmp_path, monkeypatch, fmt
+):
+    async def fail(*args):
+        raise RuntimeError("lost the database")
+
+    monkeypatch.setattr(export, "_sheet_income_sources", fail)
+
+    with pytest.raises(RuntimeError, match="lost the database"):
+        await _export(sessions, user_id, tmp_path / "report", fmt)
+
+    assert list(tmp_path.iterdir()) == []
+
+
+async def test_export_after_a_worker_died_starts_a_new_pool(
+    sessions, user_id, tmp_path, monkeypatch
+):
+    sheet_storage_accounts = export._sheet_storage_accounts
+
+    async def kill_worker(*args):
+        # As the OOM killer would, while the worker has a sheet spooled.
+        while not any(tmp_path.glob(f"*{SPOOL_SUFFIX}")):
+            await asyncio.sleep(0.01)
+        for process in export._render_pool._processes.values():
+            process.kill()
+
+    monkeypatch.setattr(export, "_sheet_storage_accounts", kill_worker)
+    with pytest.raises(BrokenProcessPool):
+        await _export(sessions, user_id, tmp_path / "broken.zip", ReportFormat.parquet)
+    assert list(tmp_path.iterdir()) == []
+
+    monkeypatch.setattr(export, "_sheet_storage_accounts", sheet_storage_accounts)
+    path = tmp_path / "report.zip"
+    await _export(sessions, user_id, path, ReportFormat.parquet)
+    with zipfile.ZipFile(path) as bundle:
+        assert len(bundle.namelist()) == len(SHEETS)
@@ -1,10 +1,28 @@
+from enum import Enum
+
 from pydantic import BaseModel
 
 
+class ReportFormat(str, Enum):
+    xlsx = "xlsx"
+    # One file per sheet, zipped.
+    csv = "csv"
+    parquet = "parquet"
+
+    @property
+    def extension(self) -> str:
+        return "xlsx" if self is ReportFormat.xlsx else f"{self.value}.zip"
+
+
 class ReportRequestedMsg(BaseModel):
     job_id: str
     user_id: int
+    # Requests published before formats existed carry none and mean XLSX.
+    format: ReportFormat = ReportFormat.xlsx
 
 
 class ReportCompletedMsg(BaseModel):
     job_id: str
+    # The version of the user's data the report shows; reports completed
+    # before it was sent carry none.
+    data_version: str | None = None
@@ -1,2 +1,3 @@
 REPORT_REQUESTED = "report.requested"
+REPORT_REQUESTED_DEAD = "report.requested.dead"
 REPORT_COMPLETED = "report.completed"